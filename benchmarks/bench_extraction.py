@@ -0,0 +1,65 @@
+# Micro-benchmark: BeautifulSoup extraction (fetch_product_from_page) vs. compiled-selector lxml path.
+# Usage: python benchmarks/bench_extraction.py [--pages 20] [--repeat 3] [saved_page.html ...]
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from benchmarks.jumia_fixtures import build_pages
+from core.fast_extract import extract_products
+from core.scraper_engine import fetch_product_from_page
+from scripts.config import selector
+
+
+def bs4_path(text):
+    soup = BeautifulSoup(text, "lxml")
+    return fetch_product_from_page(soup, selector), soup.select_one(selector["page_next"]) is not None
+
+
+def best_of(fn, pages, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in pages:
+            fn(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark listing-page extraction")
+    parser.add_argument("files", nargs="*", help="Saved Jumia listing pages (default: generated fixtures)")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = [Path(f).read_text(encoding="utf-8") for f in args.files]
+    else:
+        pages = build_pages(args.pages)
+
+    # The three paths give identical output: tests/test_fast_extract.py checks it
+    products = sum(len(extract_products(text, selector)[0]) for text in pages)
+    size_kb = sum(len(text) for text in pages) / 1024
+    print(f"📄 {len(pages)} pages, {products} products, {size_kb:.0f} KB of HTML\n")
+
+    baseline = best_of(bs4_path, pages, args.repeat)
+    results = {
+        "BeautifulSoup + select_one": baseline,
+        "lxml compiled selectors": best_of(lambda t: extract_products(t, selector, grid_only=False), pages, args.repeat),
+        "lxml compiled + grid only": best_of(lambda t: extract_products(t, selector), pages, args.repeat),
+    }
+
+    for name, seconds in results.items():
+        per_page = seconds / len(pages) * 1000
+        print(f"{name:<30} {seconds:8.3f}s  {per_page:7.2f} ms/page  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Benchmark: Konga product normalization — the original DataFrame(products) path (nested dicts left
+# as objects, then re-parsed row by row downstream) vs. the batched normalize_products pass.
+# Usage: python benchmarks/bench_normalization.py [--products 5000] [--repeat 3]
+import ast
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from level4_api_ingestion_engine.api_ingestor import normalize_products
+
+SAMPLE_CSV = ROOT / "data" / "api_ingestor.csv"
+NESTED = ["seller", "stock", "product_rating"]
+
+
+def sample_products(count):
+    """Rebuilds raw GraphQL product dicts from the rows already saved in data/api_ingestor.csv."""
+    rows = pd.read_csv(SAMPLE_CSV, dtype={"sku": str}).head(400)
+    base = []
+    for record in rows.to_dict("records"):
+        product = {k: (None if isinstance(v, float) and v != v else v) for k, v in record.items()
+                   if k in ("name", "brand", "price", "deal_price", "final_price",
+                            "description", "image_thumbnail", "sku")}
+        for field in NESTED:
+            product[field] = ast.literal_eval(record[field]) if isinstance(record.get(field), str) else None
+        base.append(product)
+    return [dict(base[i % len(base)], sku=str(i)) for i in range(count)]
+
+
+def original_path(products):
+    """What the pipeline did before: dump dicts into a DataFrame, stringify on save, re-parse per row."""
+    df = pd.DataFrame(products)
+    as_saved = df.astype({field: str for field in NESTED})
+    seller = as_saved["seller"].map(ast.literal_eval)
+    stock = as_saved["stock"].map(ast.literal_eval)
+    rating = as_saved["product_rating"].map(ast.literal_eval)
+    return pd.DataFrame({
+        "seller_name": seller.map(lambda d: d.get("name")),
+        "in_stock": stock.map(lambda d: d.get("in_stock")),
+        "quantity": stock.map(lambda d: d.get("quantity")),
+        "rating_avg": rating.map(lambda d: d["quality"]["average"]),
+        "rating_count": rating.map(lambda d: d["quality"]["number_of_ratings"]),
+    })
+
+
+def json_normalize_path(products):
+    return pd.json_normalize(products)
+
+
+def best_of(fn, products, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(products)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Konga product normalization")
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    products = sample_products(args.products)
+    flat = normalize_products(products)
+    print(f"🧾 {len(products)} products → {len(flat.columns)} typed columns: "
+          f"{', '.join(f'{c}:{t}' for c, t in flat.dtypes.astype(str).items())}\n")
+
+    baseline = best_of(original_path, products, args.repeat)
+    results = {
+        "DataFrame + per-row literal_eval": baseline,
+        "pd.json_normalize": best_of(json_normalize_path, products, args.repeat),
+        "normalize_products (batched)": best_of(normalize_products, products, args.repeat),
+    }
+    for name, seconds in results.items():
+        print(f"{name:<34} {seconds * 1000:9.1f} ms  {len(products) / seconds:12,.0f} products/s  "
+              f"{baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Benchmark: interpreter import cost of the orchestrator entry points (python -X importtime).
+# Usage: python benchmarks/bench_startup.py [--repeat 5] [--top 8] [--check] [--json startup.json]
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# What each entry point imports before doing any work
+SCENARIOS = {
+    "orchestrator": "import level5_full_orchestration.orchestrator",
+    "render_app": "import render_app",
+    "job:API_Auth": "from level5_full_orchestration.orchestrator import JOBS; JOBS['API_Auth']",
+    "job:API_Ingest": "from level5_full_orchestration.orchestrator import JOBS; JOBS['API_Ingest']",
+    "job:Auto_Scraper": "from level5_full_orchestration.orchestrator import JOBS; JOBS['Auto_Scraper']",
+    "job:Detail_Crawler": "from level5_full_orchestration.orchestrator import JOBS; JOBS['Detail_Crawler']",
+}
+
+# Regression gates for --check: modules a scenario must not pull in, and a generous time budget
+HEAVY = ("pandas", "numpy", "pyarrow", "bs4", "lxml", "dotenv", "aiohttp")
+FORBIDDEN = {
+    "orchestrator": HEAVY,
+    "render_app": HEAVY,
+    "job:API_Auth": ("bs4", "lxml"),
+    "job:API_Ingest": ("bs4", "lxml", "dotenv"),
+    "job:Auto_Scraper": ("bs4", "dotenv"),
+    "job:Detail_Crawler": ("bs4", "dotenv"),
+}
+BUDGET_MS = {
+    "orchestrator": 150,
+    "render_app": 400,
+}
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(code):
+    """One `-X importtime` run -> {module: (self_us, cumulative_us, depth)} in import order."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"'{code}' failed:\n{proc.stderr[-2000:]}")
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return modules
+
+
+def measure(code, baseline, repeat):
+    """Median over `repeat` runs of the import time added on top of a bare interpreter."""
+    totals = []
+    selfs = {}
+    for _ in range(repeat):
+        modules = import_profile(code)
+        added = {name: stat for name, stat in modules.items() if name not in baseline}
+        totals.append(sum(cumulative for _, cumulative, depth in added.values() if depth == 0))
+        for name, (self_us, _, _) in added.items():
+            selfs.setdefault(name, []).append(self_us)
+    return {
+        "total_ms": round(statistics.median(totals) / 1000, 1),
+        "modules": len(selfs),
+        "loaded": set(selfs),
+        "self_ms": {name: round(statistics.median(v) / 1000, 2) for name, v in selfs.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark orchestrator startup import time")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest modules (self time) listed per scenario")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on a forbidden import or blown budget")
+    parser.add_argument("--json", type=str, help="Write results here (for tracking over time)")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    args = parser.parse_args()
+
+    baseline = set(import_profile("pass"))
+    failures = []
+    results = {}
+
+    print(f"⏱️ Import time over {args.repeat} runs (median, on top of a bare interpreter)\n")
+    for name in args.scenarios:
+        result = measure(SCENARIOS[name], baseline, args.repeat)
+        heavy = sorted(m for m in FORBIDDEN.get(name, ()) if m in result["loaded"])
+        budget = BUDGET_MS.get(name)
+
+        status = "✅"
+        if heavy:
+            status = "❌"
+            failures.append(f"{name} imports {', '.join(heavy)}")
+        if budget is not None and result["total_ms"] > budget:
+            status = "❌"
+            failures.append(f"{name} took {result['total_ms']} ms (budget {budget} ms)")
+
+        print(f"{status} {name:<18}{result['total_ms']:9.1f} ms{result['modules']:7} modules"
+              + (f"   (budget {budget} ms)" if budget else ""))
+        slowest = sorted(result["self_ms"].items(), key=lambda item: -item[1])[:args.top]
+        print("     " + ", ".join(f"{module} {ms:.1f}" for module, ms in slowest))
+        results[name] = {"total_ms": result["total_ms"], "modules": result["modules"],
+                         "heavy_imports": heavy, "slowest_ms": dict(slowest)}
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n📁 Results written to {args.json}")
+
+    if failures:
+        print("\n🚨 Startup regressions:\n   " + "\n   ".join(failures))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
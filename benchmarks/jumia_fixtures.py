@@ -0,0 +1,64 @@
+# Builds Jumia-style listing pages from the rows saved in level2_multi_page_crawler/sample.csv,
+# so parsing can be benchmarked offline. Real pages saved from a browser can be used instead
+# by passing their paths to the benchmark scripts.
+import csv
+import html
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_CSV = ROOT / "level2_multi_page_crawler" / "sample.csv"
+BASE_URL = "https://www.jumia.com.ng"
+
+
+def load_rows(path=SAMPLE_CSV):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _card(row, position):
+    name = html.escape(row["Laptop Name"])
+    href = html.escape(row["Description Link"].replace(BASE_URL, ""))
+    ratings = row["Ratings"]
+    stars = (
+        f'<div class="rev"><div class="stars _s">{html.escape(ratings)}'
+        f'<div class="in" style="width:{position % 100}%"></div></div>(12)</div>'
+        if ratings and ratings != "No ratings" else ""
+    )
+    return (
+        f'<article class="prd _fb col c-prd">'
+        f'<a class="core" href="{href}" data-gtm-id="{position}" data-ga4-item_name="{name}">'
+        f'<div class="img-c"><img data-src="https://ng.jumia.is/unsafe/fit-in/300x300/{position}.jpg" '
+        f'class="img" width="208" height="208" alt="{name}"></div>'
+        f'<div class="info"><h3 class="name">{name}</h3><div class="prc">{html.escape(row["Price"])}</div>'
+        f'<div class="s-prc-w"><div class="old">₦ 120,000</div><div class="bdg _dsct _sm">12%</div></div>'
+        f'{stars}</div></a>'
+        f'<footer class="ft"><form method="POST" action="/cart/"><button class="add btn _prim">Add To Cart</button></form></footer>'
+        f'</article>'
+    )
+
+
+def build_page(rows, page=1, per_page=40, last_page=50, pagination_first=False):
+    """One listing page: heavy <head>/navigation before the grid, pagination after it (or above it)."""
+    start = (page - 1) * per_page
+    cards = "".join(_card(rows[(start + i) % len(rows)], start + i) for i in range(per_page))
+    scripts = "".join(
+        f'<script type="text/javascript">window.__STORE__{i} = {{"k": "{"x" * 400}"}};</script>' for i in range(60)
+    )
+    nav = "".join(f'<a class="itm" href="/category-{i}/">Category {i}</a>' for i in range(300))
+    next_link = (
+        f'<a class="pg" href="/laptops/?page={page + 1}#catalog-listing" aria-label="Next Page">&gt;</a>'
+        if page < last_page else ""
+    )
+    grid = f"<div class='-paxs row _no-g _4cl-3cm-shs'>{cards}</div>"
+    pagination = f"<div class='pg-w -ptm -pbxl'><a class='pg' href='/laptops/?page=1'>1</a>{next_link}</div>"
+    return (
+        f"<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'><title>Laptops | Jumia</title>{scripts}</head>"
+        f"<body><header><nav>{nav}</nav></header><main class='-pvs'>"
+        f"<section class='card -fh'>{pagination + grid if pagination_first else grid + pagination}</section>"
+        f"</main><footer>{nav}</footer></body></html>"
+    )
+
+
+def build_pages(count=20, per_page=40):
+    rows = load_rows()
+    return [build_page(rows, page, per_page, last_page=count) for page in range(1, count + 1)]
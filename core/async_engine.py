@@ -0,0 +1,114 @@
+import asyncio
+from urllib.parse import urlsplit
+
+from core.politeness import limiter_for
+from core.response_cache import get_cache
+from core.scraper_engine import PageFetchError, safe_request, parse_listing
+
+
+# ===== SINGLE PAGE TASK ===== #
+async def _fetch_page(page, base_url, headers, selector, semaphore, bucket, cache):
+    """Fetches and parses one listing page. Returns (page, products, has_next, ok)."""
+    url = f"{base_url}?page={page}"
+
+    async with semaphore:
+        await bucket.acquire_async()
+        print(f"\n🔄 Scraping page {page}...")
+        response = await asyncio.to_thread(safe_request, url, headers, cache=cache)
+
+    if not response:
+        print(f"❌ Request failed for page {page}.")
+        return page, [], False, False
+
+    try:
+        product_batch, has_next = await asyncio.to_thread(parse_listing, response, selector, cache)
+        return page, product_batch, has_next, True
+    except Exception as e:
+        print(f"❌ Error parsing page {page}: {e}")
+        return page, [], False, False
+
+
+# ===== ASYNC PAGINATION FUNCTION ===== #
+async def fetch_all_products_async(base_url, headers, selector, max_pages=20,
+                                   max_concurrency=4, rate_per_sec=0.5, burst=2, bucket=None,
+                                   on_page=None, keep_results=True, start_page=1):
+    """Keeps up to `max_concurrency` pages of one host in flight; results come back in page order.
+
+    Stopping rules match `fetch_all_products`: an empty page ends the crawl before it, a page
+    without a "next" link ends the crawl after it, and a page that failed before the end raises
+    PageFetchError once the pages before it were delivered.
+    `on_page(page, products)` is called in page order as soon as a page is final; with
+    keep_results=False pages are dropped after delivery, so memory stays bounded by the window.
+    `start_page` resumes a category part way through (see core.checkpoints).
+    Without a `bucket` the host's adaptive limiter is used; `rate_per_sec` is its starting rate.
+    """
+    host = urlsplit(base_url).netloc
+    semaphore = asyncio.Semaphore(max_concurrency)
+    bucket = bucket or limiter_for(base_url, initial_rate=rate_per_sec, burst=burst)
+    cache = get_cache()
+
+    print(f"⚡ Async crawl of {host} (concurrency={max_concurrency}, rate={bucket.rate:.2f}/s)")
+
+    results = {}
+    end_at = max_pages + 1       # first page past the end of the category
+    failed_at = end_at           # first page that failed
+    stop_at = end_at             # first page that must NOT be included
+    next_page = start_page
+    next_emit = start_page
+    pending = {}
+    final_results = []
+
+    while next_page < stop_at or pending:
+        while next_page < stop_at and len(pending) < max_concurrency:
+            task = asyncio.create_task(
+                _fetch_page(next_page, base_url, headers, selector, semaphore, bucket, cache)
+            )
+            pending[task] = next_page
+            next_page += 1
+
+        done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+
+        for task in done:
+            pending.pop(task)
+            page, product_batch, has_next, ok = task.result()
+
+            if not ok:
+                failed_at = min(failed_at, page)
+            elif not product_batch:
+                print(f"⚠️ No more products found (page {page}). Stopping pagination.")
+                end_at = min(end_at, page)
+            else:
+                results[page] = product_batch
+                print(f"✅ Page {page} done — {len(product_batch)} items found.")
+                if not has_next:
+                    print("📘 End of pagination reached.")
+                    end_at = min(end_at, page + 1)
+            stop_at = min(end_at, failed_at)
+
+        # Pages past the end of the category are no longer needed
+        for task, page in list(pending.items()):
+            if page >= stop_at:
+                task.cancel()
+                pending.pop(task)
+
+        # Deliver every page whose predecessors are all final
+        while next_emit < stop_at and next_emit in results:
+            product_batch = results.pop(next_emit)
+            if on_page is not None:
+                on_page(next_emit, product_batch)
+            if keep_results:
+                final_results.extend(product_batch)
+            next_emit += 1
+
+    if failed_at < end_at:
+        raise PageFetchError(f"page {failed_at} of {base_url} could not be fetched or parsed")
+    print(f"\n📦 Total products scraped: {len(final_results)}\n")
+    return final_results
+
+
+# ===== SYNC ENTRY POINT (drop-in for fetch_all_products) ===== #
+def fetch_all_products_concurrent(base_url, headers, selector, max_pages=20, **engine_options):
+    """Same signature and return value as `fetch_all_products`, backed by the async engine."""
+    return asyncio.run(
+        fetch_all_products_async(base_url, headers, selector, max_pages=max_pages, **engine_options)
+    )
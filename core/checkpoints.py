@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from core.fileio import atomic_write_bytes
+
+
+CHECKPOINT_SETTINGS = {
+    "path": Path(__file__).resolve().parents[1] / ".cache" / "crawl_checkpoint.json",
+    "max_age_hours": 6,     # older checkpoints belong to an abandoned run and are ignored
+}
+
+
+# ===== CRAWL CHECKPOINTS ===== #
+class CheckpointStore:
+    """Last durably-saved page per category for the current run, so a rerun resumes instead of restarting.
+
+    The whole state is one small JSON document rewritten atomically (temp file + rename) on every
+    update, so a crash leaves either the previous or the new checkpoint, never a torn one.
+    """
+
+    def __init__(self, path=None, max_age_hours=None):
+        self.path = Path(path or CHECKPOINT_SETTINGS["path"])
+        self.max_age = 3600 * (max_age_hours or CHECKPOINT_SETTINGS["max_age_hours"])
+        self.lock = threading.Lock()
+        self.state = None
+
+    def _load(self):
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - state.get("updated_at", 0) > self.max_age:
+            print(f"🧹 Ignoring stale checkpoint from run {state.get('run_id')}")
+            return None
+        return state
+
+    def _save(self):
+        self.state["updated_at"] = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.path, json.dumps(self.state, indent=2).encode("utf-8"))
+
+    def begin(self):
+        """Resumes the unfinished run if there is one, otherwise starts a new run. Returns the run ID."""
+        with self.lock:
+            self.state = self._load()
+            if self.state is not None:
+                done = sum(1 for c in self.state["categories"].values() if c.get("done"))
+                print(f"⏯️ Resuming run {self.state['run_id']} "
+                      f"({done} categories done, {len(self.state['categories']) - done} in progress)")
+            else:
+                self.state = {"run_id": uuid.uuid4().hex[:12], "started_at": time.time(), "categories": {}}
+                self._save()
+                print(f"🆕 Starting run {self.state['run_id']}")
+            return self.state["run_id"]
+
+    @property
+    def run_id(self):
+        return self.state["run_id"] if self.state else None
+
+    def is_done(self, category):
+        return self.state["categories"].get(category, {}).get("done", False)
+
+    def start_page(self, category):
+        """First page still to fetch for `category`."""
+        return self.state["categories"].get(category, {}).get("last_page", 0) + 1
+
+    def mark_pages(self, pages):
+        """Records {category: last page} once those pages are on disk; pages only move forward."""
+        with self.lock:
+            changed = False
+            for category, page in pages.items():
+                entry = self.state["categories"].setdefault(category, {"last_page": 0, "done": False})
+                if page > entry["last_page"]:
+                    entry["last_page"] = page
+                    changed = True
+            if changed:
+                self._save()
+
+    def mark_done(self, category):
+        with self.lock:
+            entry = self.state["categories"].setdefault(category, {"last_page": 0, "done": False})
+            entry["done"] = True
+            self._save()
+
+    def clear(self):
+        """Called after a fully successful cycle: the next run starts from page 1 again."""
+        with self.lock:
+            self.state = None
+            self.path.unlink(missing_ok=True)
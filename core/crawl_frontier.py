@@ -0,0 +1,326 @@
+import csv
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+from core import metrics
+from core.response_cache import get_cache
+from core.scraper_engine import parse_detail, safe_request
+
+
+# Local state, never committed: rebuilt from the detail-page dataset when missing (see bootstrap_from_csv)
+FRONTIER_PATH = Path(__file__).resolve().parents[1] / "data" / "state" / "crawl_frontier.sqlite"
+FRONTIER_SETTINGS = {
+    "first_revisit": 24 * 3600,       # revisit interval after a page's first fetch
+    "min_revisit": 6 * 3600,          # prices that change on every visit are checked this often
+    "max_revisit": 14 * 24 * 3600,    # pages that never change are still checked this often
+    "speedup": 0.5,                   # interval factor when the price changed since the last visit
+    "slowdown": 1.5,                  # interval factor when it did not (or the fetch failed)
+    "lease_seconds": 1800,            # a handed-out URL comes back after this if never recorded
+    "max_failures": 5,                # consecutive failures before a URL is parked at max_revisit
+}
+MISSING_LINKS = {"", "nan", "None", "No link available"}
+_LOOKUP_CHUNK = 500
+
+
+# ===== URL KEYS ===== #
+def normalize_url(url):
+    """Canonical form used for dedup: lower-case scheme/host, no query string or fragment.
+
+    Listing pages add tracking parameters, so the same product reached from two categories
+    must still map to one frontier entry. Returns None for missing or relative links.
+    """
+    if url is None or str(url).strip() in MISSING_LINKS:
+        return None
+    parts = urlsplit(str(url).strip())
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", "", ""))
+
+
+def url_key(url):
+    """Signed 64-bit hash of a normalized URL: the frontier's integer primary key (8 bytes per URL)."""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+# ===== PERSISTENT FRONTIER ===== #
+class CrawlFrontier:
+    """Persistent seen-set and revisit queue for product detail pages, in one SQLite table.
+
+    Every URL is keyed by a 64-bit hash (INTEGER PRIMARY KEY, i.e. the rowid), so membership
+    checks are one B-tree lookup and millions of URLs stay compact on disk. A URL is fetched
+    once as soon as possible, then revisited on an interval that shrinks while its price keeps
+    changing and grows while it doesn't. `due()` is the priority queue: never-fetched pages
+    first (more listing sightings first), then revisits ordered by how often their price changed.
+    """
+
+    def __init__(self, path=None, settings=None, now=time.time):
+        self.path = Path(path or FRONTIER_PATH)
+        self.settings = {**FRONTIER_SETTINGS, **(settings or {})}
+        self.now = now
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS frontier (
+                   url_key      INTEGER PRIMARY KEY,
+                   url          TEXT NOT NULL,
+                   priority     REAL NOT NULL,
+                   next_fetch   INTEGER NOT NULL,
+                   interval     INTEGER NOT NULL,
+                   sightings    INTEGER NOT NULL DEFAULT 1,
+                   fetches      INTEGER NOT NULL DEFAULT 0,
+                   changes      INTEGER NOT NULL DEFAULT 0,
+                   failures     INTEGER NOT NULL DEFAULT 0,
+                   content_hash TEXT,
+                   first_seen   INTEGER NOT NULL,
+                   last_fetched INTEGER
+               )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_due ON frontier (next_fetch)")
+        self.conn.commit()
+
+    # --- seen-set ---
+    def add(self, urls, source=None):
+        """Adds discovered URLs; ones already known only count another sighting. Returns how many were new."""
+        now = int(self.now())
+        rows = {}
+        for url in urls:
+            url = normalize_url(url)
+            if url is not None:
+                rows[url_key(url)] = url
+        if not rows:
+            return 0
+
+        with self.lock:
+            keys = list(rows)
+            known = 0
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start:start + _LOOKUP_CHUNK]
+                known += self.conn.execute(
+                    f"SELECT COUNT(*) FROM frontier WHERE url_key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchone()[0]
+            with self.conn:
+                # New pages outrank every revisit (priority >= 1); each extra sighting adds a little
+                self.conn.executemany(
+                    """INSERT INTO frontier (url_key, url, priority, next_fetch, interval, first_seen)
+                       VALUES (?, ?, 1.0, ?, ?, ?)
+                       ON CONFLICT(url_key) DO UPDATE SET
+                           sightings = sightings + 1,
+                           priority = CASE WHEN fetches = 0 THEN priority + 0.01 ELSE priority END""",
+                    [(key, url, now, self.settings["first_revisit"], now) for key, url in rows.items()],
+                )
+        metrics.incr("frontier_urls_seen_total", len(rows), source=source or "unknown")
+        metrics.incr("frontier_urls_new_total", len(rows) - known)
+        return len(rows) - known
+
+    def seen(self, url):
+        url = normalize_url(url)
+        if url is None:
+            return False
+        with self.lock:
+            return self.conn.execute(
+                "SELECT 1 FROM frontier WHERE url_key = ?", (url_key(url),)
+            ).fetchone() is not None
+
+    __contains__ = seen
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM frontier").fetchone()[0]
+
+    # --- priority queue ---
+    def due(self, limit=100):
+        """Leases up to `limit` URLs whose revisit time has come, most urgent first.
+
+        Leased URLs are pushed `lease_seconds` into the future, so parallel workers never get the
+        same page and a crash before `record()` only delays it.
+        """
+        now = int(self.now())
+        with self.lock:
+            rows = self.conn.execute(
+                """SELECT url_key, url, fetches, content_hash FROM frontier
+                   WHERE next_fetch <= ? ORDER BY priority DESC, next_fetch LIMIT ?""",
+                (now, limit),
+            ).fetchall()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE frontier SET next_fetch = ? WHERE url_key = ?",
+                    [(now + self.settings["lease_seconds"], row[0]) for row in rows],
+                )
+        return [{"url": url, "fetches": fetches, "content_hash": content_hash}
+                for _, url, fetches, content_hash in rows]
+
+    # --- revisit scheduling ---
+    def record(self, url, content_hash=None, ok=True):
+        """Stores the outcome of one fetch and schedules the next visit. Returns True if the content changed."""
+        key = url_key(normalize_url(url))
+        settings = self.settings
+        now = int(self.now())
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT interval, fetches, changes, failures, content_hash FROM frontier WHERE url_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False
+            interval, fetches, changes, failures, previous = row
+
+            changed = False
+            if not ok:
+                failures += 1
+                interval = settings["max_revisit"] if failures >= settings["max_failures"] else \
+                    min(settings["max_revisit"], interval * settings["slowdown"])
+            elif fetches == 0 or previous is None:
+                fetches, failures, interval = fetches + 1, 0, settings["first_revisit"]
+            else:
+                changed = content_hash != previous
+                fetches, failures = fetches + 1, 0
+                changes += changed
+                factor = settings["speedup"] if changed else settings["slowdown"]
+                interval = min(settings["max_revisit"], max(settings["min_revisit"], interval * factor))
+
+            # Revisits are ordered by their (smoothed) share of visits that found a new price
+            priority = (changes + 1) / (fetches + failures + 2)
+            with self.conn:
+                self.conn.execute(
+                    """UPDATE frontier SET priority = ?, next_fetch = ?, interval = ?, fetches = ?, changes = ?,
+                           failures = ?, content_hash = ?, last_fetched = COALESCE(?, last_fetched)
+                       WHERE url_key = ?""",
+                    (priority, now + int(interval), int(interval), fetches, changes, failures,
+                     content_hash if ok else previous, now if ok else None, key),
+                )
+        metrics.incr("frontier_fetches_total", status="failed" if not ok else "changed" if changed else "unchanged")
+        return changed
+
+    # --- bootstrap ---
+    def bootstrap_from_csv(self, path):
+        """Rebuilds an empty frontier from the detail-page dataset (e.g. on a fresh checkout).
+
+        Each URL's latest saved row becomes one fetched page, due `first_revisit` after its
+        "Fetched At", so a new disk doesn't refetch every page it already has.
+        Listing links come back through `add()` on the next crawl. Returns how many URLs were loaded.
+        """
+        path = Path(path)
+        with self.lock:
+            seeded = self.conn.execute("SELECT 1 FROM frontier LIMIT 1").fetchone()
+            if seeded or not path.exists() or path.stat().st_size == 0:
+                return 0
+
+            latest = {}
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    url = normalize_url(row.get("Description Link"))
+                    if url is not None:
+                        latest[url_key(url)] = (url, row)   # later rows are newer
+            interval = self.settings["first_revisit"]
+            rows = []
+            for key, (url, row) in latest.items():
+                try:
+                    fetched = int(datetime.strptime(row.get("Fetched At") or "", "%Y-%m-%d %H:%M:%S").timestamp())
+                except ValueError:
+                    fetched = int(self.now())
+                rows.append((key, url, 1 / 3, fetched + interval, interval, content_hash(row), fetched, fetched))
+            with self.conn:
+                # priority = (changes + 1) / (fetches + failures + 2), as after one fetch in record()
+                self.conn.executemany(
+                    """INSERT INTO frontier (url_key, url, priority, next_fetch, interval, fetches,
+                                             content_hash, first_seen, last_fetched)
+                       VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)""",
+                    rows,
+                )
+        print(f"🧭 Seeded crawl frontier with {len(rows)} pages from {path.name}")
+        return len(rows)
+
+    def stats(self):
+        now = int(self.now())
+        with self.lock:
+            total, fetched, due, changes = self.conn.execute(
+                """SELECT COUNT(*), SUM(fetches > 0), SUM(next_fetch <= ?), SUM(changes) FROM frontier""", (now,)
+            ).fetchone()
+        return {"urls": total, "fetched": fetched or 0, "never_fetched": total - (fetched or 0),
+                "due": due or 0, "price_changes": changes or 0}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+# ===== DETAIL PAGE CRAWL ===== #
+def content_hash(detail, fields=("Price", "Old Price")):
+    """Hash of the fields whose change makes a revisit worthwhile (the price, by default)."""
+    text = "\x1f".join(str(detail.get(field) or "") for field in fields)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _fetch_detail(url, headers, detail_selector, cache):
+    response = safe_request(url, headers, cache=cache)
+    if not response:
+        return None
+    try:
+        return parse_detail(response, detail_selector)
+    except Exception as e:
+        print(f"❌ Error parsing detail page {url}: {e}")
+        return None
+
+
+def crawl_details(frontier, headers, detail_selector, limit=200, workers=2, on_detail=None):
+    """Fetches up to `limit` due detail pages through core.scraper_engine and reschedules each one.
+
+    `on_detail(record)` receives every new or changed page (with "Description Link", "Price Changed"
+    and "Fetched At") and must persist it before returning: the page's new hash is recorded only
+    afterwards, so if it raises the URL keeps its old hash and comes back once its lease expires.
+    Unchanged revisits only move the URL's next visit further out.
+    Returns {"fetched", "new", "changed", "unchanged", "failed"} counts.
+    """
+    batch = frontier.due(limit)
+    counts = {"fetched": 0, "new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+    if not batch:
+        print("📭 Crawl frontier: nothing due.")
+        return counts
+
+    print(f"🧭 Crawl frontier: fetching {len(batch)} detail pages on {workers} workers")
+    cache = get_cache()
+    lock = threading.Lock()
+
+    def visit(entry):
+        url = entry["url"]
+        detail = _fetch_detail(url, headers, detail_selector, cache)
+        ok = bool(detail and detail.get("Price"))
+        digest = content_hash(detail) if ok else None
+        # Compared with the hash leased by due(); the lease keeps other workers off this URL
+        changed = ok and entry["fetches"] > 0 and entry["content_hash"] is not None \
+            and digest != entry["content_hash"]
+        if ok and (changed or entry["fetches"] == 0) and on_detail is not None:
+            on_detail({**detail, "Description Link": url, "Price Changed": changed,
+                       "Fetched At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+        frontier.record(url, digest, ok=ok)
+        with lock:
+            counts["fetched"] += 1
+            if not ok:
+                counts["failed"] += 1
+            elif entry["fetches"] == 0:
+                counts["new"] += 1
+            else:
+                counts["changed" if changed else "unchanged"] += 1
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detail") as pool:
+        for future in [pool.submit(visit, entry) for entry in batch]:
+            future.result()
+
+    print(f"🏁 Detail pages: {counts} | frontier: {frontier.stats()}")
+    return counts
@@ -0,0 +1,111 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from core import metrics
+from core.politeness import limiter_for, rate_limits
+
+
+# ===== PER-DOMAIN POLITENESS ===== #
+class DomainBuckets:
+    """The adaptive limiter of each domain (core.politeness), shared by every category crawling it.
+
+    `rate_per_sec` is where a new domain starts and `max_rate_per_sec` the ceiling it may speed
+    up to; a domain that already has a limiter keeps its learned rate.
+    """
+
+    def __init__(self, rate_per_sec, burst=1, max_rate_per_sec=None):
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.max_rate_per_sec = max_rate_per_sec
+
+    def for_url(self, url):
+        return limiter_for(url, initial_rate=self.rate_per_sec, burst=self.burst,
+                           max_rate=self.max_rate_per_sec)
+
+
+# ===== SINGLE CATEGORY TASK ===== #
+def _crawl_category(category, url, fetcher, headers, selector, buckets, on_page=None, start_page=1):
+    """Crawls one category. Fetch/parse errors fail only this category (its record says why);
+    errors raised by `on_page` (sink, dedup, frontier) propagate, since they affect every category."""
+    started = time.monotonic()
+    record = {"category": category, "url": url, "success": False, "records": 0, "pages": 0,
+              "start_page": start_page, "error": None}
+    products = []
+    handing_over = False
+
+    try:
+        resumed = f" (resuming at page {start_page})" if start_page > 1 else ""
+        print(f"[{datetime.utcnow()} UTC] 🔍 Scraping category: {category}{resumed}")
+        pages = fetcher(url, headers, selector, bucket=buckets.for_url(url), start_page=start_page)
+        for page, product_batch in pages:
+            record["pages"] += 1
+            record["records"] += len(product_batch)
+            if on_page is not None:
+                handing_over = True
+                on_page(record, page, product_batch)   # streamed out; nothing kept per category
+                handing_over = False
+            else:
+                products.extend(product_batch)
+        record["success"] = True
+    except Exception as e:
+        record["error"] = str(e)
+        if handing_over:
+            print(f"❌ Page handler failed for category {category}: {e}")
+            metrics.incr("categories_total", status="aborted")
+            raise
+        print(f"❌ Error scraping category {category}: {e}")
+
+    elapsed = time.monotonic() - started
+    record["duration_seconds"] = round(elapsed, 3)
+    record["records_per_second"] = round(record["records"] / elapsed, 2) if elapsed > 0 else 0.0
+    metrics.observe("category_crawl_seconds", elapsed)
+    metrics.incr("categories_total", status="success" if record["success"] else "failed")
+    metrics.incr("records_scraped_total", record["records"])
+    return record, products
+
+
+# ===== SCHEDULER ===== #
+def crawl_categories(categories, fetcher, headers, selector,
+                     max_workers=4, rate_per_sec=0.5, burst=2, on_result=None, on_page=None,
+                     start_pages=None, max_rate_per_sec=None):
+    """Crawls {category: url} concurrently in a worker pool under a per-domain adaptive rate limit
+    (starting at `rate_per_sec`, never above `max_rate_per_sec`).
+
+    `fetcher(url, headers, selector, bucket=..., start_page=...)` must return an iterable of
+    (page, products); `start_pages` maps categories to the page to resume from (default 1).
+    With `on_page(record, page, products)` every page is handed over as soon as it is parsed and
+    nothing is accumulated; otherwise each finished category's products go to
+    `on_result(record, products)`, so a slow category never holds up the others.
+    A category whose pages fail to fetch is reported as failed; an exception raised by `on_page`
+    is re-raised here once the running categories stop.
+    Returns the per-category result/failure records in completion order.
+    """
+    buckets = DomainBuckets(rate_per_sec, burst, max_rate_per_sec)
+    start_pages = start_pages or {}
+    results = []
+
+    print(f"🗂️ Scheduling {len(categories)} categories on {max_workers} workers "
+          f"(from {rate_per_sec} req/s per domain, adaptive)")
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawl") as pool:
+        futures = [
+            pool.submit(_crawl_category, category, url, fetcher, headers, selector, buckets,
+                        on_page, start_pages.get(category, 1))
+            for category, url in categories.items()
+        ]
+        for future in as_completed(futures):
+            try:
+                record, products = future.result()
+            except Exception:
+                # An on_page failure: stop scheduling categories and let the caller handle it
+                for pending in futures:
+                    pending.cancel()
+                raise
+            results.append(record)
+            if on_result is not None:
+                on_result(record, products)
+
+    failed = [r["category"] for r in results if not r["success"]]
+    print(f"🏁 Categories done: {len(results) - len(failed)} succeeded, {len(failed)} failed {failed or ''}")
+    print(f"🚦 Request rates at the end (req/s per domain): {rate_limits()}")
+    return results
@@ -0,0 +1,210 @@
+import csv
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from core import metrics
+from core.fileio import DATA_LOCK, _fsync_dir, atomic_write_bytes
+
+
+def _journal_path(path):
+    return path.with_name(f".{path.name}.journal")
+
+
+# ===== CRASH RECOVERY ===== #
+def recover(path):
+    """Replays an interrupted append, if a journal was left behind by a crash.
+
+    The journal holds the original file size and the full batch, so replaying is idempotent:
+    the dataset is cut back to its pre-append size and the batch is written again.
+    """
+    path = Path(path)
+    journal = _journal_path(path)
+    if not journal.exists():
+        return False
+
+    offset_line, payload = journal.read_bytes().split(b"\n", 1)
+    offset = int(offset_line)
+    with open(path, "r+b") as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    journal.unlink()
+    print(f"♻️ Recovered interrupted append on {path.name}")
+    return True
+
+
+# ===== SCHEMA HANDLING ===== #
+def read_header(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def _rewrite_with_columns(path, columns, chunksize=50_000):
+    """Rare path: the batch brings new columns, so history is re-laid out once under the wider header."""
+    print(f"🧱 New columns for {path.name} — rewriting dataset header once.")
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    try:
+        header = True
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            chunk.reindex(columns=columns).to_csv(tmp_name, mode="a", index=False, header=header)
+            header = False
+        if header:
+            pd.DataFrame(columns=columns).to_csv(tmp_name, index=False)
+        with open(tmp_name, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+        _fsync_dir(path.parent)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+# ===== APPEND-ONLY SINK ===== #
+def append_dataset(df, path):
+    """Appends a batch to a CSV dataset in O(batch) work and returns the number of rows written.
+
+    - New file: written to a temp file and renamed into place.
+    - Existing file: the batch is first journaled (temp file + rename), then appended;
+      a crash mid-append is repaired by `recover` on the next call, so history is never truncated.
+    """
+    path = Path(path)
+    if df is None or df.empty:
+        return 0
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    recover(path)
+
+    if not path.exists() or path.stat().st_size == 0:
+        atomic_write_bytes(path, df.to_csv(index=False).encode("utf-8"))
+        print(f"💾 New dataset created at {path} ({len(df)} rows)")
+        return len(df)
+
+    columns = read_header(path)
+    extra = [c for c in df.columns if c not in columns]
+    if extra:
+        columns = columns + extra
+        _rewrite_with_columns(path, columns)
+
+    payload = df.reindex(columns=columns).to_csv(index=False, header=False).encode("utf-8")
+
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        f.seek(size - 1)
+        if f.read(1) != b"\n":
+            payload = b"\n" + payload
+
+    journal = _journal_path(path)
+    atomic_write_bytes(journal, f"{size}\n".encode() + payload)
+
+    with open(path, "r+b") as f:
+        f.seek(size)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    journal.unlink()
+
+    print(f"💾 Appended {len(df)} rows to {path}")
+    return len(df)
+
+
+# ===== BACKEND DISPATCH ===== #
+# "csv" (default) appends to the flat CSV; "parquet" writes typed, date/source partitioned
+# Parquet files next to it (see core.parquet_store). Chosen via ADIP_STORAGE_BACKEND.
+def storage_backend():
+    return os.getenv("ADIP_STORAGE_BACKEND", "csv").lower()
+
+
+def save_dataset(df, path, backend=None):
+    """Single save entry point used by every ingestor."""
+    backend = backend or storage_backend()
+    if backend not in ("csv", "parquet"):
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    dataset = Path(path).stem
+    with metrics.timer("save_seconds", dataset=dataset, backend=backend), DATA_LOCK:
+        if backend == "parquet":
+            from core.parquet_store import write_partitions
+            written = write_partitions(df, path)
+        else:
+            written = append_dataset(df, path)
+    metrics.incr("rows_saved_total", written or 0, dataset=dataset)
+    return written
+
+
+# ===== INCREMENTAL SINK ===== #
+class StreamingSink:
+    """Thread-safe sink that persists page batches as they arrive instead of once per cycle.
+
+    Rows are buffered until `flush_rows` is reached (so the Parquet backend doesn't get one tiny
+    file per page) and then run through `prepare(df, path)` (e.g. dedup) and `save_dataset`.
+    `prepare` returns (df, on_saved); `on_saved()`, if given, runs only after the save succeeded.
+    Everything flushed before a crash stays on disk; a failed save keeps its rows buffered.
+    `on_flush(tags)` is called with the tags of every batch that just became durable.
+    """
+
+    def __init__(self, path, prepare=None, flush_rows=500, backend=None, on_flush=None):
+        self.path = Path(path)
+        self.prepare = prepare
+        self.flush_rows = flush_rows
+        self.backend = backend
+        self.on_flush = on_flush
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.tags = []
+        self.buffered_rows = 0
+        self.batches = 0
+        self.rows_in = 0
+        self.rows_written = 0
+
+    def write(self, df, tag=None):
+        with self.lock:
+            if tag is not None:
+                self.tags.append(tag)
+            if df is not None and not df.empty:
+                self.buffer.append(df)
+                self.buffered_rows += len(df)
+                self.rows_in += len(df)
+            if self.buffered_rows >= self.flush_rows:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        # The buffer and tags are dropped only once the save returned: a failed flush keeps them
+        # for the next flush (or the caller's retry) instead of silently losing those rows.
+        if self.buffer:
+            df = pd.concat(self.buffer, ignore_index=True) if len(self.buffer) > 1 else self.buffer[0]
+            on_saved = None
+            if self.prepare is not None:
+                df, on_saved = self.prepare(df, self.path)
+            if df is not None and not df.empty:
+                save_dataset(df, self.path, self.backend)
+                self.rows_written += len(df)
+            self.buffer = []
+            self.buffered_rows = 0
+            self.batches += 1
+            if on_saved is not None:
+                on_saved()
+        tags, self.tags = self.tags, []
+        if tags and self.on_flush is not None:
+            self.on_flush(tags)
+
+    def stats(self):
+        return {"batches": self.batches, "rows_in": self.rows_in, "rows_written": self.rows_written}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
@@ -0,0 +1,196 @@
+import hashlib
+import sqlite3
+import time
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from core import metrics
+
+
+# One index per dataset, rebuilt from the dataset's CSV when missing (see bootstrap_from_csv):
+# it is local state, never committed, so the scraper and the API job never share or race on it.
+INDEX_DIR = Path(__file__).resolve().parents[1] / "data" / "state"
+
+# dataset name (CSV stem) -> (key columns, content columns)
+# A record is stored again only when its content hash changes (slowly-changing-dimension style).
+DEDUP_SPECS = {
+    # Raw strings, as in the dataset's history (typed Price_kobo/Rating are derived from them)
+    "scraper_dataset": (["Category", "Description Link"], ["Price", "Ratings"]),
+    "api_ingestor": (["sku"], ["price", "deal_price", "final_price", "rating_avg", "rating_count"]),
+}
+
+MISSING_KEYS = {"", "nan", "None", "No link available"}
+_LOOKUP_CHUNK = 500
+
+
+# ===== INDEX STORAGE ===== #
+def index_path_for(dataset):
+    return INDEX_DIR / f"dedup_{dataset}.sqlite"
+
+
+def connect(index_path):
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(index_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS record_hashes (
+               dataset      TEXT NOT NULL,
+               record_key   TEXT NOT NULL,
+               content_hash TEXT NOT NULL,
+               first_seen   INTEGER NOT NULL,
+               last_changed INTEGER NOT NULL,
+               PRIMARY KEY (dataset, record_key)
+           ) WITHOUT ROWID"""
+    )
+    return conn
+
+
+def _join(df, columns):
+    values = df.reindex(columns=columns).astype("string").fillna("")
+    # 24725 and 24725.0 are the same price whether it came from the API or back from a CSV
+    values = values.apply(lambda col: col.str.replace(r"^(-?\d+)\.0+$", r"\1", regex=True))
+    joined = values[columns[0]]
+    for col in columns[1:]:
+        joined = joined + "\x1f" + values[col]
+    return joined
+
+
+def record_keys(df, key_columns):
+    return _join(df, key_columns)
+
+
+def content_hashes(df, content_columns):
+    return _join(df, content_columns).map(
+        lambda text: hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+    )
+
+
+def _lookup(conn, dataset, keys):
+    known = {}
+    for start in range(0, len(keys), _LOOKUP_CHUNK):
+        chunk = keys[start:start + _LOOKUP_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT record_key, content_hash FROM record_hashes "
+            f"WHERE dataset = ? AND record_key IN ({placeholders})",
+            [dataset, *chunk],
+        )
+        known.update(rows)
+    return known
+
+
+# ===== CHANGE FILTER ===== #
+@metrics.timed("dedup_seconds")
+def filter_changed(df, dataset, key_columns, content_columns, index_path=None):
+    """Returns (rows that are new or whose content changed, their pending index upserts).
+
+    Nothing is written to the index here: pass the upserts to `record_hashes` once the rows are
+    safely saved, otherwise a failed save would make the next run skip them as unchanged.
+    Each record costs one primary-key lookup, so the write path stays flat as history grows.
+    Rows without a usable key are always kept.
+    """
+    if df is None or df.empty:
+        return df, []
+
+    keys = record_keys(df, key_columns)
+    hashes = content_hashes(df, content_columns)
+    key_frame = df.reindex(columns=key_columns)
+    keyed = ~(key_frame.isna() | key_frame.astype("string").isin(MISSING_KEYS)).any(axis=1)
+
+    # Within one batch the first occurrence of a key wins
+    first = ~keys.duplicated(keep="first")
+    candidates = keyed & first
+
+    now = int(time.time())
+    conn = connect(index_path or index_path_for(dataset))
+    try:
+        known = _lookup(conn, dataset, keys[candidates].tolist())
+    finally:
+        conn.close()
+    changed = pd.Series(
+        [known.get(k) != h for k, h in zip(keys[candidates], hashes[candidates])],
+        index=keys[candidates].index,
+        dtype=bool,
+    )
+    upserts = [(dataset, k, hashes[i], now, now) for i, k in keys[changed[changed].index].items()]
+
+    keep = ~keyed | changed.reindex(df.index, fill_value=False)
+    skipped = int((~keep).sum())
+    metrics.incr("dedup_kept_total", int(keep.sum()), dataset=dataset)
+    metrics.incr("dedup_skipped_total", skipped, dataset=dataset)
+    print(f"🧬 Dedup [{dataset}]: {int(keep.sum())} new/changed, {skipped} unchanged skipped")
+    return df[keep], upserts
+
+
+def record_hashes(upserts, index_path=None):
+    """Applies the upserts returned by `filter_changed`; call it only after the rows were saved."""
+    if not upserts:
+        return 0
+    conn = connect(index_path or index_path_for(upserts[0][0]))
+    try:
+        with conn:
+            conn.executemany(
+                """INSERT INTO record_hashes VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(dataset, record_key) DO UPDATE
+                   SET content_hash = excluded.content_hash, last_changed = excluded.last_changed""",
+                upserts,
+            )
+    finally:
+        conn.close()
+    return len(upserts)
+
+
+def keep_changed(df, path, index_path=None):
+    """Applies the dataset's DEDUP_SPECS (picked by CSV name); unknown datasets pass through.
+
+    Returns (df, on_saved): call `on_saved()` after the rows are saved to record their hashes.
+    """
+    dataset = Path(path).stem
+    if dataset not in DEDUP_SPECS:
+        return df, None
+    key_columns, content_columns = DEDUP_SPECS[dataset]
+    bootstrap_from_csv(path, index_path)
+    df, upserts = filter_changed(df, dataset, key_columns, content_columns, index_path)
+    return df, partial(record_hashes, upserts, index_path)
+
+
+# ===== BOOTSTRAP ===== #
+def bootstrap_from_csv(path, index_path=None, chunksize=100_000):
+    """Seeds an empty index from an existing dataset, so history already on disk isn't re-stored.
+
+    This is how a fresh checkout (a GitHub Actions runner, a new Render disk) gets its index back.
+    """
+    path = Path(path)
+    dataset = path.stem
+    key_columns, content_columns = DEDUP_SPECS[dataset]
+
+    conn = connect(index_path or index_path_for(dataset))
+    try:
+        seeded = conn.execute(
+            "SELECT 1 FROM record_hashes WHERE dataset = ? LIMIT 1", (dataset,)
+        ).fetchone()
+        if seeded or not path.exists() or path.stat().st_size == 0:
+            return 0
+
+        now = int(time.time())
+        total = 0
+        usecols = lambda col: col in key_columns or col in content_columns
+        with conn:
+            for chunk in pd.read_csv(path, usecols=usecols, dtype=str, chunksize=chunksize, on_bad_lines="skip"):
+                keys = record_keys(chunk, key_columns)
+                hashes = content_hashes(chunk, content_columns)
+                # Later rows are newer, so they overwrite earlier versions of the same key
+                conn.executemany(
+                    """INSERT INTO record_hashes VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(dataset, record_key) DO UPDATE SET content_hash = excluded.content_hash""",
+                    [(dataset, k, h, now, now) for k, h in zip(keys, hashes)],
+                )
+                total += len(chunk)
+        print(f"🧬 Seeded dedup index for {dataset} from {total} existing rows")
+        return total
+    finally:
+        conn.close()
@@ -0,0 +1,125 @@
+from functools import lru_cache
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+
+BASE_URL = "https://www.jumia.com.ng"
+
+
+# ===== COMPILED SELECTORS ===== #
+class ExtractionPlan:
+    """CSS selectors from scripts.config.selector compiled to XPath once and reused for every page."""
+
+    def __init__(self, selector):
+        self.card = CSSSelector(selector["id"])
+        self.name = CSSSelector(selector["name"])
+        self.price = CSSSelector(selector["price"])
+        self.ratings = CSSSelector(selector["ratings"])
+        self.page_next = CSSSelector(selector["page_next"]) if selector.get("page_next") else None
+        self.card_tag = selector["id"].split(".", 1)[0] or "article"
+
+
+@lru_cache(maxsize=16)
+def _compile(items):
+    return ExtractionPlan(dict(items))
+
+
+def compile_selector(selector):
+    return _compile(tuple(sorted(selector.items())))
+
+
+# ===== PARSING ===== #
+def _grid_bounds(text, card_tag):
+    """Character span covering every product card, or None if the markup isn't recognised."""
+    start = text.find(f"<{card_tag} ")
+    end = text.rfind(f"</{card_tag}>")
+    if start == -1 or end == -1 or end < start:
+        return None
+    return start, end + len(card_tag) + 3
+
+
+def _parse(fragment):
+    return lxml_html.fromstring(f"<html><body>{fragment}</body></html>")
+
+
+def parse_page(text, plan, grid_only=True):
+    """Returns (cards_root, pagination_root).
+
+    With grid_only, only the product grid and the markup after it (where pagination lives) are parsed;
+    the <head>, scripts and navigation before the grid are skipped (see _before_grid for the exception).
+    """
+    bounds = _grid_bounds(text, plan.card_tag) if grid_only else None
+    if bounds is None:
+        root = lxml_html.fromstring(text)
+        return root, root
+    start, end = bounds
+    return _parse(text[start:end]), _parse(text[end:])
+
+
+def _before_grid(text, plan):
+    """Root of the markup skipped before the grid, or None. Parsed only when pagination wasn't found
+    below the grid (the last page, or a layout with the pager above the products)."""
+    start = _grid_bounds(text, plan.card_tag)[0]
+    return lxml_html.fromstring(text[:start]) if text[:start].strip() else None
+
+
+def _first_text(element, compiled):
+    found = compiled(element)
+    return found[0].text_content().strip() if found else None
+
+
+def _first_link(element):
+    for anchor in element.iterdescendants("a"):
+        if anchor.get("href") is not None:
+            return anchor.get("href")
+    return None
+
+
+# ===== PRODUCT EXTRACTION ===== #
+def extract_products(text, selector, grid_only=True):
+    """lxml equivalent of fetch_product_from_page on raw HTML. Returns (products, has_next).
+
+    Output matches the BeautifulSoup path: cards without a name or price are skipped,
+    missing ratings become "No ratings" and missing links "No link available".
+    """
+    plan = compile_selector(selector)
+    cards_root, pagination_root = parse_page(text, plan, grid_only)
+
+    results = []
+    for item in plan.card(cards_root):
+        name = _first_text(item, plan.name)
+        price = _first_text(item, plan.price)
+        if name is None or price is None:
+            print("⚠️ Error parsing one product: missing name or price")
+            continue
+
+        ratings = _first_text(item, plan.ratings)
+        link = _first_link(item)
+        results.append({
+            "Name": name,
+            "Price": price,
+            "Ratings": ratings if ratings is not None else "No ratings",
+            "Description Link": f"{BASE_URL}{link}" if link is not None else "No link available",
+        })
+
+    has_next = False
+    if plan.page_next is not None:
+        has_next = bool(plan.page_next(pagination_root)) or bool(plan.page_next(cards_root))
+        if not has_next and pagination_root is not cards_root:
+            before = _before_grid(text, plan)
+            has_next = before is not None and bool(plan.page_next(before))
+    return results, has_next
+
+
+# ===== DETAIL PAGE EXTRACTION ===== #
+@lru_cache(maxsize=16)
+def _compile_detail(items):
+    return {field: CSSSelector(css) for field, css in items}
+
+
+def extract_detail(text, detail_selector):
+    """One product detail page -> {field: text or None} for every field in scripts.config.detail_selector."""
+    plan = _compile_detail(tuple(detail_selector.items()))
+    root = lxml_html.fromstring(text)
+    return {field: _first_text(root, compiled) for field, compiled in plan.items()}
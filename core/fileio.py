@@ -0,0 +1,41 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+# Standard library only: imported by the run log, scheduler and checkpoints, which must stay
+# cheap to import (no pandas) so orchestrator/render_app start fast.
+
+# Held by every writer of the published data files (the dataset CSVs) and by core.git_sync
+# while it snapshots them, so a commit never captures a half-written file.
+DATA_LOCK = threading.RLock()
+
+
+# ===== ATOMIC FILE HELPERS ===== #
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Not supported on this platform (e.g. Windows)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, data):
+    """Writes `data` to a temp file next to `path`, fsyncs it, then renames it over `path`."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_name, path)
+        _fsync_dir(path.parent)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
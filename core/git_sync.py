@@ -0,0 +1,93 @@
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+from core.fileio import DATA_LOCK
+
+
+ROOT = Path(__file__).resolve().parents[1]
+GIT_IDENTITY = {"name": "DataIngestor-bot", "email": "bot@adip.io"}
+PUSH_ATTEMPTS = 3
+_publish_lock = threading.Lock()   # one fetch/commit/push at a time per process
+
+
+# ===== GIT PLUMBING ===== #
+def _git(*args, env=None, input=None):
+    result = subprocess.run(["git", *args], cwd=ROOT, env=env, input=input,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout.strip()
+
+
+def _snapshot(paths):
+    """Writes every existing path into the object store under DATA_LOCK -> {repo path: blob id}.
+
+    Dataset writers hold the same lock, so the blobs are one consistent snapshot even while
+    other jobs keep running.
+    """
+    blobs = {}
+    with DATA_LOCK:
+        for path in map(Path, paths):
+            if not path.exists():
+                continue
+            blobs[path.resolve().relative_to(ROOT).as_posix()] = _git("hash-object", "-w", str(path))
+    return blobs
+
+
+def _commit_tree(base, blobs, message):
+    """Commit of `base` with `blobs` replaced, built in a throwaway index; None if nothing changed."""
+    fd, index_file = tempfile.mkstemp(prefix="adip-index-")
+    os.close(fd)
+    os.remove(index_file)   # git wants to create the index itself
+    env = dict(os.environ, GIT_INDEX_FILE=index_file,
+               GIT_AUTHOR_NAME=GIT_IDENTITY["name"], GIT_AUTHOR_EMAIL=GIT_IDENTITY["email"],
+               GIT_COMMITTER_NAME=GIT_IDENTITY["name"], GIT_COMMITTER_EMAIL=GIT_IDENTITY["email"])
+    try:
+        _git("read-tree", base, env=env)
+        for repo_path, blob in blobs.items():
+            _git("update-index", "--add", "--cacheinfo", f"100644,{blob},{repo_path}", env=env)
+        tree = _git("write-tree", env=env)
+    finally:
+        if os.path.exists(index_file):
+            os.remove(index_file)
+    if tree == _git("rev-parse", f"{base}^{{tree}}"):
+        return None
+    return _git("commit-tree", tree, "-p", base, "-m", message, env=env)
+
+
+# ===== PUBLISH ===== #
+def publish(paths, message, remote, branch="main"):
+    """Commits the current content of `paths` on top of `remote`/`branch` and pushes it.
+
+    Only the listed files are committed: the working tree, the index and HEAD are never touched
+    (no stash, pull or checkout), so jobs still writing other files are unaffected.
+    A push rejected because the branch moved is retried on the new tip.
+    Returns True when pushed or when there was nothing to commit.
+    """
+    with _publish_lock:
+        return _publish(paths, message, remote, branch)
+
+
+def _publish(paths, message, remote, branch):
+    blobs = _snapshot(paths)
+    if not blobs:
+        print("✅ No data files to commit.")
+        return True
+
+    for attempt in range(1, PUSH_ATTEMPTS + 1):
+        _git("fetch", "--quiet", remote, branch)
+        base = _git("rev-parse", "FETCH_HEAD")
+        commit = _commit_tree(base, blobs, message)
+        if commit is None:
+            print("✅ No changes to commit.")
+            return True
+        try:
+            _git("push", "--quiet", remote, f"{commit}:refs/heads/{branch}")
+            return True
+        except RuntimeError as e:
+            if attempt == PUSH_ATTEMPTS:
+                raise
+            print(f"🔁 Push rejected ({e}); retrying on the new tip ({attempt}/{PUSH_ATTEMPTS})")
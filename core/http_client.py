@@ -0,0 +1,185 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from core import metrics, politeness
+
+
+# ===== CLIENT SETTINGS (single place for pool / keep-alive / retry / timeout policy) ===== #
+HTTP_SETTINGS = {
+    "pool_connections": 4,       # connection pools cached per session
+    "pool_maxsize": 8,           # keep-alive sockets kept open per host
+    "keep_alive": True,
+    "retries": 2,                # transport-level retries (connect errors, 502/504)
+    "backoff_factor": 1.0,       # 1s, 2s, 4s ... between transport retries
+    # 429/503 are not retried here: they reach core.politeness, which owns throttling
+    "status_forcelist": (502, 504),
+    "connect_timeout": 5,
+    "read_timeout": 15,
+}
+
+_sessions = {}
+_lock = threading.Lock()
+_counters = {}      # host -> {"requests": n, "connections": n}
+
+
+def _count(host, field):
+    with _lock:
+        counter = _counters.setdefault(host, {"requests": 0, "connections": 0})
+        counter[field] += 1
+
+
+# ===== COUNTING TRANSPORT ===== #
+# Every real TCP(+TLS) connect goes through _new_conn, so counting there tells
+# us exactly how many handshakes were paid versus how many requests were sent.
+class _CountingHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        _count(f"{self.host}:{self.port}", "connections")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        _count(f"{self.host}:{self.port}", "connections")
+        return super()._new_conn()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _CountingAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        _count(f"{parts.hostname}:{port}", "requests")
+        return super().send(request, **kwargs)
+
+
+def configure(**overrides):
+    """Updates the client settings. Existing sessions are dropped so the new policy applies."""
+    unknown = set(overrides) - set(HTTP_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown HTTP settings: {sorted(unknown)}")
+    HTTP_SETTINGS.update(overrides)
+    close_all()
+
+
+def _build_session(retries=True):
+    retry = Retry(
+        total=HTTP_SETTINGS["retries"] if retries else 0,
+        read=0,
+        backoff_factor=HTTP_SETTINGS["backoff_factor"],
+        status_forcelist=HTTP_SETTINGS["status_forcelist"],
+        # Idempotent methods only (urllib3's default set): POSTs such as Konga's GraphQL queries
+        # are retried by their caller's own loop, so the two layers don't multiply requests
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=False,   # Retry-After is applied by the host's limiter
+        raise_on_status=False,
+    )
+    adapter = _CountingAdapter(
+        pool_connections=HTTP_SETTINGS["pool_connections"],
+        pool_maxsize=HTTP_SETTINGS["pool_maxsize"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not HTTP_SETTINGS["keep_alive"]:
+        session.headers["Connection"] = "close"
+    return session
+
+
+# ===== SESSION POOL ===== #
+def get_session(url, retries=True):
+    """Returns the pooled session for the host of `url`, creating it on first use.
+
+    retries=False gives the host's retry-less session: one attempt, so the caller's timeout
+    bounds the whole call.
+    """
+    key = (urlsplit(url).netloc, retries)
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _build_session(retries)
+                _sessions[key] = session
+    return session
+
+
+def default_timeout():
+    return (HTTP_SETTINGS["connect_timeout"], HTTP_SETTINGS["read_timeout"])
+
+
+def request(method, url, retries=True, **kwargs):
+    """Sends a request through the host's pooled session, applying the default timeout.
+
+    With retries=False no transport retry is made (see get_session).
+    The outcome is reported to the host's adaptive rate limiter, if it has one.
+    """
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = default_timeout()
+    host = urlsplit(url).netloc
+    started = time.perf_counter()
+    try:
+        response = get_session(url, retries).request(method, url, **kwargs)
+    except Exception as e:
+        metrics.incr("http_errors_total", host=host, error=type(e).__name__)
+        politeness.record_response(url)
+        raise
+    elapsed = time.perf_counter() - started
+    # Status, latency and Retry-After steer the host's adaptive rate limit (core.politeness)
+    politeness.record_response(url, response.status_code, elapsed, response.headers.get("Retry-After"))
+    metrics.observe("http_request_seconds", elapsed, host=host)
+    metrics.incr("http_requests_total", host=host, status=response.status_code)
+    metrics.incr("http_bytes_downloaded_total", len(response.content), host=host)
+    return response
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def close_all():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# ===== CONNECTION REUSE COUNTERS ===== #
+def connection_stats():
+    """Per-host request vs. new-connection counts; `reused` is the number of saved handshakes."""
+    with _lock:
+        snapshot = {host: dict(counter) for host, counter in _counters.items()}
+
+    for counter in snapshot.values():
+        counter["reused"] = max(counter["requests"] - counter["connections"], 0)
+    return snapshot
+
+
+def reset_stats():
+    with _lock:
+        _counters.clear()
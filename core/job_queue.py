@@ -0,0 +1,144 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when `max_queued` jobs are already waiting."""
+
+
+# ===== IN-PROCESS JOB QUEUE ===== #
+class JobQueue:
+    """Bounded FIFO of jobs served by a fixed pool of worker threads, with single-flight dedup.
+
+    Every job holds a set of `keys` (the job names it touches). Submitting work whose keys are
+    already covered by a queued or running job returns that job's ID instead of queueing a
+    duplicate, and a worker never starts a job whose keys overlap one that is running, so the
+    same job can't race itself on the same files. Overlapping jobs start in submission order: a
+    later job never overtakes an older queued one it shares a key with, so a wide job (e.g. ALL)
+    can't be starved by a stream of single runs.
+    """
+
+    def __init__(self, workers=2, max_queued=16, history=200):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.history = history
+        self.cond = threading.Condition()
+        self.entries = OrderedDict()   # id -> entry, oldest first
+        self.queue = deque()           # ids waiting to run
+        self.running = set()           # ids being run
+        self.threads = []
+
+    def _start_workers(self):
+        while len(self.threads) < self.workers:
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{len(self.threads)}", daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    # --- submit ---
+    def submit(self, name, fn, keys=None):
+        """Queues `fn()` under `name`; returns (job_id, created). created=False means deduplicated."""
+        keys = frozenset(keys or [name])
+        with self.cond:
+            for job_id in list(self.running) + list(self.queue):
+                if keys <= self.entries[job_id]["keys"]:
+                    return job_id, False
+            if len(self.queue) >= self.max_queued:
+                raise QueueFull(f"{len(self.queue)} jobs already queued")
+
+            job_id = uuid.uuid4().hex[:12]
+            self.entries[job_id] = {
+                "id": job_id,
+                "job": name,
+                "keys": keys,
+                "fn": fn,
+                "status": "queued",
+                "submitted_at": datetime.utcnow().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "_started": None,
+                "duration_seconds": None,
+                "result": None,
+                "error": None,
+            }
+            self.queue.append(job_id)
+            self._prune()
+            self._start_workers()
+            self.cond.notify_all()
+            return job_id, True
+
+    def _prune(self):
+        finished = [i for i, e in self.entries.items() if e["status"] in ("succeeded", "failed")]
+        for job_id in finished[:max(0, len(self.entries) - self.history)]:
+            self.entries.pop(job_id)
+
+    # --- workers ---
+    def _next_runnable(self):
+        busy = set().union(*(self.entries[i]["keys"] for i in self.running)) if self.running else set()
+        for job_id in self.queue:
+            keys = self.entries[job_id]["keys"]
+            if not (keys & busy):
+                return job_id
+            busy |= keys   # still waiting: younger jobs on these keys queue up behind it
+        return None
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                job_id = self._next_runnable()
+                while job_id is None:
+                    self.cond.wait()
+                    job_id = self._next_runnable()
+                self.queue.remove(job_id)
+                self.running.add(job_id)
+                entry = self.entries[job_id]
+                entry.update(status="running", started_at=datetime.utcnow().isoformat(), _started=time.monotonic())
+
+            try:
+                result = entry["fn"]()
+                ok = not (isinstance(result, dict) and result.get("success") is False)
+                error = None if ok else result.get("error")
+            except Exception as e:
+                traceback.print_exc()
+                result, ok, error = None, False, str(e)
+
+            with self.cond:
+                entry.update(
+                    status="succeeded" if ok else "failed",
+                    result=result,
+                    error=error,
+                    finished_at=datetime.utcnow().isoformat(),
+                    duration_seconds=round(time.monotonic() - entry["_started"], 3),
+                )
+                self.running.discard(job_id)
+                self.cond.notify_all()
+
+    # --- status ---
+    def _public(self, entry):
+        view = {k: v for k, v in entry.items() if k not in ("fn", "keys", "_started")}
+        view["keys"] = sorted(entry["keys"])
+        if entry["status"] == "running":
+            view["running_seconds"] = round(time.monotonic() - entry["_started"], 3)
+        elif entry["status"] == "queued":
+            view["position"] = list(self.queue).index(entry["id"]) + 1
+        return view
+
+    def status(self, job_id):
+        with self.cond:
+            entry = self.entries.get(job_id)
+            return self._public(entry) if entry else None
+
+    def snapshot(self, limit=50):
+        """Queue depth, running jobs and the most recent jobs (newest first)."""
+        with self.cond:
+            recent = list(self.entries.values())[-limit:][::-1]
+            return {
+                "workers": self.workers,
+                "max_queued": self.max_queued,
+                "queue_depth": len(self.queue),
+                "running": [self._public(self.entries[i]) for i in self.running],
+                "jobs": [self._public(e) for e in recent],
+            }
@@ -0,0 +1,69 @@
+import importlib
+import threading
+from collections.abc import MutableMapping
+
+
+# ===== LAZY JOB REGISTRY ===== #
+def resolve(target):
+    """"package.module:attribute" -> the attribute, importing the module on the way."""
+    module_name, _, attribute = target.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Job target must look like 'package.module:function', got '{target}'")
+    obj = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class LazyJobs(MutableMapping):
+    """Job name -> callable, where entries may be given as dotted paths ("module:function").
+
+    A path is imported the first time its job is looked up and the callable is cached, so
+    listing, `in` checks and running one job never import the other jobs' modules (pandas,
+    BeautifulSoup, lxml, ...). Plain callables can be registered or swapped in as well.
+    """
+
+    def __init__(self, targets=None):
+        self._targets = {}    # name -> callable or "module:function"
+        self._lock = threading.Lock()
+        self.update(targets or {})
+
+    def __getitem__(self, name):
+        target = self._targets[name]
+        if not isinstance(target, str):
+            return target
+        with self._lock:   # concurrent jobs must not resolve (import) the same entry twice
+            target = self._targets[name]
+            if isinstance(target, str):
+                target = self._targets[name] = resolve(target)
+        return target
+
+    def __setitem__(self, name, target):
+        if not (isinstance(target, str) or callable(target)):
+            raise TypeError(f"Job {name} must be a callable or a 'module:function' path")
+        self._targets[name] = target
+
+    def __delitem__(self, name):
+        del self._targets[name]
+
+    def __iter__(self):
+        return iter(self._targets)
+
+    def __len__(self):
+        return len(self._targets)
+
+    def __contains__(self, name):
+        return name in self._targets   # Mapping's default would import the job via __getitem__
+
+    def is_loaded(self, name):
+        return not isinstance(self._targets[name], str)
+
+    def target(self, name):
+        """Where a job comes from, without importing it."""
+        target = self._targets[name]
+        if isinstance(target, str):
+            return target
+        return f"{getattr(target, '__module__', '?')}:{getattr(target, '__qualname__', repr(target))}"
+
+    def __repr__(self):
+        return f"LazyJobs({ {name: self.target(name) for name in self._targets} })"
@@ -0,0 +1,201 @@
+import functools
+import threading
+import time
+
+
+# Histogram bounds (seconds) shared by every timer; covers parse times up to slow page fetches
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_counters = {}     # (name, labels) -> float
+_timers = {}       # (name, labels) -> {"count", "sum", "max", "buckets": [..]}
+_gauges = {}       # (name, labels) -> float (last value set)
+_windows = {}      # id -> window still open (see window)
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+# ===== RECORDING ===== #
+def incr(name, value=1, **labels):
+    """Adds `value` to a counter (requests, bytes, rows, ...)."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def gauge(name, value, **labels):
+    """Sets a value that goes up and down (current request rate, queue depth, ...)."""
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def observe(name, seconds, **labels):
+    """Records one duration for a timer."""
+    key = _key(name, labels)
+    with _lock:
+        stat = _timers.get(key)
+        if stat is None:
+            stat = _timers[key] = {"count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * len(BUCKETS)}
+        stat["count"] += 1
+        stat["sum"] += seconds
+        stat["max"] = max(stat["max"], seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                stat["buckets"][i] += 1
+                break
+
+
+class timer:
+    """`with timer("parse_seconds", engine="lxml"):` — one instance per `with` block."""
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+def timed(name, **labels):
+    """`@timed("save_seconds")`; the start time is local to each call, so threads never share it."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started, **labels)
+        return wrapper
+    return decorate
+
+
+# ===== READING ===== #
+def snapshot():
+    """{"counters": {"name{labels}": value}, "gauges": {"name{labels}": value},
+    "timers": {"name{labels}": {"count", "sum", "max"}}}."""
+    with _lock:
+        counters = {name + _label_text(labels): value for (name, labels), value in _counters.items()}
+        gauges = {name + _label_text(labels): value for (name, labels), value in _gauges.items()}
+        timers = {
+            name + _label_text(labels): {"count": s["count"], "sum": s["sum"], "max": s["max"]}
+            for (name, labels), s in _timers.items()
+        }
+    return {"counters": counters, "gauges": gauges, "timers": timers}
+
+
+def delta(before, after=None, job=None):
+    """What happened between two snapshots (rounded, zero entries dropped) — used for job reports.
+
+    Metrics are process-wide: a delta is one job's only if nothing else ran in between (see
+    window). With `job`, only metrics labelled job="<job>" are kept, which stay exact even then.
+    Gauges that changed are reported at their end value.
+    """
+    after = after or snapshot()
+    own = (lambda name: f'job="{job}"' in name) if job is not None else (lambda name: True)
+    counters = {}
+    for name, value in after["counters"].items():
+        change = value - before["counters"].get(name, 0)
+        if change and own(name):
+            counters[name] = round(change, 3)
+    timers = {}
+    for name, stat in after["timers"].items():
+        prev = before["timers"].get(name, {"count": 0, "sum": 0.0})
+        count = stat["count"] - prev["count"]
+        if count and own(name):
+            total = stat["sum"] - prev["sum"]
+            timers[name] = {"count": count, "total_seconds": round(total, 4),
+                            "mean_seconds": round(total / count, 4)}
+    gauges = {name: round(value, 4) for name, value in after.get("gauges", {}).items()
+              if value != before.get("gauges", {}).get(name) and own(name)}
+    return {"counters": counters, "gauges": gauges, "timers": timers}
+
+
+class window:
+    """`with metrics.window() as w:` then `w.delta()` — what was recorded since the block started.
+
+    `w.overlapped` turns True if any other window was open at some point during this one (e.g.
+    jobs running in parallel): its delta then also holds the other jobs' http_*, sink_*, ... metrics.
+    """
+
+    def __init__(self):
+        self.before = None
+        self.overlapped = False
+
+    def __enter__(self):
+        with _lock:
+            if _windows:
+                self.overlapped = True
+                for other in _windows.values():
+                    other.overlapped = True
+            _windows[id(self)] = self
+        self.before = snapshot()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with _lock:
+            _windows.pop(id(self), None)
+        return False
+
+    def delta(self, job=None):
+        return delta(self.before, job=job)
+
+
+def to_prometheus(prefix="adip_"):
+    """Prometheus text exposition format: counters as *_total, gauges as-is, timers as histograms."""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+        timers = sorted((k, dict(v, buckets=list(v["buckets"]))) for k, v in _timers.items())
+
+    seen = set()
+    for (name, labels), value in counters:
+        metric = prefix + name + ("" if name.endswith("_total") else "_total")
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} counter")
+            seen.add(metric)
+        lines.append(f"{metric}{_label_text(labels)} {value}")
+
+    for (name, labels), value in gauges:
+        metric = prefix + name
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} gauge")
+            seen.add(metric)
+        lines.append(f"{metric}{_label_text(labels)} {value}")
+
+    for (name, labels), stat in timers:
+        metric = prefix + name
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} histogram")
+            seen.add(metric)
+        cumulative = 0
+        for bound, count in zip(BUCKETS, stat["buckets"]):
+            cumulative += count
+            lines.append(f"{metric}_bucket{_label_text(labels + (('le', str(bound)),))} {cumulative}")
+        lines.append(f"{metric}_bucket{_label_text(labels + (('le', '+Inf'),))} {stat['count']}")
+        lines.append(f"{metric}_sum{_label_text(labels)} {stat['sum']:.6f}")
+        lines.append(f"{metric}_count{_label_text(labels)} {stat['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _timers.clear()
@@ -0,0 +1,208 @@
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Optional backend — only needed when ADIP_STORAGE_BACKEND=parquet
+    pa = ds = pq = None
+
+
+# ===== DATASET SPECS ===== #
+# timestamp      -> column used for the date=YYYY-MM-DD partition (stored as epoch seconds)
+# timezone       -> zone of naive timestamp strings ("local" = this machine's zone)
+# source_column  -> per-row partition key (e.g. the Jumia category) ...
+# source         -> ... or a constant one when the dataset has a single origin
+# prices / ints  -> int64, ratings / floats -> float64, bools -> bool; every other column is a string
+DATASETS = {
+    "scraper_dataset": {
+        "timestamp": "Timestamp",
+        "timezone": "local",          # automated_scraper stamps rows with datetime.now()
+        "source_column": "Category",
+        "prices": ["Price", "Price_kobo"],
+        "ratings": ["Ratings", "Rating"],
+        "floats": [],
+    },
+    "api_ingestor": {
+        "timestamp": "fetched_at",
+        "timezone": "UTC",            # datetime.utcnow()
+        "source": "konga",
+        "prices": ["price", "deal_price", "final_price"],
+        "ratings": [],
+        "floats": ["rating_avg"],
+        "ints": ["quantity", "rating_count"],
+        "bools": ["in_stock"],
+    },
+    "api_auth": {
+        "timestamp": "Timestamp_UTC",
+        "timezone": "UTC",            # epoch seconds already
+        "source": "weatherapi",
+        "prices": [],
+        "ratings": [],
+        "floats": ["Latitude", "Longitude", "Temperature_C", "Wind_KPH",
+                   "AQI_US", "CO", "NO2", "O3", "PM2.5"],
+    },
+}
+BOOL_VALUES = {"true": True, "false": False, "1": True, "0": False}
+
+PARTITION_FIELDS = ["date", "source"]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("⚠️ The Parquet backend needs pyarrow — run `pip install pyarrow`.")
+
+
+def dataset_root(csv_path):
+    """data/api_auth.csv -> data/api_auth_parquet/"""
+    csv_path = Path(csv_path)
+    return csv_path.parent / f"{csv_path.stem}_parquet"
+
+
+# ===== TYPE COERCION ===== #
+def parse_price(series):
+    """'₦ 93,060' / '₦ 10,000 - ₦ 12,000' / 24725 -> 93060 / 10000 / 24725 (nullable Int64)."""
+    if not pd.api.types.is_numeric_dtype(series):
+        series = series.astype("string").str.extract(r"(\d[\d,]*(?:\.\d+)?)", expand=False).str.replace(",", "")
+    return pd.to_numeric(series, errors="coerce").round().astype("Int64")
+
+
+def parse_rating(series):
+    """'4.1 out of 5' -> 4.1, 'No ratings' -> NaN."""
+    if not pd.api.types.is_numeric_dtype(series):
+        series = series.astype("string").str.extract(r"(\d+(?:\.\d+)?)", expand=False)
+    return pd.to_numeric(series, errors="coerce").astype("float64")
+
+
+def to_epoch(series, timezone="UTC"):
+    """Datetime strings or epoch numbers -> int64 epoch seconds (UTC).
+
+    Naive strings are taken as wall-clock time in `timezone` ("local" = this machine's zone);
+    times that don't exist or are ambiguous there (DST changes) become null.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.to_numeric(series, errors="coerce").astype("Int64")
+    parsed = pd.to_datetime(series, errors="coerce")
+    if parsed.dt.tz is None:
+        zone = datetime.now().astimezone().tzinfo if timezone == "local" else timezone
+        parsed = parsed.dt.tz_localize(zone, ambiguous="NaT", nonexistent="NaT")
+    seconds = (parsed.dt.tz_convert("UTC") - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    return seconds.astype("Int64")
+
+
+def parse_bool(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype("boolean")
+    return series.astype("string").str.strip().str.lower().map(BOOL_VALUES).astype("boolean")
+
+
+def coerce_types(df, name):
+    """Applies the dataset's typed columns: numeric prices, float ratings/metrics, epoch timestamps;
+    every column without a type in the spec becomes a string."""
+    spec = DATASETS[name]
+    df = df.copy()
+    typed = set()
+    for col in spec["prices"]:
+        if col in df:
+            df[col] = parse_price(df[col])
+    for col in spec["ratings"]:
+        if col in df:
+            df[col] = parse_rating(df[col])
+    for col in spec["floats"]:
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    for col in spec.get("ints", []):
+        if col in df:
+            df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int64")
+    for col in spec.get("bools", []):
+        if col in df:
+            df[col] = parse_bool(df[col])
+    if spec["timestamp"] in df:
+        df[spec["timestamp"]] = to_epoch(df[spec["timestamp"]], spec.get("timezone", "UTC"))
+    typed = _typed_columns(spec)
+    for col in df.columns:
+        if col not in typed:
+            df[col] = df[col].astype("string")
+    return df
+
+
+def _typed_columns(spec):
+    return {spec["timestamp"], *spec["prices"], *spec["ratings"], *spec["floats"],
+            *spec.get("ints", []), *spec.get("bools", [])}
+
+
+def arrow_schema(df, name):
+    """Pinned Parquet schema for the dataset's columns, so every file (and every migration chunk)
+    gets the same types, even when a batch has a column that is entirely null."""
+    spec = DATASETS[name]
+    types = {spec["timestamp"]: pa.int64()}
+    types.update({col: pa.int64() for col in [*spec["prices"], *spec.get("ints", [])]})
+    types.update({col: pa.float64() for col in [*spec["ratings"], *spec["floats"]]})
+    types.update({col: pa.bool_() for col in spec.get("bools", [])})
+    return pa.schema([(col, types.get(col, pa.string())) for col in df.columns])
+
+
+def _partition_keys(df, name):
+    spec = DATASETS[name]
+    epoch = df[spec["timestamp"]] if spec["timestamp"] in df else pd.Series(pd.NA, index=df.index)
+    dates = pd.to_datetime(epoch, unit="s", errors="coerce", utc=True).dt.strftime("%Y-%m-%d").fillna("unknown")
+    if spec.get("source_column") and spec["source_column"] in df:
+        sources = df[spec["source_column"]].astype("string").fillna("unknown")
+    else:
+        sources = pd.Series(spec.get("source", name), index=df.index)
+    return dates, sources
+
+
+# ===== WRITER ===== #
+def write_partitions(df, csv_path):
+    """Writes one run as Parquet files under <root>/date=YYYY-MM-DD/source=<key>/part-<id>.parquet.
+
+    Each file is written to a temp name and renamed, so readers never see half a partition.
+    """
+    _require_pyarrow()
+    if df is None or df.empty:
+        return 0
+
+    name = Path(csv_path).stem
+    root = dataset_root(csv_path)
+    typed = coerce_types(df, name)
+    schema = arrow_schema(typed, name)
+    dates, sources = _partition_keys(typed, name)
+    run_id = uuid.uuid4().hex[:12]
+
+    written = 0
+    for (date, source), part in typed.groupby([dates, sources], sort=False):
+        directory = root / f"date={date}" / f"source={source}"
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"part-{run_id}.parquet"
+        tmp = directory / f".part-{run_id}.parquet.tmp"
+        pq.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False), tmp)
+        os.replace(tmp, target)
+        written += len(part)
+
+    print(f"🧊 Wrote {written} rows as Parquet under {root}")
+    return written
+
+
+# ===== READER ===== #
+def read_dataset(csv_path, columns=None, filters=None):
+    """Reads a Parquet dataset with column projection and partition/row filter push-down.
+
+    filters use pyarrow's DNF tuples, e.g. [("date", ">=", "2025-11-01"), ("source", "==", "laptops")].
+    Partition filters prune whole directories before any file is opened.
+    """
+    _require_pyarrow()
+    root = dataset_root(csv_path)
+    if not root.exists():
+        return pd.DataFrame(columns=columns or [])
+
+    partitioning = ds.partitioning(
+        pa.schema([(field, pa.string()) for field in PARTITION_FIELDS]), flavor="hive"
+    )
+    table = pq.read_table(root, columns=columns, filters=filters, partitioning=partitioning)
+    return table.to_pandas()
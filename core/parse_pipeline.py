@@ -0,0 +1,254 @@
+import atexit
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from core import metrics
+from core.response_cache import get_cache
+from core.politeness import limiter_for
+from core.scraper_engine import PageFetchError, safe_request
+
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+# Never fork: the parent runs fetch/crawl threads, and a fork taken while one of them holds a
+# lock (logging, the sessions, SQLite) deadlocks the child. forkserver/spawn start clean.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_DONE = object()   # fetcher -> dispatcher: no more pages coming
+
+
+# ===== PARSER WORKERS (run in child processes) ===== #
+def _parse_worker(page, html_bytes, encoding, selector):
+    """Top-level so it can be pickled into the process pool. Returns (page, products, has_next, seconds)."""
+    started = time.perf_counter()
+    text = html_bytes.decode(encoding or "utf-8", errors="replace")
+    try:
+        from core.fast_extract import extract_products
+        products, has_next = extract_products(text, selector)
+    except ImportError:
+        from bs4 import BeautifulSoup
+        from core.scraper_engine import fetch_product_from_page
+        soup = BeautifulSoup(text, "lxml")
+        products = fetch_product_from_page(soup, selector)
+        has_next = soup.select_one(selector.get("page_next")) is not None
+    return page, products, has_next, time.perf_counter() - started
+
+
+def get_parse_pool(workers):
+    """One process pool shared by every category, so parallel categories don't multiply processes.
+
+    Created on first call (call it before starting crawl threads) and never resized afterwards:
+    other categories may have parses in flight, so a later call with another size reuses it.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context(POOL_START_METHOD))
+            _pool_workers = workers
+        elif workers != _pool_workers:
+            print(f"⚠️ Parse pool already running with {_pool_workers} processes; ignoring parse_workers={workers}")
+        return _pool
+
+
+@atexit.register
+def shutdown_parse_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+# ===== FETCH STAGE (threads) ===== #
+def _fetcher(base_url, headers, pages, raw_queue, stop, bucket, cache, counter):
+    while not stop.is_set():
+        with counter["ready"]:
+            # Stay within the window the dispatcher allows, so few pages past the end get fetched
+            while counter["next"] >= counter["limit"] and not stop.is_set():
+                counter["ready"].wait(timeout=0.1)
+            page = counter["next"]
+            if page > pages or stop.is_set():
+                break
+            counter["next"] += 1
+
+        bucket.acquire()
+        print(f"\n🔄 Fetching page {page}...")
+        response = safe_request(f"{base_url}?page={page}", headers, cache=cache)
+
+        # put() blocks while the queue is full: parsers falling behind slow the fetchers down
+        item = (page, response)
+        while not stop.is_set():
+            try:
+                raw_queue.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+
+    raw_queue.put(_DONE)
+
+
+# ===== PIPELINED PAGINATION FUNCTION ===== #
+def fetch_all_products_pipelined(base_url, headers, selector, max_pages=20, bucket=None,
+                                 parse_workers=2, queue_depth=4, fetch_workers=1,
+                                 on_page=None, keep_results=True, start_page=1):
+    """Fetch threads push raw HTML onto a bounded queue; a process pool turns it into product records.
+
+    Results come back in page order with the same stop rules as fetch_all_products (a page that
+    failed before the end raises PageFetchError once the pages before it were delivered).
+    At most `queue_depth` raw pages plus `parse_workers` pages being parsed are held in memory,
+    and fetchers stay at most `parse_workers + fetch_workers` pages ahead of the first page that is
+    not final yet, so only that many pages past the end of a category are ever requested.
+    `on_page(page, products)` is called in page order as pages become final; with
+    keep_results=False nothing is accumulated after delivery.
+    `start_page` resumes a category part way through (see core.checkpoints).
+    Fetches are paced by `bucket`, by default the host's adaptive limiter (core.politeness).
+    """
+    cache = get_cache()
+    bucket = bucket or limiter_for(base_url)
+    pool = get_parse_pool(parse_workers)
+    raw_queue = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+    window = parse_workers + fetch_workers
+    counter = {"next": start_page, "limit": start_page + window, "ready": threading.Condition()}
+
+    fetchers = [
+        threading.Thread(
+            target=_fetcher,
+            args=(base_url, headers, max_pages, raw_queue, stop, bucket, cache, counter),
+            daemon=True,
+        )
+        for _ in range(fetch_workers)
+    ]
+    for thread in fetchers:
+        thread.start()
+
+    print(f"🧵 Pipeline: {fetch_workers} fetcher(s) → queue[{queue_depth}] → {parse_workers} parser process(es)")
+
+    results = {}
+    end_at = max_pages + 1     # first page past the end of the category
+    failed_at = end_at         # first page that failed
+    stop_at = end_at           # first page that must NOT be included
+    next_emit = start_page
+    final_results = []
+    in_flight = {}
+    cache_keys = {}
+    finished_fetchers = 0
+
+    def settle(page, products, has_next):
+        nonlocal end_at
+        if page >= stop_at:
+            return
+        if not products:
+            print(f"⚠️ No more products found (page {page}). Stopping pagination.")
+            end_at = page
+        else:
+            results[page] = products
+            print(f"✅ Page {page} done — {len(products)} items found.")
+            if not has_next:
+                print("📘 End of pagination reached.")
+                end_at = page + 1
+        stop_after(end_at)
+
+    def fail(page):
+        nonlocal failed_at
+        failed_at = min(failed_at, page)
+        stop_after(failed_at)
+
+    def stop_after(page):
+        nonlocal stop_at
+        stop_at = min(stop_at, page)
+        if stop_at <= max_pages:
+            stop.set()
+        emit()
+
+    def emit():
+        nonlocal next_emit
+        while next_emit < stop_at and next_emit in results:
+            products = results.pop(next_emit)
+            if on_page is not None:
+                on_page(next_emit, products)
+            if keep_results:
+                final_results.extend(products)
+            next_emit += 1
+            with counter["ready"]:
+                counter["limit"] = next_emit + window
+                counter["ready"].notify_all()
+
+    def collect(block):
+        if not in_flight:
+            return
+        done, _ = wait(in_flight, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            failed_page = in_flight.pop(future)
+            try:
+                page, products, has_next, seconds = future.result()
+            except Exception as e:
+                print(f"❌ Parser worker failed on page {failed_page}: {e}")
+                fail(failed_page)
+                continue
+            # Metrics live in this process, so the worker reports its own parse time back
+            metrics.observe("parse_seconds", seconds, engine="process_pool")
+            metrics.incr("pages_parsed_total")
+            metrics.incr("products_parsed_total", len(products))
+            if cache is not None and page in cache_keys:
+                cache.store_parsed(cache_keys.pop(page), {"products": products, "has_next": has_next})
+            settle(page, products, has_next)
+
+    try:
+        while finished_fetchers < len(fetchers):
+            collect(block=False)
+            try:
+                item = raw_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                finished_fetchers += 1
+                continue
+
+            page, response = item
+            if page >= stop_at:
+                continue
+            if not response:
+                print(f"❌ Request failed for page {page}.")
+                fail(page)
+                continue
+
+            cache_key = getattr(response, "cache_key", None)
+            if cache is not None and cache_key and getattr(response, "unchanged", False):
+                cached = cache.parsed(cache_key)
+                if cached is not None:
+                    print(f"♻️ Page {page} unchanged — reusing cached parse.")
+                    metrics.incr("parse_cache_reused_total")
+                    settle(page, cached["products"], cached["has_next"])
+                    continue
+            if cache_key:
+                cache_keys[page] = cache_key
+
+            # Bound the pages being parsed as well as the pages waiting to be parsed
+            while len(in_flight) >= parse_workers:
+                collect(block=True)
+            in_flight[pool.submit(_parse_worker, page, response.content, response.encoding, selector)] = page
+
+        while in_flight:
+            collect(block=True)
+
+    finally:
+        # Also reached when on_page raises (e.g. a streaming consumer went away): release the fetchers
+        stop.set()
+        for future in in_flight:
+            future.cancel()
+        while any(thread.is_alive() for thread in fetchers):
+            try:
+                raw_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    if failed_at < end_at:
+        raise PageFetchError(f"page {failed_at} of {base_url} could not be fetched or parsed")
+    print(f"\n📦 Total products scraped: {len(final_results)}\n")
+    return final_results
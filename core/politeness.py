@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from core import metrics
+
+
+# ===== ADAPTIVE RATE LIMIT SETTINGS ===== #
+RATE_LIMIT_SETTINGS = {
+    "initial_rate": 0.5,      # requests/second a host starts at
+    "min_rate": 0.05,         # floor after repeated backoffs (one request every 20s)
+    "max_rate": 2.0,          # ceiling the limiter speeds up toward while the host is healthy
+    "burst": 2,
+    "increase": 0.05,         # additive speed-up per healthy response (req/s)
+    "decrease": 0.5,          # multiplicative slow-down on 403/429/503
+    "slow_decrease": 0.8,     # milder slow-down on 5xx, network errors and rising latency
+    "latency_factor": 2.0,    # recent latency this many times the baseline counts as congestion
+    "min_latency": 0.1,       # baselines below this (s) are rounded up, so jitter on fast hosts is ignored
+    "cooldown": 2.0,          # seconds between two slow-downs (a burst of 429s backs off once)
+    "max_retry_after": 300,   # Retry-After values are capped at this many seconds
+}
+# Per-host overrides of RATE_LIMIT_SETTINGS (APIs tolerate far more than HTML listing pages)
+HOST_RATE_LIMITS = {
+    "api.konga.com": {"initial_rate": 4.0, "max_rate": 10.0, "burst": 4, "increase": 0.2},
+}
+THROTTLE_STATUSES = (403, 429, 503)    # listing sites answer scraping that is too fast with 403, too
+RETRY_AFTER_STATUSES = (429, 503)      # the only statuses whose Retry-After means "slow down"
+RETRY_BACKOFF_SECONDS = 1.0   # minimum pause before retry n is this * 2**(n-1): 1s, 2s, 4s ...
+
+_limiters = {}     # host -> AdaptiveTokenBucket
+_limiters_lock = threading.Lock()
+
+
+# ===== TOKEN BUCKET ===== #
+class TokenBucket:
+    """Politeness budget: allows `rate` requests per second with bursts up to `capacity`.
+
+    Safe to share between threads; `acquire_async` lets asyncio code wait without blocking the loop.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _reserve(self):
+        """Takes one token and returns how long the caller must wait before using it."""
+        with self.lock:
+            self._refill()
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            metrics.observe("politeness_wait_seconds", wait, kind="token_bucket")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            metrics.observe("politeness_wait_seconds", wait, kind="token_bucket")
+            await asyncio.sleep(wait)
+        return wait
+
+
+# ===== ADAPTIVE TOKEN BUCKET ===== #
+def retry_backoff(attempt):
+    """Sleeps before retry `attempt` (1, 2, ...): RETRY_BACKOFF_SECONDS, doubling each time."""
+    time.sleep(RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+
+def retry_after_seconds(value):
+    """Retry-After header (delta-seconds or HTTP date) -> seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """TokenBucket whose rate follows the host's health (additive increase, multiplicative decrease).
+
+    Every response is fed back through `record()`: fast 2xx/304 responses raise the rate by
+    `increase` up to `max_rate`; 403/429/503 cut it by `decrease`, and a Retry-After on a 429/503
+    pushes every waiting request past that point; other 5xx, network errors and latency rising to
+    `latency_factor` times its baseline cut it by `slow_decrease`. Any other status (404, ...)
+    leaves the rate alone. The current rate is published as the
+    `rate_limit_per_second{host}` gauge.
+    """
+
+    def __init__(self, host, settings):
+        super().__init__(settings["initial_rate"], settings["burst"])
+        self.host = host
+        self.settings = settings
+        self.baseline = None        # slow latency EWMA (what "normal" looks like for this host)
+        self.recent = None          # fast latency EWMA
+        self.last_decrease = float("-inf")
+        metrics.gauge("rate_limit_per_second", round(self.rate, 4), host=host)
+
+    def _set_rate(self, rate):
+        """Must hold self.lock. Tokens accrued so far are settled at the old rate first."""
+        self._refill()
+        self.rate = min(self.settings["max_rate"], max(self.settings["min_rate"], rate))
+        metrics.gauge("rate_limit_per_second", round(self.rate, 4), host=self.host)
+
+    def _slow_down(self, factor, reason):
+        now = time.monotonic()
+        if now - self.last_decrease < self.settings["cooldown"]:
+            return
+        self.last_decrease = now
+        self._set_rate(self.rate * factor)
+        metrics.incr("rate_limit_backoffs_total", host=self.host, reason=reason)
+
+    def record(self, status=None, seconds=None, retry_after=None):
+        """Feeds one outcome back: an HTTP status (None for a network error), its latency and
+        the Retry-After header value, if any.
+        """
+        settings = self.settings
+        with self.lock:
+            if status in THROTTLE_STATUSES:
+                self._slow_down(settings["decrease"], "throttled")
+                pause = retry_after_seconds(retry_after) if status in RETRY_AFTER_STATUSES else None
+                if pause:
+                    # Put the bucket in debt: the next token only exists once the server's deadline passed
+                    pause = min(pause, settings["max_retry_after"])
+                    self._refill()
+                    self.tokens = min(self.tokens, 1 - pause * self.rate)
+                    print(f"🐢 {self.host} asked us to wait {pause:.0f}s (Retry-After)")
+                return
+            if status is None or status >= 500:
+                self._slow_down(settings["slow_decrease"], "error")
+                return
+            if not (200 <= status < 300 or status == 304):
+                return   # a 404 or redirect says nothing about how hard we are pushing the host
+            if seconds is None:
+                return
+
+            if self.baseline is None:
+                self.baseline = self.recent = seconds
+            self.recent = 0.7 * self.recent + 0.3 * seconds
+            congested = self.recent > settings["latency_factor"] * max(self.baseline, settings["min_latency"])
+            # The baseline follows slowly, so a host that is permanently slower is re-learned
+            self.baseline = 0.95 * self.baseline + 0.05 * seconds
+            if congested:
+                self._slow_down(settings["slow_decrease"], "latency")
+            elif self.rate < settings["max_rate"]:
+                self._set_rate(self.rate + settings["increase"])
+
+
+# ===== PER-HOST LIMITERS ===== #
+def limiter_for(url, **overrides):
+    """The process-wide adaptive limiter for the host of `url`, created on first use.
+
+    `overrides` (initial_rate, burst, max_rate, ...) only apply when the limiter is created;
+    otherwise RATE_LIMIT_SETTINGS merged with the host's HOST_RATE_LIMITS entry is used.
+    """
+    host = urlsplit(url).netloc
+    limiter = _limiters.get(host)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(host)
+            if limiter is None:
+                settings = {**RATE_LIMIT_SETTINGS, **HOST_RATE_LIMITS.get(host, {}),
+                            **{k: v for k, v in overrides.items() if v is not None}}
+                limiter = _limiters[host] = AdaptiveTokenBucket(host, settings)
+    return limiter
+
+
+def record_response(url, status=None, seconds=None, retry_after=None):
+    """Called by core.http_client for every request; only hosts with a limiter are tracked."""
+    limiter = _limiters.get(urlsplit(url).netloc)
+    if limiter is not None:
+        limiter.record(status, seconds, retry_after)
+
+
+def rate_limits():
+    """{host: current requests/second} for every host with a limiter."""
+    return {host: round(limiter.rate, 3) for host, limiter in _limiters.items()}
+
+
+def reset_limiters():
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,137 @@
+import math
+import re
+import sys
+from array import array
+
+import numpy as np
+import pandas as pd
+
+
+_PRICE = re.compile(r"(\d[\d,]*(?:\.\d+)?)")
+_RATING = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+# ===== FIELD PARSERS ===== #
+def parse_price_kobo(text):
+    """'₦ 93,060' -> 9306000; '₦ 10,000 - ₦ 12,000' -> 1000000 (lower bound); unparseable -> None."""
+    match = _PRICE.search(text or "")
+    if not match:
+        return None
+    return int(round(float(match.group(1).replace(",", "")) * 100))
+
+
+def parse_rating(text):
+    """'4.1 out of 5' -> 4.1; 'No ratings' -> nan."""
+    match = _RATING.search(text or "")
+    return float(match.group(1)) if match else math.nan
+
+
+# ===== COLUMNAR PRODUCT BATCH ===== #
+class ProductBatch:
+    """Array-backed batch of scraped products.
+
+    Prices are int64 kobo and ratings float64 in `array` buffers, categories are interned and
+    stored as small integer codes. `to_dataframe` wraps the numeric buffers without copying them.
+    The raw "Price"/"Ratings" strings are kept too: they are the scraper dataset's historical
+    columns and what its dedup hashes are computed from.
+    """
+
+    __slots__ = ("names", "links", "raw_prices", "raw_ratings", "price_kobo", "price_missing", "ratings",
+                 "category_codes", "categories", "_category_index", "timestamps")
+
+    def __init__(self):
+        self.names = []
+        self.links = []
+        self.raw_prices = []
+        self.raw_ratings = []
+        self.price_kobo = array("q")
+        self.price_missing = array("b")
+        self.ratings = array("d")
+        self.category_codes = array("i")
+        self.categories = []
+        self._category_index = {}
+        self.timestamps = []
+
+    def __len__(self):
+        return len(self.price_kobo)
+
+    def _category_code(self, category):
+        code = self._category_index.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(sys.intern(category))
+            self._category_index[category] = code
+        return code
+
+    def append(self, name, price, ratings, link, category, timestamp):
+        """Adds one raw scraper record (strings as produced by fetch_product_from_page)."""
+        kobo = parse_price_kobo(price)
+        self.names.append(name)
+        self.links.append(link)
+        self.raw_prices.append(price)
+        self.raw_ratings.append(ratings)
+        self.price_kobo.append(kobo if kobo is not None else 0)
+        self.price_missing.append(kobo is None)
+        self.ratings.append(parse_rating(ratings))
+        self.category_codes.append(self._category_code(category))
+        self.timestamps.append(sys.intern(timestamp))
+
+    def extend_records(self, records, category, timestamp):
+        for record in records:
+            self.append(record["Name"], record["Price"], record["Ratings"],
+                        record["Description Link"], category, timestamp)
+        return self
+
+    @classmethod
+    def from_records(cls, records, category, timestamp):
+        return cls().extend_records(records, category, timestamp)
+
+    def extend(self, other):
+        """Appends another batch, remapping its category codes."""
+        remap = [self._category_code(c) for c in other.categories]
+        self.names.extend(other.names)
+        self.links.extend(other.links)
+        self.raw_prices.extend(other.raw_prices)
+        self.raw_ratings.extend(other.raw_ratings)
+        self.price_kobo.extend(other.price_kobo)
+        self.price_missing.extend(other.price_missing)
+        self.ratings.extend(other.ratings)
+        self.category_codes.extend(remap[code] for code in other.category_codes)
+        self.timestamps.extend(other.timestamps)
+        return self
+
+    def nbytes(self):
+        """Approximate memory held by the batch (buffers + list slots, strings counted once)."""
+        buffers = sum(a.buffer_info()[1] * a.itemsize for a in
+                      (self.price_kobo, self.price_missing, self.ratings, self.category_codes))
+        lists = sum(sys.getsizeof(lst) for lst in
+                    (self.names, self.links, self.raw_prices, self.raw_ratings, self.timestamps))
+        strings = sum(sys.getsizeof(s) for lst in (self.names, self.links, self.raw_prices, self.raw_ratings)
+                      for s in lst)
+        return buffers + lists + strings
+
+    def to_dataframe(self):
+        """Scraper dataset frame: the historical columns (raw Price/Ratings strings) first, then the
+        typed Price_kobo/Rating columns, which are views over the batch buffers (no copy).
+
+        While the frame is alive the buffers are exported, so the batch can't grow any further.
+        """
+        prices = np.frombuffer(self.price_kobo, dtype=np.int64) if len(self) else np.empty(0, np.int64)
+        missing = np.frombuffer(self.price_missing, dtype=np.bool_) if len(self) else np.empty(0, np.bool_)
+        ratings = np.frombuffer(self.ratings, dtype=np.float64) if len(self) else np.empty(0, np.float64)
+        codes = np.frombuffer(self.category_codes, dtype=np.int32) if len(self) else np.empty(0, np.int32)
+
+        return pd.DataFrame(
+            {
+                "Name": self.names,
+                "Price": self.raw_prices,
+                "Ratings": self.raw_ratings,
+                "Description Link": self.links,
+                "Category": pd.Categorical.from_codes(codes, categories=self.categories, validate=False)
+                if self.categories else pd.Categorical([]),
+                "Timestamp": self.timestamps,
+                "Price_kobo": pd.arrays.IntegerArray(prices, missing, copy=False),
+                "Rating": ratings,
+            },
+            copy=False,
+        )
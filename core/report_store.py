@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.fileio import atomic_write_bytes
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serialises threads
+    fcntl = None
+
+
+_BLOCK = 64 * 1024
+
+
+# ===== FILE HELPERS ===== #
+def _reverse_lines(path):
+    """Yields the lines of `path` last to first, reading fixed-size blocks from the end."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b""
+        while position > 0:
+            step = min(_BLOCK, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def _parse(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None   # a torn or hand-edited line costs one record, never the history
+
+
+# ===== JSONL REPORT STORE ===== #
+class ReportStore:
+    """Append-only run log: one JSON object per line, rotated by size.
+
+    Appends, rotation, compaction and the legacy import take an in-process lock plus an exclusive
+    flock on `path.lock` (a sidecar that rotation never moves), and appends go out as a single
+    O_APPEND write, so concurrent jobs and processes never interleave or lose lines. The active file is
+    `path`; rotated segments are `path.1` (newest) ... `path.<keep>` (oldest).
+    Queries stream the files, so they never hold the whole history in memory.
+    """
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, keep=5):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.lock = threading.Lock()
+
+    # --- write path ---
+    @contextmanager
+    def _locked(self):
+        """Thread lock + exclusive flock shared by every process writing this log."""
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path.with_name(f"{self.path.name}.lock"), os.O_WRONLY | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)   # also releases the flock
+
+    def append(self, report):
+        line = (json.dumps(report, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._locked():
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                os.fsync(fd)
+                rotate = os.fstat(fd).st_size >= self.max_bytes
+            finally:
+                os.close(fd)
+            if rotate:
+                self._rotate()
+
+    def _segment(self, n):
+        return self.path.with_name(f"{self.path.name}.{n}")
+
+    def _rotate(self):
+        """Shifts path -> path.1 -> path.2 ...; the oldest segment beyond `keep` is dropped."""
+        oldest = self._segment(self.keep)
+        if oldest.exists():
+            oldest.unlink()
+        for n in range(self.keep - 1, 0, -1):
+            if self._segment(n).exists():
+                os.replace(self._segment(n), self._segment(n + 1))
+        os.replace(self.path, self._segment(1))
+        print(f"🗂️ Rotated run log → {self._segment(1).name}")
+
+    def compact(self, retain_days=None, drop_fields=("attempt_log",)):
+        """Merges rotated segments into `path.1`, dropping unparseable lines, runs older than
+        `retain_days` and bulky `drop_fields`. The active file is left alone.
+        """
+        cutoff = None
+        if retain_days is not None:
+            cutoff = (datetime.utcnow() - timedelta(days=retain_days)).isoformat()
+
+        with self._locked():   # an append in another process may be rotating segments
+            segments = [self._segment(n) for n in range(self.keep, 0, -1) if self._segment(n).exists()]
+            if not segments:
+                return 0
+            kept = bytearray()
+            count = 0
+            for segment in segments:
+                with open(segment, "rb") as f:
+                    for line in f:
+                        report = _parse(line)
+                        if report is None or (cutoff and str(report.get("timestamp", "")) < cutoff):
+                            continue
+                        for field in drop_fields:
+                            report.pop(field, None)
+                        kept += (json.dumps(report, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+                        count += 1
+            atomic_write_bytes(self._segment(1), bytes(kept))
+            for segment in segments:
+                if segment != self._segment(1):
+                    segment.unlink()
+        print(f"🗜️ Compacted {len(segments)} run log segment(s) into {count} records")
+        return count
+
+    # --- read path ---
+    def _files_newest_first(self):
+        files = [self.path] + [self._segment(n) for n in range(1, self.keep + 1)]
+        return [f for f in files if f.exists()]
+
+    def iter_reports(self, newest_first=False):
+        files = self._files_newest_first()
+        if newest_first:
+            for path in files:
+                for line in _reverse_lines(path):
+                    report = _parse(line)
+                    if report is not None:
+                        yield report
+        else:
+            for path in reversed(files):
+                with open(path, "rb") as f:
+                    for line in f:
+                        report = _parse(line)
+                        if report is not None:
+                            yield report
+
+    def recent(self, limit=20, job=None):
+        """Newest `limit` reports (optionally for one job), newest first; reads from the end of the log."""
+        found = []
+        for report in self.iter_reports(newest_first=True):
+            if job is None or report.get("job") == job:
+                found.append(report)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def duration_stats(self, job=None, since=None, window=100):
+        """Per-job run count, success rate and duration min/mean/max in one streaming pass.
+
+        `since` is an ISO timestamp; `window` bounds the recent durations kept per job for p50/p95.
+        """
+        stats = {}
+        for report in self.iter_reports():
+            name = report.get("job")
+            if job is not None and name != job:
+                continue
+            if since is not None and str(report.get("timestamp", "")) < since:
+                continue
+            duration = float(report.get("duration_seconds") or 0.0)
+            entry = stats.setdefault(name, {"runs": 0, "successes": 0, "total_seconds": 0.0,
+                                            "min_seconds": duration, "max_seconds": duration,
+                                            "_recent": deque(maxlen=window)})
+            entry["runs"] += 1
+            entry["successes"] += bool(report.get("success"))
+            entry["total_seconds"] += duration
+            entry["min_seconds"] = min(entry["min_seconds"], duration)
+            entry["max_seconds"] = max(entry["max_seconds"], duration)
+            entry["_recent"].append(duration)
+
+        for entry in stats.values():
+            recent = sorted(entry.pop("_recent"))
+            entry["mean_seconds"] = round(entry["total_seconds"] / entry["runs"], 3)
+            entry["success_rate"] = round(entry["successes"] / entry["runs"], 3)
+            entry["p50_recent_seconds"] = recent[len(recent) // 2]
+            entry["p95_recent_seconds"] = recent[min(len(recent) - 1, int(len(recent) * 0.95))]
+            for field in ("total_seconds", "min_seconds", "max_seconds"):
+                entry[field] = round(entry[field], 3)
+        return stats
+
+    # --- migration ---
+    def import_legacy_json(self, legacy_path):
+        """One-time import of the old orchestrator_report.json list, if the log doesn't exist yet.
+
+        Run explicitly (orchestrator.py -import-legacy), never as a side effect of importing.
+        """
+        legacy_path = Path(legacy_path)
+        if not legacy_path.exists():
+            return 0
+        try:
+            reports = json.loads(legacy_path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            print(f"⚠️ Could not read legacy report {legacy_path.name}: {e}")
+            return 0
+        payload = "".join(json.dumps(r, default=str, separators=(",", ":")) + "\n" for r in reports)
+        with self._locked():
+            if self.path.exists():
+                print(f"⚠️ {self.path.name} already exists; not importing {legacy_path.name}")
+                return 0
+            atomic_write_bytes(self.path, payload.encode("utf-8"))
+        print(f"📥 Imported {len(reports)} reports from {legacy_path.name}")
+        return len(reports)
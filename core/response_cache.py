@@ -0,0 +1,204 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from core import http_client
+
+
+CACHE_SETTINGS = {
+    "enabled": True,
+    "path": Path(__file__).resolve().parents[1] / ".cache" / "http_cache.sqlite",
+    "max_bytes": 64 * 1024 * 1024,     # compressed bodies kept on disk before LRU eviction
+}
+
+# Returned by callers that skip work entirely because the payload did not change
+UNCHANGED = "__unchanged__"
+
+
+# ===== ON-DISK RESPONSE CACHE ===== #
+class ResponseCache:
+    """SQLite-backed HTTP cache: ETag/Last-Modified validators, body hash and an optional parsed payload.
+
+    Entries are evicted least-recently-used once the stored (compressed) bodies exceed `max_bytes`.
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        self.path = Path(path or CACHE_SETTINGS["path"])
+        self.max_bytes = max_bytes or CACHE_SETTINGS["max_bytes"]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   cache_key     TEXT PRIMARY KEY,
+                   url           TEXT NOT NULL,
+                   etag          TEXT,
+                   last_modified TEXT,
+                   body_hash     TEXT NOT NULL,
+                   body          BLOB NOT NULL,
+                   parsed        TEXT,
+                   size          INTEGER NOT NULL,
+                   last_access   REAL NOT NULL
+               )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses (last_access)")
+        self.conn.commit()
+        self.metrics = {"requests": 0, "hits": 0, "not_modified": 0, "unchanged_body": 0,
+                        "misses": 0, "evictions": 0}
+        self.pending = {}   # cache_key -> (url, response, body_hash) held until the caller commits it
+
+    @staticmethod
+    def key_for(method, url, params=None, body=None):
+        raw = json.dumps([method.upper(), url, params or {}, body], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, body_hash, body, parsed FROM responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_hash, body, parsed = row
+        return {"etag": etag, "last_modified": last_modified, "body_hash": body_hash,
+                "body": zlib.decompress(body), "parsed": json.loads(parsed) if parsed else None}
+
+    def touch(self, key, etag=None, last_modified=None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                """UPDATE responses SET last_access = ?,
+                          etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                   WHERE cache_key = ?""",
+                (time.time(), etag, last_modified, key),
+            )
+
+    def store(self, key, url, response, body_hash):
+        body = zlib.compress(response.content)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?)",
+                (key, url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                 body_hash, body, len(body), time.time()),
+            )
+        self._evict()
+
+    def hold(self, key, url, response, body_hash):
+        with self.lock:
+            self.pending[key] = (url, response, body_hash)
+
+    def commit(self, key):
+        """Stores an entry held by a deferred conditional_request, once the data it produced is saved."""
+        with self.lock:
+            held = self.pending.pop(key, None)
+        if held is not None:
+            self.store(key, *held)
+
+    def discard(self, key):
+        """Drops a held entry (its data was not saved), so the next fetch is a miss again."""
+        with self.lock:
+            self.pending.pop(key, None)
+
+    def store_parsed(self, key, parsed):
+        """Keeps the parse result next to the body, so an unchanged page needs no re-parsing."""
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE responses SET parsed = ? WHERE cache_key = ?", (json.dumps(parsed), key))
+
+    def parsed(self, key):
+        entry = self.lookup(key)
+        return entry["parsed"] if entry else None
+
+    def _evict(self):
+        with self.lock, self.conn:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for key, size in self.conn.execute(
+                "SELECT cache_key, size FROM responses ORDER BY last_access ASC"
+            ).fetchall():
+                self.conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+                self.metrics["evictions"] += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def record(self, outcome):
+        with self.lock:
+            self.metrics["requests"] += 1
+            self.metrics[outcome] += 1
+            if outcome in ("not_modified", "unchanged_body"):
+                self.metrics["hits"] += 1
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.metrics)
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        stats.update(entries=entries, bytes=size)
+        stats["hit_rate"] = round(stats["hits"] / stats["requests"], 3) if stats["requests"] else 0.0
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache (None when disabled in CACHE_SETTINGS)."""
+    global _default_cache
+    if not CACHE_SETTINGS["enabled"]:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+# ===== CONDITIONAL REQUEST ===== #
+def conditional_request(cache, method, url, deferred=False, **kwargs):
+    """Sends a conditional request through core.http_client and reconciles it with the cache.
+
+    The returned response always carries the full body, plus:
+      response.cache_key  -> key for store_parsed / parsed
+      response.unchanged  -> True on a 304 or when the body hash matches the cached one
+    With deferred=True a new or changed body is only held: the caller calls cache.commit(key) once
+    the data is saved (cache.discard(key) if not), so a failed save isn't taken as unchanged next run.
+    """
+    body = kwargs.get("json", kwargs.get("data"))
+    key = cache.key_for(method, url, kwargs.get("params"), body)
+    entry = cache.lookup(key)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = http_client.request(method, url, headers=headers, **kwargs)
+    response.cache_key = key
+    response.unchanged = False
+
+    if response.status_code == 304 and entry:
+        response.status_code = 200
+        response._content = entry["body"]
+        response.encoding = response.encoding or "utf-8"
+        response.unchanged = True
+        cache.touch(key)
+        cache.record("not_modified")
+    elif response.status_code == 200:
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if entry and entry["body_hash"] == body_hash:
+            response.unchanged = True
+            cache.touch(key, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            cache.record("unchanged_body")
+        else:
+            (cache.hold if deferred else cache.store)(key, url, response, body_hash)
+            cache.record("misses")
+    return response
@@ -0,0 +1,115 @@
+import random
+import time
+from datetime import datetime
+
+
+# Errors that will fail the same way on every attempt (bad config, missing files, code bugs)
+NON_RETRYABLE = (
+    ValueError,
+    TypeError,
+    KeyError,
+    AttributeError,
+    ImportError,
+    NotImplementedError,
+    FileNotFoundError,
+    PermissionError,
+)
+
+# Transient by nature: network trouble, timeouts, throttling surfaced as HTTP errors.
+# requests' RequestException subclasses OSError, so it is covered without importing requests.
+RETRYABLE = (
+    ConnectionError,
+    TimeoutError,
+    OSError,
+)
+
+
+# ===== RETRY POLICY ===== #
+class RetryPolicy:
+    """Exponential backoff with full jitter, an overall time budget and exception classification.
+
+    Attempt n (1-based) failing waits uniform(0, min(max_delay, base_delay * multiplier**(n-1)))
+    before attempt n+1. No new attempt starts once `max_elapsed` seconds would be exceeded.
+    `retry_on` lists exceptions worth another attempt; `give_up_on` wins over it. With
+    `retry_unknown=True`, exceptions in neither list are retried too.
+    """
+
+    def __init__(self, max_attempts=1, base_delay=2.0, multiplier=2.0, max_delay=60.0, jitter=True,
+                 max_elapsed=None, retry_on=RETRYABLE, give_up_on=NON_RETRYABLE, retry_unknown=True,
+                 sleep=time.sleep):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.max_elapsed = max_elapsed
+        self.retry_on = tuple(retry_on)
+        self.give_up_on = tuple(give_up_on)
+        self.retry_unknown = retry_unknown
+        self.sleep = sleep
+
+    def with_overrides(self, **overrides):
+        settings = {k: getattr(self, k) for k in (
+            "max_attempts", "base_delay", "multiplier", "max_delay", "jitter", "max_elapsed",
+            "retry_on", "give_up_on", "retry_unknown", "sleep")}
+        settings.update(overrides)
+        return RetryPolicy(**settings)
+
+    def is_retryable(self, error):
+        if isinstance(error, self.give_up_on):
+            return False
+        if isinstance(error, self.retry_on):
+            return True
+        return self.retry_unknown
+
+    def backoff(self, attempt):
+        """Delay after failed attempt `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+    def call(self, fn, on_failure=None):
+        """Runs `fn` under the policy and returns {"success", "result", "error", "attempts", "waited_seconds"}.
+
+        `attempts` holds one record per attempt actually made: start time, duration, error,
+        whether the error was retryable and the backoff slept afterwards.
+        `on_failure(record)` is called after every failed attempt (for logging).
+        """
+        started = time.monotonic()
+        outcome = {"success": False, "result": None, "error": None, "attempts": [], "waited_seconds": 0.0}
+
+        for attempt in range(1, self.max_attempts + 1):
+            record = {"attempt": attempt, "started_at": datetime.utcnow().isoformat(), "error": None}
+            attempt_started = time.monotonic()
+            try:
+                outcome["result"] = fn()
+                outcome["success"] = True
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+                record["retryable"] = self.is_retryable(e)
+                outcome["error"] = str(e)
+            record["duration_seconds"] = round(time.monotonic() - attempt_started, 3)
+            outcome["attempts"].append(record)
+
+            if outcome["success"]:
+                break
+
+            delay = self.backoff(attempt)
+            elapsed = time.monotonic() - started
+            if not record["retryable"]:
+                record["gave_up"] = "not retryable"
+            elif attempt == self.max_attempts:
+                record["gave_up"] = "max attempts"
+            elif self.max_elapsed is not None and elapsed + delay > self.max_elapsed:
+                record["gave_up"] = "max elapsed"
+            else:
+                record["delay_seconds"] = round(delay, 3)
+
+            if on_failure is not None:
+                on_failure(record)
+            if "gave_up" in record:
+                break
+
+            self.sleep(delay)
+            outcome["waited_seconds"] = round(outcome["waited_seconds"] + delay, 3)
+
+        return outcome
@@ -0,0 +1,248 @@
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from core.fileio import atomic_write_bytes
+
+
+STATE_PATH = Path(__file__).resolve().parents[1] / ".cache" / "scheduler_state.json"
+MISFIRE_POLICIES = ("run_once", "skip", "run_all")
+MAX_CATCH_UP = 10   # run_all never replays more than this many missed slots
+
+
+# ===== CRON EXPRESSIONS ===== #
+def _field(text, low, high):
+    """One cron field ("*", "*/2", "1-5", "0,30", "10-40/10") -> sorted allowed values."""
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(x) for x in part.split("-"))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if not (low <= start <= end <= high):
+            raise ValueError(f"Cron field '{text}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSpec:
+    """Standard 5-field cron (minute hour day-of-month month day-of-week), evaluated in UTC."""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.expression = expression
+        self.minutes = _field(fields[0], 0, 59)
+        self.hours = _field(fields[1], 0, 23)
+        self.days = _field(fields[2], 1, 31)
+        self.months = _field(fields[3], 1, 12)
+        self.weekdays = {d % 7 for d in _field(fields[4], 0, 7)}   # 0 and 7 are both Sunday
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment):
+        dom = moment.day in self.days
+        dow = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return dom and dow
+        return dom or dow   # cron: both restricted -> either may match
+
+    def next_after(self, moment):
+        """First matching minute strictly after `moment` (aware UTC datetime)."""
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+
+# ===== JOB SCHEDULES ===== #
+class JobSchedule:
+    """When one job is due: {"interval": seconds} or {"cron": "0 0 */2 * *"}, plus
+
+    jitter         -> up to this many seconds added to each due time (spreads load)
+    misfire        -> what to do with slots missed while the daemon was down or the job was busy:
+                      "run_once" (one catch-up run), "skip" (wait for the next slot), "run_all"
+    misfire_grace  -> a slot this late (seconds) still counts as on time
+    """
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.interval = spec.get("interval")
+        self.cron = CronSpec(spec["cron"]) if spec.get("cron") else None
+        if (self.interval is None) == (self.cron is None):
+            raise ValueError(f"Schedule for {name} needs exactly one of 'interval' or 'cron'")
+        self.jitter = spec.get("jitter", 0)
+        self.misfire = spec.get("misfire", "run_once")
+        if self.misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy for {name}: {self.misfire}")
+        self.misfire_grace = spec.get("misfire_grace", 60)
+
+    def next_slot(self, after):
+        if self.cron is not None:
+            return self.cron.next_after(after)
+        return after + timedelta(seconds=self.interval)
+
+    def describe(self):
+        every = f"cron '{self.cron.expression}'" if self.cron else f"every {self.interval}s"
+        return f"{every}, jitter {self.jitter}s, misfire={self.misfire}"
+
+
+# ===== DAEMON ===== #
+class Scheduler:
+    """Long-running scheduler: one process keeps imports, HTTP sessions, caches and indexes warm.
+
+    `run(name)` is called on a worker pool when a job is due. A job is never started while its
+    previous run is still going; the slot is treated as a misfire instead. Last-run times
+    are persisted to `state_path` so misfires are detected across restarts.
+    """
+
+    def __init__(self, schedules, run, max_parallel=3, state_path=STATE_PATH, now=None):
+        self.schedules = {name: JobSchedule(name, spec) for name, spec in schedules.items()}
+        self.run_fn = run
+        self.max_parallel = max_parallel
+        self.state_path = Path(state_path)
+        self.now = now or (lambda: datetime.now(timezone.utc))
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.running = set()
+        self.deferred = set()    # (job, slot) pairs waiting for the previous run to finish
+        self.state = self._load_state()
+        self.next_due = {}
+
+    # --- persisted state ---
+    def _load_state(self):
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        with self.lock:
+            payload = json.dumps(self.state, indent=2).encode("utf-8")
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.state_path, payload)
+
+    def _jittered(self, schedule, slot):
+        return slot + timedelta(seconds=random.uniform(0, schedule.jitter)) if schedule.jitter else slot
+
+    # --- planning ---
+    def _plan(self, name, now):
+        """Sets the next due time for `name`; returns how many overdue slots must run right now."""
+        schedule = self.schedules[name]
+        last_slot = self.state.get(name, {}).get("last_slot")
+        if last_slot is None:
+            # Never ran: interval jobs start now, cron jobs wait for their first slot
+            slot = now if schedule.cron is None else schedule.next_slot(now)
+            self.next_due[name] = (slot, self._jittered(schedule, slot))
+            return 0
+
+        slot = schedule.next_slot(datetime.fromisoformat(last_slot))
+        missed = []
+        while slot <= now:
+            missed.append(slot)
+            slot = schedule.next_slot(slot)
+        self.next_due[name] = (slot, self._jittered(schedule, slot))
+
+        if not missed:
+            return 0
+        if len(missed) == 1 and (now - missed[0]).total_seconds() <= schedule.misfire_grace:
+            return 1   # just due, not a misfire
+
+        runs = {"skip": 0, "run_once": 1, "run_all": min(len(missed), MAX_CATCH_UP)}[schedule.misfire]
+        print(f"⏰ {name}: {len(missed)} missed slot(s) since {last_slot} → {schedule.misfire} "
+              f"({runs} catch-up run(s))")
+        return runs
+
+    # --- execution ---
+    def _execute(self, name, slot, runs=1):
+        try:
+            for _ in range(runs):
+                if self.stop_event.is_set():
+                    break
+                self.run_fn(name)
+        except Exception as e:
+            print(f"❌ Scheduled run of {name} raised: {e}")
+        finally:
+            with self.lock:
+                self.running.discard(name)
+                entry = self.state.setdefault(name, {})
+                entry["last_slot"] = slot.isoformat()
+                entry["last_finished"] = self.now().isoformat()
+                entry["runs"] = entry.get("runs", 0) + runs
+            self._save_state()
+
+    def _launch(self, pool, name, slot, runs=1):
+        with self.lock:
+            if name in self.running:
+                if (name, slot) not in self.deferred:
+                    self.deferred.add((name, slot))
+                    entry = self.state.setdefault(name, {})
+                    entry["overlaps"] = entry.get("overlaps", 0) + 1
+                    print(f"⏭️ {name} still running — slot {slot.isoformat()} handled as a misfire "
+                          f"({self.schedules[name].misfire})")
+                return False
+            self.running.add(name)
+            self.deferred.discard((name, slot))
+        print(f"▶️ [{self.now().isoformat()}] Scheduler starting {name} (slot {slot.isoformat()})")
+        pool.submit(self._execute, name, slot, runs)
+        return True
+
+    def run_forever(self, poll=1.0):
+        print(f"🗓️ Scheduler daemon started for {len(self.schedules)} job(s), max parallel {self.max_parallel}")
+        for name, schedule in self.schedules.items():
+            print(f"   • {name}: {schedule.describe()}")
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="sched") as pool:
+            now = self.now()
+            for name in self.schedules:
+                catch_up = self._plan(name, now)
+                if catch_up:
+                    self._launch(pool, name, now, catch_up)
+
+            while not self.stop_event.is_set():
+                now = self.now()
+                for name, (slot, due) in list(self.next_due.items()):
+                    if due > now:
+                        continue
+                    schedule = self.schedules[name]
+                    if not self._launch(pool, name, slot):
+                        if schedule.misfire != "skip":
+                            # Previous run still going: try again shortly (runs once it finishes)
+                            self.next_due[name] = (slot, now + timedelta(seconds=poll))
+                            continue
+                        self.deferred.discard((name, slot))
+                    following = schedule.next_slot(slot)
+                    while following <= now:   # slots that passed meanwhile collapse into this run
+                        following = schedule.next_slot(following)
+                    self.next_due[name] = (following, self._jittered(schedule, following))
+
+                soonest = min(due for _, due in self.next_due.values())
+                wait = (soonest - self.now()).total_seconds()
+                self.stop_event.wait(min(max(wait, poll), 60))
+
+            print("🛑 Scheduler stopping; waiting for running jobs to finish...")
+
+    def stop(self):
+        self.stop_event.set()
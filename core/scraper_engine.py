@@ -1,15 +1,40 @@
 import requests
-from bs4 import BeautifulSoup
-import random
-import time
 import traceback
 
+from core import http_client, metrics
+from core.politeness import limiter_for, retry_backoff
+from core.response_cache import conditional_request, get_cache
+
+try:
+    from core.fast_extract import extract_detail, extract_products
+except ImportError:  # lxml.cssselect needs the cssselect package; fall back to BeautifulSoup
+    extract_detail = extract_products = None
+
+class PageFetchError(RuntimeError):
+    """A listing page could not be fetched or parsed: the category is incomplete and must not be marked done."""
+
+
 # ===== SAFE REQUEST WRAPPER ===== #
-def safe_request(url, headers, retries=3, timeout=15):
-    """Handles transient network issues, SSL, and slow responses gracefully."""
+def safe_request(url, headers, retries=3, timeout=None, cache=None):
+    """Handles transient network issues, SSL, and slow responses gracefully.
+
+    Requests go through the pooled per-host session in core.http_client (timeout defaults to its policy).
+    Each retry first backs off exponentially (core.politeness.retry_backoff), then waits for a token
+    from the host's adaptive rate limiter, which may hold it longer (e.g. a Retry-After). With a `cache` (core.response_cache.ResponseCache) the request is conditional and the response
+    is flagged `unchanged` when the page did not change since the last fetch.
+    """
+    def send(verify):
+        if cache is not None:
+            return conditional_request(cache, "GET", url, headers=headers, timeout=timeout, verify=verify)
+        return http_client.get(url, headers=headers, timeout=timeout, verify=verify)
+
+    limiter = limiter_for(url)
     for attempt in range(retries):
+        if attempt:
+            retry_backoff(attempt)
+            limiter.acquire()
         try:
-            response = requests.get(url, headers=headers, timeout=timeout, verify=True)
+            response = send(verify=True)
             if response.status_code == 200:
                 return response
             else:
@@ -17,14 +42,13 @@ def safe_request(url, headers, retries=3, timeout=15):
         except requests.exceptions.SSLError:
             print("⚠️ SSL error encountered — retrying with verify=False")
             try:
-                response = requests.get(url, headers=headers, timeout=timeout, verify=False)
+                response = send(verify=False)
                 if response.status_code == 200:
                     return response
             except Exception as e:
                 print(f"⚠️ Retry {attempt+1}/{retries} failed (SSL): {e}")
         except Exception as e:
             print(f"⚠️ Retry {attempt+1}/{retries} failed: {e}")
-        time.sleep(random.uniform(2, 5))
     print(f"❌ Max retries exceeded for {url}")
     return None
 
@@ -68,47 +92,105 @@ def fetch_product_from_page(soup, selector):
     return results
 
 
-# ===== MAIN PAGINATION FUNCTION ===== #
-def fetch_all_products(base_url, headers, selector, max_pages=20):
-    """Fetches all products across pages with resilience for Render."""
-    page = 1
-    final_results = []
+# ===== LISTING PAGE PARSER ===== #
+def parse_listing(response, selector, cache=None, fast=True):
+    """Returns (products, has_next) for one listing page.
+
+    When the cache reports the page as unchanged, the stored parse is reused and no HTML is parsed.
+    `fast` uses the compiled-selector lxml path (core.fast_extract), which gives identical output.
+    """
+    cache_key = getattr(response, "cache_key", None)
+    if cache is not None and cache_key and getattr(response, "unchanged", False):
+        cached = cache.parsed(cache_key)
+        if cached is not None:
+            print("♻️ Page unchanged since last fetch — reusing cached parse.")
+            metrics.incr("parse_cache_reused_total")
+            return cached["products"], cached["has_next"]
+
+    if fast and extract_products is not None:
+        with metrics.timer("parse_seconds", engine="lxml"):
+            products, has_next = extract_products(response.text, selector)
+    else:
+        from bs4 import BeautifulSoup   # fallback only; imported on first use
+        with metrics.timer("parse_seconds", engine="bs4"):
+            soup = BeautifulSoup(response.text, "lxml")
+            products = fetch_product_from_page(soup, selector)
+            has_next = soup.select_one(selector.get("page_next")) is not None
+    metrics.incr("pages_parsed_total")
+    metrics.incr("products_parsed_total", len(products))
+
+    if cache is not None and cache_key:
+        cache.store_parsed(cache_key, {"products": products, "has_next": has_next})
+    return products, has_next
+
+
+# ===== DETAIL PAGE PARSER ===== #
+def parse_detail(response, detail_selector):
+    """Product detail page -> {field: text or None} for every field in `detail_selector`."""
+    if extract_detail is not None:
+        with metrics.timer("parse_seconds", engine="lxml", page="detail"):
+            return extract_detail(response.text, detail_selector)
+
+    from bs4 import BeautifulSoup   # fallback only; imported on first use
+    with metrics.timer("parse_seconds", engine="bs4", page="detail"):
+        soup = BeautifulSoup(response.text, "lxml")
+        found = {field: soup.select_one(css) for field, css in detail_selector.items()}
+        return {field: tag.text.strip() if tag else None for field, tag in found.items()}
+
+
+# ===== STREAMING PAGINATION ===== #
+def iter_product_pages(base_url, headers, selector, max_pages=20, bucket=None, start_page=1):
+    """Yields (page, products) one listing page at a time, so callers can flush as they go.
+
+    `start_page` resumes a category part way through (see core.checkpoints).
+    Requests are paced by `bucket` (a core.politeness.TokenBucket), by default the host's
+    adaptive limiter, which speeds up while the site is healthy and backs off when it is not.
+    An empty page or a missing "next" link ends the category; a page that cannot be fetched or
+    parsed raises PageFetchError after the pages before it were yielded.
+    """
+    cache = get_cache()
+    bucket = bucket or limiter_for(base_url)
+    page = start_page
 
     while page <= max_pages:
         print(f"\n🔄 Scraping page {page}...")
 
         url = f"{base_url}?page={page}"
-        response = safe_request(url, headers)
+        bucket.acquire()
+        response = safe_request(url, headers, cache=cache)
         if not response:
             print("❌ Request failed — moving to next category.")
-            break
+            raise PageFetchError(f"request for page {page} failed")
 
         try:
-            soup = BeautifulSoup(response.text, "lxml")
-            product_batch = fetch_product_from_page(soup, selector)
+            product_batch, has_next = parse_listing(response, selector, cache)
+        except Exception as e:
+            print(f"❌ Error parsing page {page}: {e}")
+            raise PageFetchError(f"page {page} could not be parsed: {e}") from e
 
-            if not product_batch:
-                print(f"⚠️ No more products found (page {page}). Stopping pagination.")
-                break
+        if not product_batch:
+            print(f"⚠️ No more products found (page {page}). Stopping pagination.")
+            break
 
-            final_results.extend(product_batch)
-            print(f"✅ Page {page} done — {len(product_batch)} items found.")
+        print(f"✅ Page {page} done — {len(product_batch)} items found.")
+        yield page, product_batch
 
-            next_page = soup.select_one(selector.get("page_next"))
-            if not next_page:
-                print("📘 End of pagination reached.")
-                break
+        if not has_next:
+            print("📘 End of pagination reached.")
+            break
 
-            # Human-like delay
-            sleep_time = random.uniform(4, 8)
-            print(f"⏳ Sleeping {sleep_time:.1f}s before next page...")
-            time.sleep(sleep_time)
+        page += 1
 
-            page += 1
 
-        except Exception as e:
-            print(f"❌ Error parsing page {page}: {e}")
-            break
+# ===== MAIN PAGINATION FUNCTION ===== #
+def fetch_all_products(base_url, headers, selector, max_pages=20, bucket=None):
+    """Fetches all products across pages with resilience for Render (collects iter_product_pages).
+
+    Raises PageFetchError when a page fails part way through.
+    """
+    final_results = []
+    for _, product_batch in iter_product_pages(base_url, headers, selector, max_pages, bucket):
+        final_results.extend(product_batch)
 
     print(f"\n📦 Total products scraped: {len(final_results)}\n")
     return final_results
@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+_DONE = object()   # engine thread -> consumer: the crawl finished
+
+
+class StreamCancelled(Exception):
+    """Raised inside the engine thread when the consumer stops iterating early."""
+
+
+# ===== CALLBACK ENGINE -> GENERATOR ===== #
+def stream_pages(engine, *args, stream_depth=2, **kwargs):
+    """Yields (page, products) from an engine that reports pages through `on_page`.
+
+    The async and pipelined engines deliver finished pages in order to a callback. Here the engine
+    runs in a worker thread and hands each page over a bounded queue, so at most `stream_depth`
+    pages wait for the consumer and the engine stalls (instead of buffering) when the consumer is
+    slow. Every other keyword (e.g. the pipeline's own `queue_depth`) is passed to the engine.
+    Engine errors are re-raised in the consumer; closing the generator stops the engine.
+    """
+    pages = queue.Queue(maxsize=stream_depth)
+    cancelled = threading.Event()
+    failure = []
+
+    def on_page(page, products):
+        while True:
+            if cancelled.is_set():
+                raise StreamCancelled()
+            try:
+                pages.put((page, products), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def run():
+        try:
+            engine(*args, on_page=on_page, keep_results=False, **kwargs)
+        except StreamCancelled:
+            pass
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            while True:
+                try:
+                    pages.put(_DONE, timeout=0.5)
+                    break
+                except queue.Full:
+                    if cancelled.is_set():
+                        break
+
+    worker = threading.Thread(target=run, name="page-stream", daemon=True)
+    worker.start()
+
+    try:
+        while True:
+            item = pages.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        cancelled.set()
+        # Unblock a worker waiting on a full queue, then let it wind down
+        while worker.is_alive():
+            try:
+                pages.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        worker.join()
+
+    if failure:
+        raise failure[0]
@@ -0,0 +1,193 @@
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from core import metrics
+
+
+# Local state, never committed: rebuilt from data/api_auth.csv when missing (see bootstrap_from_csv)
+STORE_PATH = Path(__file__).resolve().parents[1] / "data" / "state" / "weather_timeseries.sqlite"
+
+# CSV column -> SQL column for the weather/AQI readings (level4 api_auth)
+WEATHER_COLUMNS = {
+    "City": "city",
+    "Timestamp_UTC": "ts",
+    "Country": "country",
+    "Latitude": "latitude",
+    "Longitude": "longitude",
+    "Temperature_C": "temperature_c",
+    "Wind_KPH": "wind_kph",
+    "Condition": "condition",
+    "AQI_US": "aqi_us",
+    "CO": "co",
+    "NO2": "no2",
+    "O3": "o3",
+    "PM2.5": "pm2_5",
+}
+_SQL_COLUMNS = list(WEATHER_COLUMNS.values())
+_VALUE_COLUMNS = _SQL_COLUMNS[2:]
+
+
+# ===== STORE ===== #
+def connect(store_path=STORE_PATH):
+    """Readings keyed by (city, ts), a ts index for cross-city ranges and a latest-reading pointer per city."""
+    store_path = Path(store_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(store_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS readings (
+                city TEXT NOT NULL,
+                ts   INTEGER NOT NULL,
+                {", ".join(f"{c} {'TEXT' if c in ('country', 'condition') else 'REAL'}" for c in _VALUE_COLUMNS)},
+                PRIMARY KEY (city, ts)
+            ) WITHOUT ROWID"""
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS readings_ts ON readings (ts)")
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS latest (
+               city TEXT PRIMARY KEY,
+               ts   INTEGER NOT NULL
+           ) WITHOUT ROWID"""
+    )
+    return conn
+
+
+def to_epoch_seconds(value):
+    """Accepts epoch seconds, datetimes or date strings (naive values are taken as UTC)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    stamp = pd.Timestamp(value)
+    stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+    return int((stamp - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1))
+
+
+def _rows(df):
+    frame = df.reindex(columns=list(WEATHER_COLUMNS)).rename(columns=WEATHER_COLUMNS)
+    frame = frame.dropna(subset=["city", "ts"])
+    frame["ts"] = frame["ts"].astype("int64")
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame, list(frame.itertuples(index=False, name=None))
+
+
+def _upsert(conn, rows):
+    conn.executemany(
+        f"""INSERT INTO readings ({", ".join(_SQL_COLUMNS)}) VALUES ({", ".join("?" * len(_SQL_COLUMNS))})
+            ON CONFLICT(city, ts) DO UPDATE SET
+            {", ".join(f"{c} = excluded.{c}" for c in _VALUE_COLUMNS)}""",
+        rows,
+    )
+    conn.executemany(
+        """INSERT INTO latest VALUES (?, ?)
+           ON CONFLICT(city) DO UPDATE SET ts = excluded.ts WHERE excluded.ts > latest.ts""",
+        [(row[0], row[1]) for row in rows],
+    )
+
+
+# ===== WRITE PATH ===== #
+@metrics.timed("timeseries_upsert_seconds")
+def upsert_readings(df, store_path=STORE_PATH, on_new=None):
+    """Inserts or updates readings on (City, Timestamp_UTC); returns only the rows that were new.
+
+    Each row costs one primary-key probe plus one upsert, so a run's write cost depends on the
+    number of cities fetched, not on how much history is stored.
+    `on_new(new_rows)` (e.g. the CSV append) runs inside the upsert's transaction: if it raises,
+    the upsert is rolled back, so the store never records readings the CSV is missing.
+    """
+    if df is None or df.empty:
+        return df
+
+    # Within one batch the last reading of a (city, ts) wins
+    df = df.drop_duplicates(subset=["City", "Timestamp_UTC"], keep="last").reset_index(drop=True)
+    frame, rows = _rows(df)
+
+    conn = connect(store_path)
+    try:
+        existing = {
+            key for key in ((row[0], row[1]) for row in rows)
+            if conn.execute("SELECT 1 FROM readings WHERE city = ? AND ts = ?", key).fetchone()
+        }
+        is_new = [(row[0], row[1]) not in existing for row in rows]
+        fresh = df.loc[frame.index[is_new]]
+        with conn:
+            _upsert(conn, rows)
+            if on_new is not None and not fresh.empty:
+                on_new(fresh)
+    finally:
+        conn.close()
+
+    metrics.incr("timeseries_readings_total", sum(is_new), result="inserted")
+    metrics.incr("timeseries_readings_total", len(existing), result="upserted")
+    print(f"📈 Time-series upsert: {sum(is_new)} new readings, {len(existing)} existing upserted")
+    return fresh
+
+
+# ===== READ PATH ===== #
+def _frame(cursor):
+    columns = [d[0] for d in cursor.description]
+    df = pd.DataFrame(cursor.fetchall(), columns=columns)
+    return df.rename(columns={v: k for k, v in WEATHER_COLUMNS.items()})
+
+
+def latest_readings(cities=None, store_path=STORE_PATH):
+    """Latest reading per city, straight from the `latest` pointer table (no history scan)."""
+    conn = connect(store_path)
+    try:
+        query = f"""SELECT {", ".join(f"r.{c}" for c in _SQL_COLUMNS)}
+                    FROM latest l JOIN readings r ON r.city = l.city AND r.ts = l.ts"""
+        params = []
+        if cities:
+            query += f" WHERE l.city IN ({', '.join('?' * len(cities))})"
+            params = list(cities)
+        return _frame(conn.execute(query + " ORDER BY l.city", params))
+    finally:
+        conn.close()
+
+
+def readings_between(start=None, end=None, city=None, store_path=STORE_PATH):
+    """Readings with start <= Timestamp_UTC < end, served from the (city, ts) key or the ts index."""
+    clauses, params = [], []
+    if city is not None:
+        clauses.append("city = ?")
+        params.append(city)
+    if start is not None:
+        clauses.append("ts >= ?")
+        params.append(to_epoch_seconds(start))
+    if end is not None:
+        clauses.append("ts < ?")
+        params.append(to_epoch_seconds(end))
+
+    conn = connect(store_path)
+    try:
+        query = f"SELECT {', '.join(_SQL_COLUMNS)} FROM readings"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        return _frame(conn.execute(query + " ORDER BY ts, city", params))
+    finally:
+        conn.close()
+
+
+# ===== BOOTSTRAP ===== #
+def bootstrap_from_csv(path, store_path=STORE_PATH, chunksize=100_000):
+    """Loads an existing api_auth CSV into an empty store (e.g. on a fresh checkout), so history is queryable from day one."""
+    path = Path(path)
+    conn = connect(store_path)
+    try:
+        seeded = conn.execute("SELECT 1 FROM readings LIMIT 1").fetchone()
+        if seeded or not path.exists() or path.stat().st_size == 0:
+            return 0
+
+        total = 0
+        with conn:
+            for chunk in pd.read_csv(path, chunksize=chunksize, on_bad_lines="skip"):
+                _, rows = _rows(chunk)
+                _upsert(conn, rows)
+                total += len(rows)
+        print(f"📈 Seeded time-series store from {total} existing rows")
+        return total
+    finally:
+        conn.close()
@@ -1,12 +1,9 @@
 import os 
-import time
 import json 
-import pandas as pd
 import sys
-import random
-import subprocess 
 from datetime import datetime
 from pathlib import Path 
+import pandas as pd
  
 # === SETUP PATHS === #
 ROOT = Path(__file__).resolve().parents[1]
@@ -14,56 +11,47 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
 # === IMPORTS === #
-from core.scraper_engine import fetch_all_products  
-from scripts.config import headers, selector 
+from core import http_client
+from core.crawl_scheduler import crawl_categories
+from core.dataset_sink import StreamingSink
+from core.checkpoints import CheckpointStore
+from core.dedup_index import keep_changed
+from core.crawl_frontier import CrawlFrontier, crawl_details
+from core.git_sync import publish
+from core.response_cache import get_cache
+from core.records import ProductBatch
+from scripts.config import headers, selector, detail_selector, scraper_engine
 
 # === CONFIGURATIONS === #
 DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "scraper_dataset.csv"
+DETAIL_PATH = Path(__file__).resolve().parents[1] / "data" / "product_details.csv"
 CATEGORY_FILE = Path("scripts/categories.json")
+LAST_CYCLE_RESULTS = []   # per-category result/failure records of the latest cycle
+PUBLISH_SKIPPED = "publish skipped: GT_TOKEN not set"   # job result recorded in the run report
 
 # === GIT COMMIT FUNCTION === #
 
-"""This function stages, commits, and pushes the updated dataset to GitHub."""     
+"""This function commits the updated datasets and pushes them to GitHub (the SQLite state under data/state is rebuilt from them, never committed)."""     
 
 def commit_data_to_git():
+    ## Returns True once published, False on error and PUBLISH_SKIPPED without a token: the data is
+    ## saved locally (so the job doesn't fail) but the report shows that nothing reached GitHub.
     try:
         GT_TOKEN = os.environ.get("GT_TOKEN")
         if not GT_TOKEN:
-            print("❌ GT_TOKEN not set; skipping git push.")
-            return
+            print("⚠️ GT_TOKEN not set; skipping git push.")
+            return PUBLISH_SKIPPED
 
         # Build a pushable repo URL containing token (temporary, only used for push)
         repo_remote = f"https://{GT_TOKEN}@github.com/CKohwo/data-ingestion-lab.git"
 
-        # Change directory to the repo root. This is essential.
-        # Make sure ROOT is correctly defined earlier in your script.
-        os.chdir(str(ROOT))
-        
-        print("Configure git identity")
-        subprocess.run(["git", "config", "--global", "user.name", "DataIngestor-bot"], check=True)
-        subprocess.run(["git", "config", "--global", "user.email", "bot@adip.io"], check=True)
-
-        # Stage file
-        print("🔧 Preparing repository for data commit...")
-        subprocess.run(["git", "stash"], check=True)
-        subprocess.run(["git", "pull", repo_remote, "main", "--rebase"], check=True)
-        subprocess.run(["git", "stash", "pop"], check=True)
-        subprocess.run(["git", "add", str(DATA_PATH)], check=True)
-
-        # Check if there is anything to commit
-        status = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True)
-        if str(DATA_PATH.name) not in status.stdout:
-            print("✅ No changes to commit.")
-            return
-
-        commit_msg = f"DATA: Auto-update scraper dataset {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}"
-        subprocess.run(["git", "commit", "-m", commit_msg], check=True)
-
-        # Pull with rebase to avoid simple conflicts, then push
-        # Use repo_remote as the temporary remote to authenticate push
-        subprocess.run(["git", "push", repo_remote, "HEAD:main"], check=True)
-
-        print("✅ Successfully pushed scraper_dataset.csv to GitHub.")
+        # Only these paths are committed, straight on top of the remote branch (see core.git_sync):
+        # no stash/pull/chdir, so jobs still writing other files in this process are unaffected.
+        print("🔧 Preparing data commit...")
+        commit_msg = f"DATA: Auto-update scraper datasets {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+        publish((DATA_PATH, DETAIL_PATH), commit_msg, repo_remote)
+
+        print("✅ Scraper datasets are up to date on GitHub.")
         return True
     
     except Exception as e:
@@ -71,63 +59,148 @@ def commit_data_to_git():
         return False
 
 
+def open_frontier():
+    ## The frontier is local state: a fresh disk rebuilds it from the detail pages already saved.
+    frontier = CrawlFrontier()
+    frontier.bootstrap_from_csv(DETAIL_PATH)
+    return frontier
+
+
+# === ENGINE SELECTION === #
+def get_fetcher(mode=None):
+    """Returns a page stream factory for the configured engine ("sync", "async" or "pipeline").
+
+    Every engine yields (page, products) in page order, one listing page at a time.
+    """
+    mode = mode or scraper_engine.get("mode", "sync")
+    # Only the selected engine is imported (asyncio / process pool stay unloaded otherwise)
+    if mode in ("async", "pipeline"):
+        from core.streaming import stream_pages
+    if mode == "async":
+        from core.async_engine import fetch_all_products_concurrent
+        options = {k: scraper_engine[k] for k in ("max_concurrency", "rate_per_sec", "burst") if k in scraper_engine}
+        return lambda url, headers, selector, bucket=None, start_page=1: stream_pages(
+            fetch_all_products_concurrent, url, headers, selector, bucket=bucket, start_page=start_page, **options
+        )
+    if mode == "pipeline":
+        from core.parse_pipeline import fetch_all_products_pipelined, get_parse_pool
+        options = {k: scraper_engine[k] for k in ("parse_workers", "queue_depth") if k in scraper_engine}
+        get_parse_pool(options.get("parse_workers", 2))   # started here, before any crawl thread exists
+        return lambda url, headers, selector, bucket=None, start_page=1: stream_pages(
+            fetch_all_products_pipelined, url, headers, selector, bucket=bucket, start_page=start_page, **options
+        )
+    if mode == "sync":
+        from core.scraper_engine import iter_product_pages
+        return iter_product_pages
+    raise ValueError(f"Unknown scraper engine: {mode}")
+
+
 # === INGESTION CYCLE FUNCTION === #
-def run_ingestion_cycle(): 
+def run_ingestion_cycle(engine=None): 
     ## This function runs a full ingestion cycle across all categories in categories.json
-    ## Appends timestamp + category columns and merges with scraper dataset if present or creates a new one.
+    ## Pages are streamed into the dataset as they are scraped, so memory stays bounded by the
+    ## sink buffer and everything flushed before a failure is kept.
+    ## engine: "sync", "async" or "pipeline" — defaults to scripts.config.scraper_engine["mode"]
 
     print("\n🚀 Starting ingestion cycle...\n")
+    fetcher = get_fetcher(engine)
 
     # Load all categories
     with open(CATEGORY_FILE, "r") as file:
         categories = json.load(file)
 
-    all_data = []
+    # Resume the previous run if it died part way through (see core.checkpoints)
+    checkpoints = CheckpointStore()
+    run_id = checkpoints.begin()
+    pending = {c: url for c, url in categories.items() if not checkpoints.is_done(c)}
+    start_pages = {c: checkpoints.start_page(c) for c in pending}
+    if len(pending) < len(categories):
+        print(f"⏭️ Skipping {len(categories) - len(pending)} categories already saved by run {run_id}")
+
+    def on_flush(tags):
+        # Checkpoint only pages that are on disk, so a resume never skips unsaved data
+        last_pages = {}
+        for category, page in tags:
+            last_pages[category] = max(page, last_pages.get(category, 0))
+        checkpoints.mark_pages(last_pages)
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Unchanged products are dropped per flush; only new/changed rows are appended
+    sink = StreamingSink(DATA_PATH, prepare=keep_changed, flush_rows=scraper_engine.get("flush_rows", 500),
+                         on_flush=on_flush)
+    # Every product link goes into the crawl frontier; run_detail_crawler fetches the detail pages
+    frontier = open_frontier()
+
+    def on_page(result, page, products):
+        # Pack the page into a compact typed batch (category + timestamp metadata included)
+        batch = ProductBatch.from_records(products, result["category"], timestamp)
+        sink.write(batch.to_dataframe(), tag=(result["category"], page))
+        frontier.add((p["Description Link"] for p in products), source=result["category"])
+
+    def on_result(result, _):
+        result["run_id"] = run_id
+        if result["success"]:
+            sink.flush()
+            checkpoints.mark_done(result["category"])
+            print(f"✅ Completed category: {result['category']} | {result['records']} items scraped\n")
 
-    # Loop through all categories
-    for category, url in categories.items():
-        try:
-            print(f"[{datetime.utcnow()} UTC] 🔍 Scraping category: {category}") 
+    try:
+        # Crawl categories concurrently; the per-domain adaptive limiter replaces the fixed sleeps
+        results = crawl_categories(
+            pending, fetcher, headers, selector,
+            max_workers=scraper_engine.get("category_workers", 4),
+            rate_per_sec=scraper_engine.get("rate_per_sec", 0.5),
+            burst=scraper_engine.get("burst", 2),
+            max_rate_per_sec=scraper_engine.get("max_rate_per_sec"),
+            on_result=on_result,
+            on_page=on_page,
+            start_pages=start_pages,
+        )
+        LAST_CYCLE_RESULTS[:] = results
+        sink.flush()
 
-            # Call our reusable core engine
-            category_data = fetch_all_products(url, headers, selector)
+    except Exception as e:
+        print(f"❌ Error during ingestion cycle: {e}")
+        print(f"💾 Partial progress kept: {sink.stats()} | checkpoint: run {run_id}")
+        return False
 
-        except Exception as e:
-            print(f"❌ Error scraping category {category}: {e}")
-            continue
+    finally:
+        print(f"🧭 Crawl frontier: {frontier.stats()}")
+        frontier.close()
+        print(f"🔌 Connection reuse: {http_client.connection_stats()}")
+        if get_cache() is not None:
+            print(f"🗃️ Response cache: {get_cache().stats()}")
 
-        # Add category + timestamp metadata
-        for record in category_data:
-            record["Category"] = category
-            record["Timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    failed = [r["category"] for r in results if not r["success"]]
+    if failed:
+        print(f"⏯️ Checkpoint kept for run {run_id}; the next run resumes {failed}")
+    else:
+        checkpoints.clear()
 
-        all_data.extend(category_data)
-        print(f"✅ Completed category: {category} | {len(category_data)} items scraped\n")
+    stats = sink.stats()
+    print(f"📦 New ingestion batch: {stats['rows_in']} records")
+    print(f"💾 Updated scraper dataset saved → {DATA_PATH} ({stats['rows_written']} rows in {stats['batches']} flushes)\n")
+    print("🕒 Ingestion cycle completed successfully.")
+    return True
 
-        time.sleep(random.uniform(6, 11))  # Random delay between categories to mimic human behavior
 
-    # Convert to DataFrame
-    new_data = pd.DataFrame(all_data)
-    print(f"📦 New ingestion batch: {len(new_data)} records")
+# === DETAIL PAGE CYCLE === #
+def run_detail_cycle(limit=None, workers=None):
+    ## Fetches the most urgent product detail pages from the crawl frontier (see core.crawl_frontier):
+    ## never-fetched links first, then revisits of pages whose price is likely to have changed.
+    ## Only new or changed pages are appended to product_details.csv.
+    limit = limit or scraper_engine.get("detail_batch", 200)
+    workers = workers or scraper_engine.get("detail_workers", 2)
 
-    # If master_dataset exists, append
-    try:
-        if os.path.exists(DATA_PATH) and os.path.getsize(DATA_PATH) > 0:
-            existing_df = pd.read_csv(DATA_PATH) # If files has bad and malfunctioned line, i will add on_bad_lines='skip'  
-            combined_df = pd.concat([existing_df, new_data], ignore_index=True)
-        else:
-            print("🆕 No existing dataset found — creating new scraper dataset...")
-            combined_df = new_data
-
-        # Save updated dataset
-        combined_df.to_csv(DATA_PATH, index=False)
-        print(f"💾 Updated scraper dataset saved → {DATA_PATH}\n")
-        print("🕒 Ingestion cycle completed successfully.")
-        return True
+    print("\n🚀 Starting detail page cycle...\n")
+    # flush_rows=1: each page is on disk before the frontier records its new hash (see crawl_details)
+    sink = StreamingSink(DETAIL_PATH, flush_rows=1)
+    with open_frontier() as frontier:
+        counts = crawl_details(frontier, headers, detail_selector, limit=limit, workers=workers,
+                               on_detail=lambda record: sink.write(pd.DataFrame([record])))
 
-    except Exception as e:
-        print(f"❌ Error during ingestion cycle: {e}")
-        return False
+    print(f"💾 Detail pages saved → {DETAIL_PATH} ({sink.stats()['rows_written']} new/changed)\n")
+    return counts["fetched"] == 0 or counts["failed"] < counts["fetched"]
 
 
 
@@ -145,6 +218,16 @@ def run_automated_scraper():
 
 
 
+def run_detail_crawler():
+    """Orchestration entry point for the detail page crawl (runs after Auto_Scraper)."""
+    print("🔁 Running detail page crawler...")
+    if run_detail_cycle():
+        return commit_data_to_git()
+    print("❌ Every detail page failed. Skipping Git commit.")
+    return False
+
+
+
 if __name__ == "__main__":
     run_automated_scraper()
     print(f"[{datetime.utcnow()} UTC] ✅ Automated scraper pipeline completed.\n")
\ No newline at end of file
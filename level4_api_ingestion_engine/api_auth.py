@@ -1,85 +1,144 @@
 import os
+import time
 import pandas as pd
 import json
 import requests
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from urllib3.exceptions import ConnectTimeoutError, ReadTimeoutError
 from pathlib import Path
-from scripts.api_config import CITY_NAME
+from scripts.api_config import CITY_NAME, weather_ingestion
+from core import http_client, metrics
+from core.dataset_sink import save_dataset
+from core.timeseries_store import STORE_PATH, bootstrap_from_csv, upsert_readings
 
  
 
 #This variable stores the list of city names for which weather data is to be fetched
  
 # Base URL for the Weather API & DATA PATH for saving the dataset
-BASE_URL = "http://api.weatherapi.com/v1/current.json" 
+# (WEATHER_API_URL points the job at a local stand-in for testing)
+BASE_URL = os.getenv("WEATHER_API_URL", "http://api.weatherapi.com/v1/current.json")
 DATA_PATH = Path(__file__).resolve().parents[1] / "data" /"api_auth.csv" 
+LAST_RUN_RESULTS = []   # per-city result/failure records of the latest run
  
 
-# Function to fetch weather data for a given city
-def fetch_weather_data(city: str, API_KEY: str) -> dict | None:
-    """Fetch weather and air quality data for a given city."""
+# Function to turn one API payload into a clean row
+def parse_weather(data: dict) -> dict:
+    """Flattens the location / current / air_quality sections of one response."""
+    # 1. Location Data
+    location_data = data['location']
+
+    # 2. Weather Data
+    current_weather = data['current']
+
+    # 3. Air Quality Data (Nested under current)
+    air_quality = current_weather['air_quality']
+
+    # A clean row dictionary with the required fields
+    return {
+        'City': location_data['name'],
+        'Country': location_data['country'],
+        'Latitude': location_data['lat'],
+        'Longitude': location_data['lon'],
+        'Timestamp_UTC': current_weather['last_updated_epoch'],
+        'Temperature_C': current_weather['temp_c'],
+        'Wind_KPH': current_weather['wind_kph'],
+        'Condition': current_weather['condition']['text'],
+
+        # --- Air Quality Metrics ---
+        'AQI_US': air_quality.get('us-epa-index'), # US EPA Index (1-6)
+        'CO': air_quality.get('co'),
+        'NO2': air_quality.get('no2'),
+        'O3': air_quality.get('o3'),
+        'PM2.5': air_quality.get('pm2_5'),
+    }
+
+
+def _timed_out(error) -> bool:
+    # urllib3 may wrap timeouts in MaxRetryError, which requests surfaces as a ConnectionError
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, (ReadTimeoutError, ConnectTimeoutError))
+
+
+# Function to fetch one city, with timing and failure accounting
+def fetch_city(city: str, API_KEY: str, base_url: str = BASE_URL, timeout: float | None = None) -> dict:
+    """Returns {"city", "row", "status", "error", "duration_seconds"}; never raises.
+
+    One attempt on the retry-less session, so `timeout` bounds the call (no transport retries
+    or backoff on top of it); a failed city is simply fetched again on the next run.
+    """
     params = {"key":API_KEY, "q": city, "aqi":"yes" }
-   
-    # Nested the API request in a try-except block to handle potential errors
-    try: 
-            
-        response = requests.get(BASE_URL, params = params, timeout=10)
-        response.raise_for_status() 
-            
-        print("Data fetched successfully!")
-        data = response.json()
-
-        # --- Data Parsing: This is the core logic ---
-        
-        # 1. Location Data
-        location_data = data['location']
-        
-        # 2. Weather Data
-        current_weather = data['current']
-        
-        # 3. Air Quality Data (Nested under current)
-        air_quality = current_weather['air_quality']
-        
-        # A clean row dictionary with the required fields
-        return {
-            'City': location_data['name'],
-            'Country': location_data['country'],
-            'Latitude': location_data['lat'],
-            'Longitude': location_data['lon'],
-            'Timestamp_UTC': current_weather['last_updated_epoch'],
-            'Temperature_C': current_weather['temp_c'],
-            'Wind_KPH': current_weather['wind_kph'],
-            'Condition': current_weather['condition']['text'],
-            
-            # --- Air Quality Metrics ---
-            'AQI_US': air_quality.get('us-epa-index'), # US EPA Index (1-6)
-            'CO': air_quality.get('co'),
-            'NO2': air_quality.get('no2'),
-            'O3': air_quality.get('o3'),
-            'PM2.5': air_quality.get('pm2_5'),
-        }
+    timeout = timeout or weather_ingestion["timeout"]
+    started = time.monotonic()
+    result = {"city": city, "row": None, "status": "ok", "error": None}
 
+    # Nested the API request in a try-except block to handle potential errors
+    try:
+        response = http_client.get(base_url, params = params, timeout = timeout, retries = False)
+        response.raise_for_status()
+        result["row"] = parse_weather(response.json())
+
+    except requests.exceptions.Timeout as e:
+        result.update(status="timeout", error=str(e))
+        print(f"⏱️ Timeout for {city} after {timeout}s")
     except requests.exceptions.HTTPError as http_err:
+        result.update(status=f"http_{http_err.response.status_code}", error=str(http_err))
         print(f"❌ HTTP Error for {city}: {http_err.response.status_code}. Key or City may be invalid.")
-        return None
     except requests.exceptions.RequestException as e:
-        print(f"❌ Network Error for {city}: {e}")
-        return None
+        if _timed_out(e):
+            result.update(status="timeout", error=str(e))
+            print(f"⏱️ Timeout for {city} after {timeout}s")
+        else:
+            result.update(status="network", error=str(e))
+            print(f"❌ Network Error for {city}: {e}")
     except Exception as e:
+        result.update(status="parse", error=str(e))
         print(f"❌ Data Parsing Error for {city}: {e}")
-        return None
 
-def run_ingestion(CITY_NAME : str, API_KEY: str) -> pd.DataFrame| None:
+    elapsed = time.monotonic() - started
+    result["duration_seconds"] = round(elapsed, 3)
+    metrics.observe("weather_city_seconds", elapsed)
+    metrics.incr("weather_cities_total", status=result["status"])
+    return result
 
-    """Main execution function to fetch all data and save to CSV."""
-    all_data = []
-    print(f"--- 🌎 Starting Hybrid Ingestion for {len(CITY_NAME)} African Cities ---")
 
-    for city in CITY_NAME:
-        row = fetch_weather_data(city, API_KEY)
+# Function to fetch weather data for a given city
+def fetch_weather_data(city: str, API_KEY: str) -> dict | None:
+    """Fetch weather and air quality data for a given city."""
+    row = fetch_city(city, API_KEY)["row"]
+    if row:
+        print("Data fetched successfully!")
+    return row
+
+
+def run_ingestion(CITY_NAME : str, API_KEY: str, base_url: str = BASE_URL,
+                  max_workers: int | None = None, timeout: float | None = None) -> pd.DataFrame| None:
+
+    """Main execution function: fetches every city concurrently and returns one DataFrame.
+
+    At most `max_workers` requests are in flight, each bounded by `timeout`, so a slow city only
+    costs its own slot. Rows keep the order of CITY_NAME whatever order the responses arrive in.
+    """
+    max_workers = max_workers or weather_ingestion["max_workers"]
+    print(f"--- 🌎 Starting Hybrid Ingestion for {len(CITY_NAME)} African Cities "
+          f"({max_workers} concurrent) ---")
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather") as pool:
+        # map() yields in submission order -> deterministic merge
+        results = list(pool.map(lambda city: fetch_city(city, API_KEY, base_url, timeout), CITY_NAME))
+    LAST_RUN_RESULTS[:] = [{k: v for k, v in r.items() if k != "row"} for r in results]
+
+    all_data = []
+    for result in results:
+        row = result["row"]
         if row:
             all_data.append(row)
-            print(f"✅ Fetched data for {row['City']}, {row['Country']}")
+            print(f"✅ Fetched data for {row['City']}, {row['Country']} ({result['duration_seconds']}s)")
+
+    failed = {r["city"]: r["status"] for r in results if r["status"] != "ok"}
+    print(f"🏁 Cities done in {time.monotonic() - started:.1f}s: {len(all_data)} succeeded, "
+          f"{len(failed)} failed {failed or ''}")
 
     if not all_data:
         print("🛑 No data was successfully retrieved. Exiting.")
@@ -90,39 +149,28 @@ def run_ingestion(CITY_NAME : str, API_KEY: str) -> pd.DataFrame| None:
     return new_df
  
 
-def save_data(new_df, DATA_PATH=DATA_PATH):    
-    # --- Data Persistence (Append Logic) ---
-        DATA_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-        # Use the robust data saving logic we discussed
-        if DATA_PATH.exists():
-                try:
-                    existing_df = pd.read_csv(DATA_PATH)
-                    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                    print(f"Loaded existing data ({len(existing_df)} rows) and appended new data.")
-                except pd.errors.EmptyDataError:
-                    # Handle case where file exists but is empty
-                    combined_df = new_df
-                    print("Existing CSV was empty. Starting new dataset.")
-                
-        else:
-            combined_df = new_df
-            combined_df.to_csv(DATA_PATH, index=False)
-            print(f"💾 New CSV created at {DATA_PATH}")
-
-        
-        # Remove duplicates, keeping the latest timestamp for each city
-        # This is critical for time-series data
-        combined_df = combined_df.sort_values('Timestamp_UTC', ascending=False).sort_index()
-
-        combined_df.to_csv(DATA_PATH, index=False)
+def save_data(new_df, DATA_PATH=DATA_PATH, STORE_PATH=STORE_PATH):    
+    # --- Data Persistence (Upsert + Append Logic) ---
+        # The time-series store upserts on (City, Timestamp_UTC) and tracks the latest reading per city;
+        # only readings it had not seen before are appended to the CSV, which is never re-read or rewritten.
+        # The append runs inside the upsert's transaction: a failed save rolls the upsert back,
+        # so the next run still sees those readings as new.
+        written = []
+        try:
+            bootstrap_from_csv(DATA_PATH, STORE_PATH)
+            upsert_readings(new_df, STORE_PATH, on_new=lambda fresh: written.append(save_dataset(fresh, DATA_PATH)))
+        except Exception as e:
+            print(f"❌ Error saving weather data: {e}")
+            return False
         print(f"\n--- 💾 Success: Data saved to {DATA_PATH} ---")
-        print(f"Total rows in dataset: {len(combined_df)}")
+        print(f"Rows added this run: {sum(written)}")
+        return True
 
 
 # == api_auth_ingestor.py == #
 def run_api_authentication():
-    # Load environment variables from the (.env) file
+    # Load environment variables from the (.env) file (only this job needs python-dotenv)
+    from dotenv import load_dotenv
     load_dotenv()
  
     # Parameters for the API request
@@ -132,8 +180,11 @@ def run_api_authentication():
         raise ValueError("⚠️ WEATHER_API_KEY not found in environment variables.")
      
     new_df = run_ingestion(CITY_NAME=CITY_NAME, API_KEY=API_KEY)
-    if new_df is not None:
-        save_data(new_df, DATA_PATH)
+    print(f"🔌 Connection reuse: {http_client.connection_stats()}")
+    if new_df is None:
+        print("❌ No weather data fetched for any city.")
+        return False
+    return save_data(new_df, DATA_PATH)
 
 
 # Main execution function     
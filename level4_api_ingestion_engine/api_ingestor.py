@@ -2,9 +2,15 @@ import pandas as pd
 import json 
 import requests 
 from pathlib import Path 
-import time
+import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from scripts.config import headers, payload
+from scripts.config import headers, payload, build_payload, konga_ingestion
+from core import http_client, metrics
+from core.politeness import limiter_for, retry_backoff
+from core.response_cache import UNCHANGED, conditional_request, get_cache
+from core.dataset_sink import save_dataset
+from core.dedup_index import keep_changed
 
 
 API_URL = "https://api.konga.com/v1/graphql"
@@ -15,34 +21,104 @@ CSV_PATH = Path(__file__).resolve().parents[1] / "data" / "api_ingestor.csv"
  
   
 # == CORE FUNCTIONS == #  
-def safe_get(API_URL, retries = 4, delay = 4): 
+def safe_get(API_URL, retries = 4, cache = None, payload = payload): 
     #retries--The maximum number of attempts the function will make.
-    #delay--The number of seconds the script will pause before making the next attempt.
+    #Every retry first backs off exponentially (1s, 2s, 4s), then waits its turn on the host's
+    #adaptive rate limiter (core.politeness): it runs fast while Konga is healthy and slows down
+    #(or honours Retry-After) after 429/5xx/errors, which core.http_client reports to it.
+    #cache--optional ResponseCache; returns UNCHANGED when the payload matches the last run.
+    #       A new payload is only held in the cache: the caller commits it once the rows are saved.
+    #payload--GraphQL payload to send (see scripts.config.build_payload).
     
+    limiter = limiter_for(API_URL)
     for attempt in range(retries):
+        if attempt:
+            retry_backoff(attempt)
+        limiter.acquire()
         try:
             print(f"🌐 Attemp=t {attempt}: Fetching data from {API_URL}") 
-            response = requests.post(API_URL, headers=headers ,json=payload, timeout = 10, verify=True)
+            if cache is not None:
+                response = conditional_request(cache, "POST", API_URL, deferred=True,
+                                               headers=headers, json=payload, verify=True)
+            else:
+                response = http_client.post(API_URL, headers=headers ,json=payload, verify=True)
 
             response.raise_for_status()
+            if getattr(response, "unchanged", False):
+                print("♻️ Payload unchanged since last run — skipping parse.")
+                return UNCHANGED
             print("All is well...data fetched successfully!")
             return response.json() # Return the JSON data as a Python dictionary
             
             
 
         except requests.exceptions.RequestException as e:
-            print(f"❌ Error: {e}. Retrying in {delay}s...")
-
-        # Wait before next retry
-        time.sleep(delay)
+            print(f"❌ Error: {e}. Retrying at {limiter.rate:.2f} req/s...")
 
     print("🚨 All retries failed. Returning None.")
     return None
 
 
 
+# == NORMALIZATION == #
+SCALAR_FIELDS = ["name", "brand", "description", "image_thumbnail", "sku"]
+PRICE_FIELDS = ["price", "deal_price", "final_price"]
+BOOL_VALUES = {True: True, False: False, 1: True, 0: False,
+               "true": True, "false": False, "1": True, "0": False, "yes": True, "no": False}
+
+
+def _nested(records, *path):
+    """Pulls one nested value out of every record in a single pass (missing levels -> None)."""
+    values = []
+    for record in records:
+        for key in path:
+            record = record.get(key) if isinstance(record, dict) else None
+        values.append(record)
+    return values
+
+
+def _numeric(values, dtype):
+    """Anything unparseable ("", "N/A", dicts) becomes <NA> instead of failing the whole batch."""
+    return pd.to_numeric(pd.Series(values, dtype="object"), errors="coerce").astype(dtype)
+
+
+def _boolean(values):
+    """true/false, 1/0, "yes"/"no" (any case) -> nullable boolean; anything else -> <NA>."""
+    mapped = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.strip().lower()
+        mapped.append(BOOL_VALUES.get(value) if isinstance(value, (str, bool, int)) else None)
+    return pd.Series(mapped, dtype="object").astype("boolean")
+
+
+def normalize_products(products):
+    """Flattens Konga product dicts into typed columns in one batched pass.
+
+    seller{name} -> seller_name, stock{in_stock, quantity} -> in_stock / quantity,
+    product_rating{quality{average, number_of_ratings}} -> rating_avg / rating_count.
+    Prices and counts become nullable integers and in_stock a nullable boolean; values that don't
+    parse become null. The "[object Object]" description placeholder becomes null.
+    """
+    columns = {field: _nested(products, field) for field in SCALAR_FIELDS}
+    for field in PRICE_FIELDS:
+        columns[field] = _numeric(_nested(products, field), "Float64").round().astype("Int64")
+
+    columns["seller_name"] = _nested(products, "seller", "name")
+    columns["in_stock"] = _boolean(_nested(products, "stock", "in_stock"))
+    columns["quantity"] = _numeric(_nested(products, "stock", "quantity"), "Float64").round().astype("Int64")
+    columns["rating_avg"] = _numeric(_nested(products, "product_rating", "quality", "average"), "Float64")
+    columns["rating_count"] = _numeric(_nested(products, "product_rating", "quality", "number_of_ratings"),
+                                       "Float64").round().astype("Int64")
+
+    df = pd.DataFrame(columns)
+    df["description"] = df["description"].where(~df["description"].isin(["[object Object]"]))
+    df["sku"] = df["sku"].astype("string")
+    return df
+
+
 # Function to normalize raw product data into a clean DataFrame  
-def load(data):
+def load(data, category_id=None):
      
     if not data:
         print("⚠️ No data to normalize.")
@@ -50,9 +126,10 @@ def load(data):
 
     # Extract products 
     try:
-      df = json.dumps(data, indent=4)
       products = data["data"]["searchByStore"]["products"]
-      df = pd.DataFrame(products)
+      df = normalize_products(products)
+      if category_id is not None:
+          df['category_id'] = category_id
       df['fetched_at'] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
       print(f"✅ Normalized {len(df)} products into a clean DataFrame.")
       return df
@@ -65,38 +142,122 @@ def load(data):
 # Function to save DataFrame to CSV, appending if file exists
 def save_to_csv(df, CSV_PATH):
     try:
-        CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
-
+        # Products are mapped by sku: only new products or changed prices/ratings are stored
+        df, on_saved = keep_changed(df, CSV_PATH)
+        if df.empty:
+            print("✅ No product changes since the last run — nothing to save.")
+            return True
 
-        if CSV_PATH.exists():
-            existing_df = pd.read_csv(CSV_PATH)
-            combined_df = pd.concat([existing_df, df], ignore_index=True)
-         # The Procudt id is used for mapping individual iitems, we can 
-         # drop duplicates based on ProductID (if it exists)
-             
-            combined_df.to_csv(CSV_PATH, index=False)
-            print(f"💾 Data appended & saved successfully to {CSV_PATH}")
-        else:
-            df.to_csv(CSV_PATH, index=False)
-            print(f"💾 New CSV created at {CSV_PATH}")
+        # Only the new batch is written; existing history is left untouched.
+        # The dedup index learns the new hashes only once the rows are on disk.
+        save_dataset(df, CSV_PATH)
+        if on_saved is not None:
+            on_saved()
+        print(f"💾 Data appended & saved successfully to {CSV_PATH}")
+        return True
 
     except Exception as e:
         print(f"❌ Error saving data to CSV: {e}")
-        print(f"💾 Data saved to {CSV_PATH}")
+        return False
     
      
-def run_api_ingestion():
+# == PAGINATED INGESTION == #
+def fetch_page(category_id, page, limit, search_terms=None, api_url=API_URL, cache=None):
+    """Fetches one GraphQL page -> (parsed JSON, UNCHANGED or None; its cache key or None)."""
+    page_payload = build_payload(category_id, page=page, limit=limit, search_terms=search_terms)
+    cache_key = cache.key_for("POST", api_url, None, page_payload) if cache is not None else None
+    with metrics.timer("konga_page_seconds"):
+        return safe_get(api_url, cache=cache, payload=page_payload), cache_key
+
+
+def page_count(data, limit, max_pages):
+    """Number of pages for a category, read from pagination.total on the first page."""
+    try:
+        total = int(data["data"]["searchByStore"]["pagination"]["total"])
+    except (KeyError, TypeError, ValueError):
+        return 1
+    return max(1, min(math.ceil(total / limit), max_pages))
+
+
+def ingest_category(category_id, search_terms=None, limit=40, max_pages=50, max_concurrency=4,
+                    api_url=API_URL, cache=None):
+    """Reads pagination.total from page 0, fans out the remaining pages concurrently
+    and streams each page's products into the sink as it arrives (in page order)."""
+    print(f"\n📂 Konga category {category_id} (filters={search_terms or []})")
+    # Page 0 always bypasses the cache: its pagination.total drives the fan-out
+    first, _ = fetch_page(category_id, 0, limit, search_terms, api_url, cache=None)
+    if first is None:
+        print(f"❌ First page failed for category {category_id}.")
+        return {"category_id": category_id, "pages": 0, "records": 0, "success": False}
+
+    pages = page_count(first, limit, max_pages)
+    print(f"📑 Category {category_id}: {pages} page(s) of {limit}")
+
+    stats = {"category_id": category_id, "pages": 0, "records": 0, "success": True}
+
+    def sink(page, data):
+        """Saves one page; False if it failed or could not be saved."""
+        if data is None:
+            print(f"⚠️ Page {page} of category {category_id} failed.")
+            stats["success"] = False
+            return False
+        stats["pages"] += 1
+        if data == UNCHANGED:
+            metrics.incr("konga_pages_total", status="unchanged")
+            return True
+        metrics.incr("konga_pages_total", status="fetched")
+        with metrics.timer("normalize_seconds", source="konga"):
+            df = load(data, category_id)
+        metrics.incr("konga_products_total", len(df))
+        if df.empty:
+            return True
+        if not save_to_csv(df, CSV_PATH):
+            print(f"⚠️ Page {page} of category {category_id} could not be saved.")
+            stats["success"] = False
+            return False
+        stats["records"] += len(df)
+        return True
+
+    sink(0, first)
+    remaining = range(1, pages)
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="konga") as pool:
+        results = pool.map(lambda p: fetch_page(category_id, p, limit, search_terms, api_url, cache), remaining)
+        for page, (data, cache_key) in zip(remaining, results):
+            saved = sink(page, data)
+            # The cache learns a page only once its rows are on disk (or if it had nothing to save)
+            if cache_key is not None:
+                (cache.commit if saved else cache.discard)(cache_key)
+
+    return stats
+
+
+def run_api_ingestion(categories=None, search_terms=None, api_url=API_URL):
     """High-level callable for orchestrator.py"""
     print("\n🚀 Starting API ingestion process...\n")
+    categories = categories or konga_ingestion["categories"]
+    search_terms = search_terms if search_terms is not None else konga_ingestion["search_terms"]
     try:
-        data = safe_get(API_URL)
-        df = load(data)
-        if df.empty:
+        cache = get_cache()
+        summary = [
+            ingest_category(
+                category_id, search_terms,
+                limit=konga_ingestion["page_limit"],
+                max_pages=konga_ingestion["max_pages"],
+                max_concurrency=konga_ingestion["max_concurrency"],
+                api_url=api_url, cache=cache,
+            )
+            for category_id in categories
+        ]
+        print(f"🔌 Connection reuse: {http_client.connection_stats()}")
+        if cache is not None:
+            print(f"🗃️ Response cache: {cache.stats()}")
+        print(f"📊 Category summary: {summary}")
+
+        if not any(s["pages"] for s in summary):
             print("⚠️ No records fetched. Skipping CSV save.")
             return False
-        save_status = save_to_csv(df, CSV_PATH)
         print("✅ API ingestion completed successfully.\n")
-        return save_status
+        return all(s["success"] for s in summary)
     except Exception as e:
         print(f"❌ API ingestion failed: {e}")
         return False
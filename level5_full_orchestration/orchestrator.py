@@ -3,6 +3,8 @@ import sys
 import argparse
 import logging
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from datetime import datetime
 
@@ -12,17 +14,52 @@ if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
   
-# --- Import jobs ---
-from level3_automated_ingestion_cycles.automated_scraper import run_automated_scraper
-from level4_api_ingestion_engine.api_ingestor import run_api_ingestion
-from level4_api_ingestion_engine.api_auth import run_api_authentication
+# --- Imports (light only: job modules load on first use, see core.job_registry) ---
+from scripts.config import scraper_engine
+from core.job_registry import LazyJobs
+from core.retry_policy import RetryPolicy
+from core.report_store import ReportStore
+from core import metrics
+from core.scheduler import Scheduler
 
  
-# --- Register jobs ---
-JOBS = {
-    "Auto_Scraper": run_automated_scraper,
-    "API_Ingest": run_api_ingestion,
-    "API_Auth": run_api_authentication,
+# --- Register jobs ("module:function"; imported the first time the job runs) ---
+JOBS = LazyJobs({
+    "Auto_Scraper": "level3_automated_ingestion_cycles.automated_scraper:run_automated_scraper",
+    "API_Ingest": "level4_api_ingestion_engine.api_ingestor:run_api_ingestion",
+    "API_Auth": "level4_api_ingestion_engine.api_auth:run_api_authentication",
+    "Detail_Crawler": "level3_automated_ingestion_cycles.automated_scraper:run_detail_crawler",
+})
+
+# --- Job dependencies (job -> jobs that must succeed first) ---
+# The ingestion jobs run side by side under -all. Auto_Scraper and Detail_Crawler share the
+# crawl frontier and the git publish step: data writers and core.git_sync serialize on
+# core.fileio.DATA_LOCK. The detail crawl works through the links Auto_Scraper just added.
+JOB_DEPENDENCIES = {
+    "Auto_Scraper": [],
+    "API_Ingest": [],
+    "API_Auth": [],
+    "Detail_Crawler": ["Auto_Scraper"],
+}
+MAX_PARALLEL = 3
+
+# --- Daemon schedules (orchestrator.py -daemon); cron is UTC, same slots as the GitHub workflows ---
+SCHEDULES = {
+    "Auto_Scraper": {"interval": 12 * 3600, "jitter": 600, "misfire": "run_once"},
+    "API_Ingest": {"cron": "0 0 */5 * *", "jitter": 300, "misfire": "run_once"},
+    "API_Auth": {"cron": "0 0 */2 * *", "jitter": 300, "misfire": "run_once"},
+    # Small batches often: the frontier hands out whatever detail pages are due
+    "Detail_Crawler": {"interval": 3 * 3600, "jitter": 600, "misfire": "skip"},
+}
+
+# --- Retry policies (attempt count comes from -retries / run_job(retries=...)) ---
+DEFAULT_RETRY = {"base_delay": 5, "multiplier": 2, "max_delay": 120, "max_elapsed": 900}
+RETRY_POLICIES = {
+    # A scraper retry resumes from its checkpoint, but give the site time to recover first
+    "Auto_Scraper": {"base_delay": 30, "max_delay": 300, "max_elapsed": 1800},
+    "API_Ingest": {"base_delay": 5, "max_delay": 60, "max_elapsed": 600},
+    "API_Auth": {"base_delay": 5, "max_delay": 60, "max_elapsed": 300},
+    "Detail_Crawler": {"base_delay": 30, "max_delay": 300, "max_elapsed": 1800},
 }
 
 
@@ -35,67 +72,109 @@ logging.basicConfig(
 logger = logging.getLogger()
 
 
+# --- Run Log (append-only JSONL, see core.report_store) ---
+REPORT_PATH = ROOT / "level5_full_orchestration" / "orchestrator_report.jsonl"
+LEGACY_REPORT_PATH = ROOT / "level5_full_orchestration" / "orchestrator_report.json"
+REPORT_STORE = ReportStore(REPORT_PATH)   # old JSON list: import once with -import-legacy
+
+
 # --- Append Single Report (Unified Writer) ---
 def append_report(report):
-    """Automatically append a single job report to orchestrator_report.json."""
-    try:
-        with open("level5_full_orchestration/orchestrator_report.json") as f:
-            existing = json.load(f)
-    except:
-        existing = []
+    """Automatically append a single job report to the run log (one line, O(1) per report)."""
+    REPORT_STORE.append(report)
+
+
+# --- Retry Policy Lookup ---
+def retry_policy_for(job_name, retries=1):
+    """DEFAULT_RETRY merged with the job's RETRY_POLICIES entry, allowing `retries` attempts."""
+    settings = {**DEFAULT_RETRY, **RETRY_POLICIES.get(job_name, {}), "max_attempts": retries}
+    return RetryPolicy(**settings)
+
 
-    existing.append(report)
+# --- Job Outcome Check ---
+class JobFailed(RuntimeError):
+    """A job reported failure by returning a falsy value instead of raising."""
 
-    with open("level5_full_orchestration/orchestrator_report.json", "w") as f:
-        json.dump(existing, f, indent=4)
+
+def checked(job_name, job_fn):
+    """Wraps `job_fn` so a False/None return fails the attempt (and is retried like an error)."""
+    def call():
+        result = job_fn()
+        if not result:
+            raise JobFailed(f"{job_name} reported failure (returned {result!r})")
+        return result
+    return call
 
 
 # --- Core Job Runner ---
-def run_job(job_name, job_fn=None, retries=1, verbose=False):
+def run_job(job_name, job_fn=None, retries=1, verbose=False, policy=None):
     """
     This is the Central job executor.
     Called by:
     - CLI
     - GitHub Actions
     - Flask/Render
+    Failed attempts are retried with exponential backoff + jitter (see core.retry_policy);
+    `policy` overrides the job's configured RetryPolicy. A job fails by raising or by returning
+    a falsy value; jobs return True when there was simply nothing to do, or a short status string
+    (e.g. a skipped publish) that the report records as its "result".
     """
     start = datetime.utcnow()
-    success = False
-    error_message = None
 
     #This allows Flask to pass only job_name
     if job_fn is None:
         if job_name not in JOBS:
             raise ValueError(f"Unknown job: {job_name}")
-        job_fn = JOBS[job_name]
+        # Resolved (imported) inside the attempt, so a broken job module yields a failed report
+        job_fn = lambda: JOBS[job_name]()
+    job_fn = checked(job_name, job_fn)
+    policy = policy or retry_policy_for(job_name, retries)
 
     if verbose:
-        print(f"\n▶ Running job: {job_name} (retries={retries})")
-
-    for attempt in range(1, retries + 1):
-        try:
-            job_fn()
-            success = True
-            logger.info(f"Job succeeded: {job_name} on attempt {attempt}")
-            if verbose:
-                print(f"✔ Success on attempt {attempt}")
-            break
-
-        except Exception as e:
-            error_message = str(e)
-            logger.error(f"Attempt {attempt} failed for {job_name}: {e}")
-            if verbose:
-                print(f"✘ Attempt {attempt} failed: {e}")
+        print(f"\n▶ Running job: {job_name} (retries={policy.max_attempts})")
+
+    def on_failure(attempt):
+        logger.error(f"Attempt {attempt['attempt']} failed for {job_name}: {attempt['error']}")
+        if verbose:
+            print(f"✘ Attempt {attempt['attempt']} failed: {attempt['error']}")
+            if "delay_seconds" in attempt:
+                print(f"⏳ Retrying in {attempt['delay_seconds']:.1f}s...")
+            else:
+                print(f"🛑 Giving up: {attempt['gave_up']}")
+
+    with metrics.window() as window:
+        with metrics.timer("job_seconds", job=job_name):
+            outcome = policy.call(job_fn, on_failure=on_failure)
+        attempts = len(outcome["attempts"])
+        metrics.incr("job_runs_total", job=job_name, status="success" if outcome["success"] else "failed")
+        metrics.incr("job_attempts_total", attempts, job=job_name)
+        # Shared metrics (http_*, sink_*, ...) are only this job's if no other job ran meanwhile;
+        # otherwise keep its job-labelled metrics and leave the rest to the run-wide "ALL" report
+        job_metrics = window.delta(job=job_name if window.overlapped else None)
+
+    result = outcome["result"] if isinstance(outcome["result"], str) else None
+    if outcome["success"]:
+        logger.info(f"Job succeeded: {job_name} on attempt {attempts}")
+        if result:
+            logger.warning(f"Job {job_name} result: {result}")
+        if verbose:
+            print(f"✔ Success on attempt {attempts}" + (f" ({result})" if result else ""))
 
     end = datetime.utcnow()
 
     # Structured JSON report
     report = {
         "job": job_name,
-        "success": success,
-        "attempts": retries,
-        "error": error_message,
+        "success": outcome["success"],
+        "attempts": attempts,
+        "error": None if outcome["success"] else outcome["error"],
+        "result": result,
         "duration_seconds": (end - start).total_seconds(),
+        "retry_wait_seconds": outcome["waited_seconds"],
+        "attempt_log": outcome["attempts"],
+        # Per-stage timers and counters recorded while the job ran (see core.metrics)
+        "metrics": job_metrics,
+        "metrics_exclusive": not window.overlapped,
         "timestamp": end.isoformat(),
     }
 
@@ -105,6 +184,138 @@ def run_job(job_name, job_fn=None, retries=1, verbose=False):
     return report
 
 
+# --- Dependency Graph ---
+def job_graph(names, dependencies=None):
+    """Returns {job: [dependencies]} for `names` plus everything they depend on; rejects cycles."""
+    dependencies = JOB_DEPENDENCIES if dependencies is None else dependencies
+    graph = {}
+    todo = list(names)
+    while todo:
+        name = todo.pop()
+        if name in graph:
+            continue
+        if name not in JOBS:
+            raise ValueError(f"Unknown job: {name}")
+        graph[name] = list(dependencies.get(name, []))
+        todo.extend(graph[name])
+
+    # Kahn's algorithm: every job must become runnable at some point
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between jobs: {sorted(remaining)}")
+        for name in ready:
+            remaining.pop(name)
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return graph
+
+
+def run_jobs(names=None, retries=1, verbose=False, max_parallel=MAX_PARALLEL, dependencies=None):
+    """Runs jobs as a DAG: a job starts once all its dependencies succeeded, independent jobs run
+    concurrently on up to `max_parallel` workers, and a failed job only skips its dependents.
+
+    Every job gets its own report; one aggregated "ALL" report summarises the run, including
+    the metrics of the whole run (jobs that overlapped only report their job-labelled metrics).
+    """
+    names = list(JOBS) if names is None else list(names)
+    graph = job_graph(names, dependencies)
+    started = time.monotonic()
+    before = metrics.snapshot()
+    reports = {}
+    running = {}
+
+    if verbose:
+        print(f"\n🕸️ Running {len(graph)} jobs (max parallel: {max_parallel})")
+
+    def skip(name, failed_deps):
+        reports[name] = {
+            "job": name,
+            "success": False,
+            "skipped": True,
+            "attempts": 0,
+            "error": f"Skipped: dependency failed ({', '.join(failed_deps)})",
+            "duration_seconds": 0.0,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        logger.warning(f"Job skipped: {name} (failed dependencies: {failed_deps})")
+        if verbose:
+            print(f"⏭ Skipping {name}: dependency failed ({', '.join(failed_deps)})")
+        append_report(reports[name])
+
+    with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="job") as pool:
+        while len(reports) < len(graph):
+            # Settle every job whose dependencies are all finished
+            for name, deps in graph.items():
+                if name in reports or name in running.values():
+                    continue
+                if not all(dep in reports for dep in deps):
+                    continue
+                failed = [dep for dep in deps if not reports[dep]["success"]]
+                if failed:
+                    skip(name, failed)
+                else:
+                    running[pool.submit(run_job, name, None, retries, verbose)] = name
+
+            if not running:
+                continue   # only skips happened this round; look again
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    reports[name] = future.result()
+                except Exception as e:   # run_job itself broke (not the job)
+                    reports[name] = {"job": name, "success": False, "attempts": 0, "error": str(e),
+                                     "duration_seconds": 0.0, "timestamp": datetime.utcnow().isoformat()}
+
+    summary = {
+        "job": "ALL",
+        "success": all(r["success"] for r in reports.values()),
+        "jobs": {name: ("skipped" if r.get("skipped") else "success" if r["success"] else "failed")
+                 for name in JOBS if name in reports for r in [reports[name]]},
+        "results": {name: r["result"] for name, r in reports.items() if r.get("result")},
+        "max_parallel": max_parallel,
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "job_seconds": round(sum(r["duration_seconds"] for r in reports.values()), 3),
+        "metrics": metrics.delta(before),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    append_report(summary)
+    if verbose:
+        print(f"\n🏁 All jobs done in {summary['duration_seconds']}s "
+              f"(sequential would be ~{summary['job_seconds']}s): {summary['jobs']}")
+    return summary
+
+
+# --- Scheduler Daemon ---
+def run_daemon(names=None, retries=1, verbose=False, max_parallel=MAX_PARALLEL):
+    """Runs the SCHEDULES of `names` (default: all) in this process until interrupted.
+
+    Staying resident keeps imports, pooled HTTP sessions, the response cache and the parse
+    process pool warm between runs; core.scheduler guarantees no job overlaps itself.
+    """
+    names = list(SCHEDULES) if names is None else list(names)
+    for name in names:
+        if name not in JOBS or name not in SCHEDULES:
+            raise ValueError(f"No schedule for job: {name}")
+
+    # Warm shared state once, up front
+    from core.response_cache import get_cache
+    get_cache()
+
+    scheduler = Scheduler(
+        {name: SCHEDULES[name] for name in names},
+        run=lambda name: run_job(name, retries=retries, verbose=verbose),
+        max_parallel=max_parallel,
+    )
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+        print("\n👋 Scheduler interrupted.")
+
+
 # --- CLI Orchestrator ---
 def main():
     parser = argparse.ArgumentParser(description="Clean Orchestrator")
@@ -112,12 +323,49 @@ def main():
     parser.add_argument("-all", action="store_true", help="Run all jobs")
     parser.add_argument("-verbose", action="store_true")
     parser.add_argument("-retries", type=int, default=1)
+    parser.add_argument("-max-parallel", type=int, default=MAX_PARALLEL, help="Jobs run concurrently under -all")
+    parser.add_argument("-engine", choices=["sync", "async", "pipeline"], help="Scraper engine for Auto_Scraper")
+    parser.add_argument("-parse-workers", type=int, help="Parser processes (pipeline engine)")
+    parser.add_argument("-queue-depth", type=int, help="Raw pages buffered before fetchers block (pipeline engine)")
+    parser.add_argument("-recent", type=int, metavar="N", help="Show the N most recent runs and exit")
+    parser.add_argument("-stats", action="store_true", help="Show per-job duration stats and exit")
+    parser.add_argument("-daemon", action="store_true", help="Stay resident and run jobs on their SCHEDULES")
+    parser.add_argument("-metrics-file", type=str, help="Write Prometheus text metrics here after the run")
+    parser.add_argument("-compact", type=int, metavar="DAYS", help="Compact rotated run logs, keeping DAYS of history")
+    parser.add_argument("-import-legacy", action="store_true",
+                        help=f"Import {LEGACY_REPORT_PATH.name} into a new run log and exit")
     args = parser.parse_args()
 
+    # Run log maintenance and queries
+    if args.recent or args.stats or args.compact is not None or args.import_legacy:
+        if args.import_legacy:
+            REPORT_STORE.import_legacy_json(LEGACY_REPORT_PATH)
+        if args.compact is not None:
+            REPORT_STORE.compact(retain_days=args.compact)
+        if args.recent:
+            for report in REPORT_STORE.recent(args.recent, job=args.job):
+                print(f"{report.get('timestamp')} | {report.get('job'):<12} | "
+                      f"{'✔' if report.get('success') else '✘'} | {report.get('duration_seconds')}s")
+        if args.stats:
+            print(json.dumps(REPORT_STORE.duration_stats(job=args.job), indent=4))
+        return
+
+    # Scraper engine overrides (read by run_ingestion_cycle at call time)
+    if args.engine:
+        scraper_engine["mode"] = args.engine
+    if args.parse_workers:
+        scraper_engine["parse_workers"] = args.parse_workers
+    if args.queue_depth:
+        scraper_engine["queue_depth"] = args.queue_depth
+
+    # Long-running scheduler (one job with -job, otherwise every scheduled job)
+    if args.daemon:
+        run_daemon([args.job] if args.job else None, args.retries, args.verbose, args.max_parallel)
+        return
+
     # Run all jobs
     if args.all:
-        for name, fn in JOBS.items():
-            run_job(name, fn, args.retries, args.verbose)
+        run_jobs(retries=args.retries, verbose=args.verbose, max_parallel=args.max_parallel)
 
     # Run one job
     elif args.job:
@@ -126,14 +374,17 @@ def main():
             print(f"Available: {list(JOBS.keys())}")
             return
 
-        run_job(args.job, JOBS[args.job], args.retries, args.verbose)
+        run_job(args.job, retries=args.retries, verbose=args.verbose)
 
     else:
         print("Specify either -job <name> OR -all")
         return
 
+    if args.metrics_file:
+        Path(args.metrics_file).write_text(metrics.to_prometheus(), encoding="utf-8")
+
     if args.verbose:
-        print("\n📁 JSON report updated: orchestrator_report.json\n")
+        print(f"\n📁 Run log updated: {REPORT_PATH.name}\n")
 
 
 if __name__ == "__main__":
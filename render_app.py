@@ -1,55 +1,86 @@
-from flask import Flask, request
-import threading
+from flask import Flask, Response, jsonify, request
 import os
-from level5_full_orchestration.orchestrator import run_job, JOBS
+from level5_full_orchestration.orchestrator import run_job, run_jobs, JOBS
+from core import metrics
+from core.job_queue import JobQueue, QueueFull
 
 app = Flask(__name__)
 
+# Fixed worker pool + bounded queue: bursts of hits queue up (or get a 429) instead of
+# spawning a thread each, and a job already queued/running is never started twice.
+# The queue, its dedup and core.fileio.DATA_LOCK live in this process: serve the app from a
+# single process (`python render_app.py`, or `gunicorn -w 1 --threads 8 render_app:app`).
+if int(os.environ.get("WEB_CONCURRENCY", 1)) > 1:
+    print("⚠️ WEB_CONCURRENCY > 1: each worker process gets its own job queue, so the same job "
+          "can run twice at once. Run a single worker process.")
+job_queue = JobQueue(
+    workers=int(os.environ.get("JOB_WORKERS", 2)),
+    max_queued=int(os.environ.get("JOB_QUEUE_SIZE", 16)),
+)
+
 @app.route("/")
 def home():
-    return "🧠 Orchestrator Service Live. Use /run?job=JOB_NAME"
+    return "🧠 Orchestrator Service Live. Use /run?job=JOB_NAME, /status/<id> or /jobs"
 
 def background_runner(job_name):
-    try:
-        print(f"[RUNNER] Starting job: {job_name}")
+    print(f"[RUNNER] Starting job: {job_name}")
+    report = run_job(job_name, retries=1, verbose=True)
+    print(f"[RUNNER] Completed job: {job_name}")
+    return report
 
-        job_fn = JOBS.get(job_name)
-        if job_fn is None:
-            print(f"Error, unknown job {job_name}")
-            return
-            
-        run_job(job_name,job_fn, retries=1, verbose=True) 
-        print(f"[RUNNER] Completed job: {job_name}")
+def enqueue(name, fn, keys=None):
+    try:
+        job_id, created = job_queue.submit(name, fn, keys)
+    except QueueFull as e:
+        return jsonify({"error": f"❌ Queue full: {e}. Try again later."}), 429
 
-    except Exception as e:
-        print(f"[ERROR] Job {job_name} failed: {e}")
+    status = job_queue.status(job_id)
+    message = f"🚀 Job '{name}' queued." if created else f"♻️ Job '{name}' is already {status['status']}."
+    return jsonify({"message": message, "job_id": job_id, "deduplicated": not created,
+                    "status": status["status"], "status_url": f"/status/{job_id}"}), 202
 
 @app.route("/run")
 def run_any_job():
     job = request.args.get("job")
 
     if not job:
-        return "❌ No job specified. Use /run?job=JOB_N AME", 400
+        return "❌ No job specified. Use /run?job=JOB_NAME", 400
+    if job not in JOBS:
+        return f"❌ Unknown job '{job}'. Available: {list(JOBS)}", 404
 
-    # Start background execution
-    threading.Thread(target=background_runner, args=(job,)).start()
-
-    return f"🚀 Job '{job}' started in background."
+    return enqueue(job, lambda: background_runner(job))
 
 @app.route("/run/all")
 def run_all_jobs():
     jobs = list(JOBS.keys())  # modify as needed
 
     def run_all():
-        for job in jobs:
-            print(f"[ALL] Running job: {job}")
-            run_job(job, JOBS[job], retries=1, verbose=True)
+        # Independent jobs run side by side; see orchestrator.JOB_DEPENDENCIES
+        print(f"[ALL] Running jobs: {jobs}")
+        return run_jobs(jobs, retries=1, verbose=True)
+
+    # Holds every job's key, so it never overlaps a single run of any of them
+    return enqueue("ALL", run_all, keys=jobs)
+
+@app.route("/status/<job_id>")
+def job_status(job_id):
+    status = job_queue.status(job_id)
+    if status is None:
+        return jsonify({"error": f"Unknown job id {job_id}"}), 404
+    return jsonify(status)
 
-    threading.Thread(target=run_all).start()
+@app.route("/jobs")
+def list_jobs():
+    limit = request.args.get("limit", "50")
+    if not limit.isdigit() or not 1 <= int(limit) <= job_queue.history:
+        return jsonify({"error": f"limit must be an integer between 1 and {job_queue.history}"}), 400
+    return jsonify(job_queue.snapshot(limit=int(limit)))
 
-    return "🚀 Running all jobs in background."
+@app.route("/metrics")
+def prometheus_metrics():
+    # Timers and counters accumulated by every job this process has run
+    return Response(metrics.to_prometheus(), mimetype="text/plain; version=0.0.4")
 
- 
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
@@ -1,3 +1,10 @@
 CITY_NAME = ["Nigeria, Lagos", "Ghana, Accra", "Kenya, Nairobi", "South Africa, Johannesburg"
              ,"Egypt, Cairo", "Morocco, Casablanca", "Ethiopia, Addis Ababa", "Tanzania, Dar es Salaam"
              ,"Uganda, Kampala", "Algeria, Algiers"]
+
+
+# Concurrent weather ingestion (level4_api_ingestion_engine.api_auth.run_ingestion)
+weather_ingestion = {
+     "max_workers": 8,     # cities fetched in parallel; keep <= http_client pool_maxsize
+     "timeout": 10,        # seconds per city (connect and read)
+}
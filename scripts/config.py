@@ -1,3 +1,6 @@
+import json
+from string import Template
+
 
 headers = {
   'Content-Type': 'application/json',
@@ -16,16 +19,45 @@ selector = {
      "page_next":"a.pg[aria-label='Next Page']"    
 }  
 
+# Product detail pages (the listing's "Description Link"), crawled by core.crawl_frontier
+detail_selector = {
+     "Name": "h1",
+     "Price": "span.-b.-ubpt.-tal.-fs24",
+     "Old Price": "span.-tal.-gy5.-lthr.-fs16",
+     "Discount": "span.bdg._dsct._dyn",
+     "Ratings": "div.stars._m",
+     "Seller": "section.card p.-m.-pbs",
+}
+
+
+# Scraper engine used by the automated ingestion cycle
+# "sync"  -> original page-by-page crawl (core.scraper_engine.fetch_all_products)
+# "async" -> several pages in flight per host (core.async_engine.fetch_all_products_concurrent)
+# "pipeline" -> fetch threads feed a process pool of parsers (core.parse_pipeline.fetch_all_products_pipelined)
+scraper_engine = {
+     "mode": "sync",
+     "max_concurrency": 4,     # pages in flight per host
+     "rate_per_sec": 0.5,      # starting politeness budget (requests per second, adapts per host)
+     "max_rate_per_sec": 2.0,  # ceiling the adaptive limiter may speed up to while the site is healthy
+     "burst": 2,
+     "category_workers": 4,    # categories crawled in parallel (rate limit is per domain)
+     "parse_workers": 2,       # pipeline mode: parser processes
+     "queue_depth": 4,         # pipeline mode: raw pages buffered before fetchers block
+     "flush_rows": 500,        # rows buffered by the streaming sink before each append
+     "detail_batch": 200,      # detail pages fetched per Detail_Crawler run (most urgent first)
+     "detail_workers": 2,      # detail pages in flight (paced by the per-host rate limiter)
+}
+
 
-# GraphQL query payload, used for the API ingestion engine   
-payload = {
-  "query": """
+# GraphQL query template, used for the API ingestion engine
+# Placeholders are filled by build_payload() so one run can cover many categories/pages
+QUERY_TEMPLATE = Template("""
     {
       searchByStore(
-        search_term: [["category.category_id:5237"]],
+        search_term: $search_term,
         numericFilters: [],
         sortBy: "",
-        paginate: {page: 0, limit: 40},
+        paginate: {page: $page, limit: $limit},
         store_id: 1
       ) {
         pagination {
@@ -58,6 +90,24 @@ payload = {
         }
       }
     }
-  """
+  """)
+
+
+# Konga categories/search filters covered by one API ingestion run
+konga_ingestion = {
+     "categories": [5237],      # category.category_id values
+     "search_terms": [],        # extra facet filters, e.g. "brand:HP" (AND-ed with the category)
+     "page_limit": 40,          # products per GraphQL page
+     "max_pages": 50,           # safety cap per category
+     "max_concurrency": 4,      # page requests in flight
 }
-  
\ No newline at end of file
+
+
+def build_payload(category_id=5237, page=0, limit=40, search_terms=None):
+    """GraphQL payload for one page of one category."""
+    facets = [[f"category.category_id:{category_id}"]] + [[term] for term in (search_terms or [])]
+    return {"query": QUERY_TEMPLATE.substitute(search_term=json.dumps(facets), page=page, limit=limit)}
+
+
+# Default payload (first page of the laptops category)
+payload = build_payload()
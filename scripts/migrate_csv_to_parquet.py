@@ -0,0 +1,53 @@
+# One-shot migration: converts the existing flat CSV datasets into the partitioned Parquet layout
+# Usage: python scripts/migrate_csv_to_parquet.py [data/api_auth.csv ...]
+import sys
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from core.parquet_store import DATASETS, dataset_root, write_partitions
+
+
+DEFAULT_FILES = [ROOT / "data" / f"{name}.csv" for name in DATASETS]
+
+
+def migrate(csv_path, chunksize=100_000, force=False):
+    csv_path = Path(csv_path)
+    if csv_path.stem not in DATASETS:
+        print(f"⚠️ Skipping {csv_path.name}: no dataset spec in core.parquet_store.DATASETS")
+        return 0
+    if not csv_path.exists() or csv_path.stat().st_size == 0:
+        print(f"⚠️ Skipping {csv_path.name}: file missing or empty")
+        return 0
+
+    root = dataset_root(csv_path)
+    if root.exists() and any(root.rglob("*.parquet")) and not force:
+        print(f"⚠️ {root} already has Parquet files — use --force to migrate again")
+        return 0
+
+    total = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize, on_bad_lines="skip"):
+        total += write_partitions(chunk, csv_path)
+
+    print(f"✅ Migrated {total} rows: {csv_path.name} → {root}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate CSV datasets to partitioned Parquet")
+    parser.add_argument("files", nargs="*", help="CSV files to migrate (default: all known datasets)")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--force", action="store_true", help="Migrate even if Parquet files already exist")
+    args = parser.parse_args()
+
+    for csv_path in args.files or DEFAULT_FILES:
+        migrate(csv_path, chunksize=args.chunksize, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
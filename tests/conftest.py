@@ -0,0 +1,116 @@
+import hashlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+# The repo is run from its root (python -m ...), not installed; make `core` importable here too
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+# ===== LOCAL STAND-IN SERVERS ===== #
+@pytest.fixture
+def serve():
+    """serve(handle) starts a local HTTP server calling `handle(request_handler)` per request; returns its base URL."""
+    servers = []
+
+    def start(handle):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def reply(handler, status, body, content_type="text/html; charset=utf-8", headers=None):
+    handler.send_response(status)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Length", str(len(body)))
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+# ===== LISTING SITE STAND-IN ===== #
+class ListingSite:
+    """Local stand-in for a listing site (scripts.config.selector markup).
+
+    Serves `pages` pages of `per_page` products; pages in `fail` answer 500, pages in `empty` and
+    past the end have no products. `delays` holds per-page response times (default `delay`).
+    With `etags` every page has an ETag and a matching If-None-Match gets a 304.
+    Records every page requested and the most requests it had in flight at once.
+    """
+
+    def __init__(self, pages=3, per_page=2, fail=(), empty=(), delay=0.0, delays=None, etags=False):
+        self.pages, self.per_page, self.fail, self.empty = pages, per_page, set(fail), set(empty)
+        self.delay, self.delays, self.etags = delay, dict(delays or {}), etags
+        self.requested = []
+        self.not_modified = 0
+        self.in_flight = self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def html(self, page):
+        products = self.per_page if page <= self.pages and page not in self.empty else 0
+        cards = "".join(
+            f'<article class="prd _fb col c-prd"><a class="core" href="/p/{page}-{i}">'
+            f'<h3 class="name">Laptop {page}-{i}</h3><div class="prc">₦ {page}{i}00</div></a></article>'
+            for i in range(products)
+        )
+        next_link = f'<a class="pg" aria-label="Next Page" href="?page={page + 1}">&gt;</a>' if page < self.pages else ""
+        return f"<html><body><div>{cards}</div>{next_link}</body></html>".encode()
+
+    def handle(self, handler):
+        page = int(parse_qs(urlsplit(handler.path).query).get("page", ["1"])[0])
+        with self.lock:
+            self.requested.append(page)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(page, self.delay))
+            if page in self.fail:
+                return reply(handler, 500, b"boom")
+            body = self.html(page)
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if self.etags and handler.headers.get("If-None-Match") == etag:
+                with self.lock:
+                    self.not_modified += 1
+                return reply(handler, 304, b"", headers={"ETag": etag})
+            reply(handler, 200, body, headers={"ETag": etag} if self.etags else None)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def listing_site(serve, monkeypatch):
+    """Starts a ListingSite and returns (site, category url); no response cache and no retry sleeps."""
+    from core import politeness, response_cache, scraper_engine
+
+    monkeypatch.setitem(response_cache.CACHE_SETTINGS, "enabled", False)
+    monkeypatch.setattr(scraper_engine, "retry_backoff", lambda attempt: None)
+    politeness.reset_limiters()
+    site = ListingSite()
+    url = serve(site.handle) + "/laptops/"
+    politeness.limiter_for(url, initial_rate=1000, max_rate=1000, burst=1000)   # retries don't wait either
+    yield site, url
+    politeness.reset_limiters()
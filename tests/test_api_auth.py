@@ -0,0 +1,84 @@
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+
+from conftest import reply
+from core.timeseries_store import latest_readings
+from level4_api_ingestion_engine import api_auth
+
+
+def readings(*stamps):
+    return pd.DataFrame([{"City": "Lagos", "Country": "Nigeria", "Timestamp_UTC": ts, "Temperature_C": 30.0}
+                         for ts in stamps])
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "api_auth.csv", tmp_path / "state" / "weather.sqlite"
+
+
+# ===== SAVE ===== #
+def test_new_readings_are_appended_once(paths):
+    csv_path, store_path = paths
+    assert api_auth.save_data(readings(100, 200), csv_path, store_path)
+    assert api_auth.save_data(readings(200, 300), csv_path, store_path)
+    assert pd.read_csv(csv_path)["Timestamp_UTC"].tolist() == [100, 200, 300]
+
+
+def test_failed_csv_append_rolls_the_store_back(paths, monkeypatch):
+    csv_path, store_path = paths
+
+    def broken_save(df, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(api_auth, "save_dataset", broken_save)
+    assert not api_auth.save_data(readings(100), csv_path, store_path)
+    assert latest_readings(store_path=store_path).empty
+
+    monkeypatch.undo()
+    assert api_auth.save_data(readings(100), csv_path, store_path)
+    assert pd.read_csv(csv_path)["Timestamp_UTC"].tolist() == [100]
+
+
+# ===== CONCURRENT FETCH ===== #
+def weather(city, epoch=100):
+    return {"location": {"name": city, "country": "Testland", "lat": 1.0, "lon": 2.0},
+            "current": {"last_updated_epoch": epoch, "temp_c": 30.0, "wind_kph": 5.0,
+                        "condition": {"text": "Sunny"}, "air_quality": {"us-epa-index": 2, "pm2_5": 9.5}}}
+
+
+@pytest.fixture
+def weather_api(serve):
+    """Weather API stand-in: `slow` cities answer after `delay` seconds, `unknown` ones with a 400."""
+    api = {"slow": set(), "unknown": set(), "delay": 1.0}
+
+    def handle(handler):
+        city = parse_qs(urlsplit(handler.path).query)["q"][0]
+        if city in api["slow"]:
+            time.sleep(api["delay"])
+        if city in api["unknown"]:
+            return reply(handler, 400, b"{}", "application/json")
+        reply(handler, 200, json.dumps(weather(city)).encode(), "application/json")
+
+    api["url"] = serve(handle) + "/v1/current.json"
+    return api
+
+
+def test_a_slow_city_is_bounded_by_its_timeout(weather_api):
+    weather_api["slow"].add("Lagos")
+    result = api_auth.fetch_city("Lagos", "key", weather_api["url"], timeout=0.2)
+    assert result["status"] == "timeout" and result["row"] is None
+    assert result["duration_seconds"] < 0.9   # one attempt, no transport retries on top
+
+
+def test_cities_are_merged_in_request_order(weather_api):
+    weather_api["slow"].add("Accra")
+    weather_api["unknown"].add("Atlantis")
+    weather_api["delay"] = 0.2
+    df = api_auth.run_ingestion(["Accra", "Atlantis", "Cairo", "Lagos"], "key", weather_api["url"], max_workers=4)
+    assert df["City"].tolist() == ["Accra", "Cairo", "Lagos"]
+    assert {r["city"]: r["status"] for r in api_auth.LAST_RUN_RESULTS} == \
+        {"Accra": "ok", "Atlantis": "http_400", "Cairo": "ok", "Lagos": "ok"}
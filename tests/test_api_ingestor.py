@@ -0,0 +1,124 @@
+import json
+
+import pytest
+import requests
+
+from core import dedup_index, http_client, politeness
+from core.response_cache import ResponseCache
+from level4_api_ingestion_engine import api_ingestor
+
+
+class FakeResponse:
+    def __init__(self, status, payload=None):
+        self.status_code = status
+        self.headers = {}
+        self.payload = payload or {}
+        self.content = json.dumps(self.payload).encode()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Server Error")
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def request(self, method, url, **kwargs):
+        reply = self.statuses.pop(0)
+        return FakeResponse(*reply) if isinstance(reply, tuple) else FakeResponse(reply)
+
+
+@pytest.fixture
+def konga(monkeypatch):
+    """Routes Konga requests to canned statuses (or (status, payload)) and records retry backoffs."""
+    politeness.reset_limiters()
+    backoffs = []
+    monkeypatch.setattr(api_ingestor, "retry_backoff", backoffs.append)
+
+    def answer(*statuses):
+        session = FakeSession(statuses)
+        monkeypatch.setattr(http_client, "get_session", lambda url, retries=True: session)
+        return backoffs
+
+    yield answer
+    politeness.reset_limiters()
+
+
+# ===== SAFE GET ===== #
+def test_retries_back_off_between_attempts(konga):
+    backoffs = konga(500, 502, 500, 500)
+    assert api_ingestor.safe_get(api_ingestor.API_URL, retries=4) is None
+    assert backoffs == [1, 2, 3]
+
+
+def test_server_errors_slow_the_host_limiter(konga):
+    konga(500, 200)
+    limiter = politeness.limiter_for(api_ingestor.API_URL)
+    start = limiter.rate
+    assert api_ingestor.safe_get(api_ingestor.API_URL, retries=2) == {}
+    assert limiter.rate < start
+
+
+def test_first_attempt_does_not_wait(konga):
+    backoffs = konga(200)
+    assert api_ingestor.safe_get(api_ingestor.API_URL) == {}
+    assert backoffs == []
+
+
+# ===== PAGINATED INGESTION ===== #
+def listing(total, *skus):
+    products = [{"sku": sku, "name": f"Product {sku}", "price": 100} for sku in skus]
+    return {"data": {"searchByStore": {"pagination": {"total": total}, "products": products}}}
+
+
+def test_a_page_that_failed_to_save_is_not_cached_as_unchanged(konga, tmp_path, monkeypatch):
+    saved = []
+
+    def save(df, path):
+        saved.append(df["sku"].iloc[0])
+        return saved != ["1", "2"]   # page 1's first save fails
+
+    monkeypatch.setattr(api_ingestor, "save_to_csv", save)
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    konga(*[(200, listing(80, "1")), (200, listing(80, "2"))] * 3)
+    try:
+        assert not api_ingestor.ingest_category(7, limit=40, cache=cache)["success"]
+        assert api_ingestor.ingest_category(7, limit=40, cache=cache)["success"]
+        assert saved == ["1", "2", "1", "2"]
+        api_ingestor.ingest_category(7, limit=40, cache=cache)
+        assert saved == ["1", "2", "1", "2", "1"]   # page 1 is saved now, so unchanged
+    finally:
+        cache.close()
+
+
+def test_pages_fan_out_and_stream_in_page_order(konga, monkeypatch):
+    saved = []
+    monkeypatch.setattr(api_ingestor, "save_to_csv", lambda df, path: saved.append(df["sku"].tolist()) or True)
+    konga((200, listing(120, "1")), (200, listing(120, "2")), (200, listing(120, "3")))
+    stats = api_ingestor.ingest_category(7, limit=40, max_concurrency=2)
+    assert saved == [["1"], ["2"], ["3"]]
+    assert stats == {"category_id": 7, "pages": 3, "records": 3, "success": True}
+
+
+def test_a_failed_save_is_not_reported_as_success(konga, monkeypatch):
+    monkeypatch.setattr(api_ingestor, "save_to_csv", lambda df, path: False)
+    monkeypatch.setattr(api_ingestor, "get_cache", lambda: None)
+    konga((200, listing(40, "1")))
+    assert api_ingestor.run_api_ingestion(categories=[7], search_terms=[]) is False
+
+
+def test_save_to_csv_reports_a_failed_write(tmp_path, monkeypatch):
+    def broken_save(df, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(dedup_index, "INDEX_DIR", tmp_path / "state")
+    monkeypatch.setattr(api_ingestor, "save_dataset", broken_save)
+    df = api_ingestor.load(listing(40, "1"))
+    assert api_ingestor.save_to_csv(df, tmp_path / "api_ingestor.csv") is False
+    # Nothing was recorded in the dedup index, so the next run stores the rows again
+    kept, _ = dedup_index.keep_changed(df, tmp_path / "api_ingestor.csv")
+    assert len(kept) == 1
@@ -0,0 +1,69 @@
+import asyncio
+
+from core.async_engine import fetch_all_products_async, fetch_all_products_concurrent
+from core.politeness import TokenBucket
+from scripts.config import selector
+
+HEADERS = {"User-Agent": "tests"}
+
+
+def crawl(url, **options):
+    delivered = []
+    products = fetch_all_products_concurrent(
+        url, HEADERS, selector, bucket=TokenBucket(rate=1000, capacity=1000),
+        on_page=lambda page, batch: delivered.append(page), **options)
+    return delivered, products
+
+
+# ===== ORDERING ===== #
+def test_pages_are_delivered_in_order_when_they_finish_out_of_order(listing_site):
+    site, url = listing_site
+    site.pages, site.delays = 4, {1: 0.3, 2: 0.1}
+    delivered, products = crawl(url, max_concurrency=4)
+    assert delivered == [1, 2, 3, 4]
+    assert [p["Name"] for p in products] == [f"Laptop {page}-{i}" for page in range(1, 5) for i in range(2)]
+
+
+def test_start_page_resumes_part_way(listing_site):
+    site, url = listing_site
+    delivered, _ = crawl(url, start_page=2)
+    assert delivered == [2, 3]
+
+
+# ===== STOP RULES ===== #
+def test_an_empty_page_ends_the_category_before_it(listing_site):
+    site, url = listing_site
+    site.pages, site.empty = 8, {3}
+    delivered, products = crawl(url, max_concurrency=2)
+    assert delivered == [1, 2] and len(products) == 4
+
+
+def test_a_page_without_next_link_ends_the_category_after_it(listing_site):
+    site, url = listing_site
+    delivered, _ = crawl(url, max_concurrency=2, max_pages=20)
+    assert delivered == [1, 2, 3]
+    assert max(site.requested) <= 3 + 2   # at most max_concurrency pages past the end were in flight
+
+
+def test_max_pages_caps_the_crawl(listing_site):
+    site, url = listing_site
+    site.pages = 10
+    delivered, _ = crawl(url, max_pages=4)
+    assert delivered == [1, 2, 3, 4] and max(site.requested) == 4
+
+
+# ===== CONCURRENCY ===== #
+def test_in_flight_requests_are_bounded_by_max_concurrency(listing_site):
+    site, url = listing_site
+    site.pages, site.delay = 8, 0.05
+    crawl(url, max_concurrency=3)
+    assert 1 < site.max_in_flight <= 3
+
+
+def test_keep_results_false_only_streams(listing_site):
+    site, url = listing_site
+    delivered = []
+    products = asyncio.run(fetch_all_products_async(
+        url, HEADERS, selector, bucket=TokenBucket(rate=1000, capacity=1000),
+        on_page=lambda page, batch: delivered.append(len(batch)), keep_results=False))
+    assert products == [] and delivered == [2, 2, 2]
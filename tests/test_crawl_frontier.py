@@ -0,0 +1,123 @@
+import pytest
+
+from core.crawl_frontier import CrawlFrontier, content_hash, normalize_url
+
+HOUR = 3600
+SETTINGS = {"first_revisit": 24 * HOUR, "min_revisit": 6 * HOUR, "max_revisit": 14 * 24 * HOUR,
+            "speedup": 0.5, "slowdown": 1.5, "lease_seconds": 1800, "max_failures": 3}
+URL = "https://shop.test/p/1"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def frontier(tmp_path, clock):
+    with CrawlFrontier(tmp_path / "frontier.sqlite", settings=SETTINGS, now=clock) as frontier:
+        yield frontier
+
+
+def interval(frontier, url=URL):
+    return frontier.conn.execute("SELECT interval FROM frontier WHERE url = ?", (url,)).fetchone()[0]
+
+
+def test_urls_are_normalized_and_counted_once(frontier):
+    assert frontier.add([URL + "?utm=1", URL.upper().replace("/P/", "/p/"), "No link available"]) == 1
+    assert frontier.add([URL]) == 0
+    assert normalize_url("/relative") is None
+    assert URL + "#reviews" in frontier and len(frontier) == 1
+
+
+def test_new_urls_are_due_at_once_and_leased(frontier, clock):
+    frontier.add([URL])
+    assert [e["url"] for e in frontier.due()] == [URL]
+    assert frontier.due() == []                       # leased to the first caller
+    clock.now += SETTINGS["lease_seconds"]
+    assert [e["url"] for e in frontier.due()] == [URL]  # lease expired without a record()
+
+
+def test_never_fetched_pages_come_before_revisits(frontier, clock):
+    frontier.add(["https://shop.test/p/old"])
+    frontier.due()
+    frontier.record("https://shop.test/p/old", "h1")
+    clock.now += SETTINGS["first_revisit"]
+    frontier.add(["https://shop.test/p/new"])
+    assert [e["url"] for e in frontier.due()] == ["https://shop.test/p/new", "https://shop.test/p/old"]
+
+
+def test_first_fetch_schedules_the_first_revisit(frontier, clock):
+    frontier.add([URL])
+    frontier.due()
+    assert frontier.record(URL, "h1") is False
+    assert interval(frontier) == SETTINGS["first_revisit"]
+    assert frontier.due() == []
+    clock.now += SETTINGS["first_revisit"]
+    assert frontier.due()[0]["content_hash"] == "h1"
+
+
+def test_unchanged_revisits_slow_down_up_to_max_revisit(frontier):
+    frontier.add([URL])
+    frontier.record(URL, "h1")
+    frontier.record(URL, "h1")
+    assert interval(frontier) == SETTINGS["first_revisit"] * 1.5
+    for _ in range(20):
+        frontier.record(URL, "h1")
+    assert interval(frontier) == SETTINGS["max_revisit"]
+
+
+def test_changed_revisits_speed_up_down_to_min_revisit(frontier):
+    frontier.add([URL])
+    frontier.record(URL, "h0")
+    assert frontier.record(URL, "h1") is True
+    assert interval(frontier) == SETTINGS["first_revisit"] * 0.5
+    for n in range(2, 10):
+        frontier.record(URL, f"h{n}")
+    assert interval(frontier) == SETTINGS["min_revisit"]
+    assert frontier.stats()["price_changes"] == 9
+
+
+def test_failures_keep_the_hash_and_park_the_url(frontier):
+    frontier.add([URL])
+    frontier.record(URL, "h1")
+    frontier.record(URL, ok=False)
+    assert interval(frontier) == SETTINGS["first_revisit"] * 1.5
+    for _ in range(SETTINGS["max_failures"] - 1):
+        frontier.record(URL, ok=False)
+    assert interval(frontier) == SETTINGS["max_revisit"]
+    # The next successful fetch compares against the last good hash
+    assert frontier.record(URL, "h1") is False
+
+
+def test_recording_an_unknown_url_is_a_no_op(frontier):
+    assert frontier.record("https://shop.test/p/unknown", "h1") is False
+    assert len(frontier) == 0
+
+
+def test_an_empty_frontier_is_rebuilt_from_the_detail_dataset(tmp_path, clock):
+    details = tmp_path / "product_details.csv"
+    details.write_text(
+        "Description Link,Price,Old Price,Fetched At\n"
+        f"{URL},₦ 100,,2026-01-01 10:00:00\n"
+        f"{URL}?utm=1,₦ 90,,2026-01-02 10:00:00\n"
+        "No link available,₦ 5,,2026-01-02 10:00:00\n",
+        encoding="utf-8",
+    )
+    with CrawlFrontier(tmp_path / "state.sqlite", settings=SETTINGS, now=clock) as frontier:
+        assert frontier.bootstrap_from_csv(details) == 1
+        assert frontier.bootstrap_from_csv(details) == 0   # only an empty frontier is seeded
+        assert frontier.stats()["fetched"] == 1 and frontier.due() == []
+        fetched, content = frontier.conn.execute("SELECT last_fetched, content_hash FROM frontier").fetchone()
+        clock.now = fetched + SETTINGS["first_revisit"]
+        assert frontier.due() == [{"url": URL, "fetches": 1, "content_hash": content}]
+        # The newest saved price is the baseline: a revisit at that price is not a change
+        assert not frontier.record(URL, content_hash({"Price": "₦ 90", "Old Price": ""}))
@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from core import dataset_sink
+from core.dataset_sink import StreamingSink
+
+
+def rows(*values):
+    return pd.DataFrame({"id": list(values)})
+
+
+@pytest.fixture
+def failing_save(monkeypatch):
+    """save_dataset that raises until `failing["on"]` is cleared, then appends for real."""
+    failing = {"on": True}
+    real_save = dataset_sink.save_dataset
+
+    def save(df, path, backend=None):
+        if failing["on"]:
+            raise OSError("disk full")
+        return real_save(df, path, backend)
+
+    monkeypatch.setattr(dataset_sink, "save_dataset", save)
+    return failing
+
+
+def test_rows_are_written_once_flush_rows_is_reached(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = StreamingSink(path, flush_rows=3)
+    sink.write(rows(1, 2))
+    assert not path.exists()
+    sink.write(rows(3))
+    assert pd.read_csv(path)["id"].tolist() == [1, 2, 3]
+    assert sink.stats() == {"batches": 1, "rows_in": 3, "rows_written": 3}
+
+
+def test_failed_save_keeps_the_buffer_for_the_next_flush(tmp_path, failing_save):
+    path = tmp_path / "out.csv"
+    sink = StreamingSink(path, flush_rows=100)
+    sink.write(rows(1, 2))
+    with pytest.raises(OSError):
+        sink.flush()
+    assert sink.buffered_rows == 2 and sink.stats()["rows_written"] == 0
+
+    failing_save["on"] = False
+    sink.write(rows(3))
+    sink.flush()
+    assert pd.read_csv(path)["id"].tolist() == [1, 2, 3]
+    assert sink.buffered_rows == 0
+
+
+def test_failed_save_does_not_report_tags_as_durable(tmp_path, failing_save):
+    flushed = []
+    sink = StreamingSink(tmp_path / "out.csv", flush_rows=100, on_flush=flushed.extend)
+    sink.write(rows(1), tag=("laptops", 1))
+    with pytest.raises(OSError):
+        sink.flush()
+    assert flushed == []
+
+    failing_save["on"] = False
+    sink.flush()
+    assert flushed == [("laptops", 1)]
+
+
+def test_on_saved_runs_only_after_a_successful_save(tmp_path, failing_save):
+    saved = []
+    prepare = lambda df, path: (df, lambda: saved.append(len(df)))
+    sink = StreamingSink(tmp_path / "out.csv", prepare=prepare, flush_rows=100)
+    sink.write(rows(1, 2))
+    with pytest.raises(OSError):
+        sink.flush()
+    assert saved == []
+
+    failing_save["on"] = False
+    sink.flush()
+    assert saved == [2]
+
+
+def test_prepare_dropping_every_row_still_completes_the_flush(tmp_path):
+    flushed, saved = [], []
+    prepare = lambda df, path: (df.iloc[0:0], lambda: saved.append(True))
+    sink = StreamingSink(tmp_path / "out.csv", prepare=prepare, flush_rows=100, on_flush=flushed.extend)
+    sink.write(rows(1), tag="page-1")
+    sink.flush()
+    assert not (tmp_path / "out.csv").exists()
+    assert flushed == ["page-1"] and saved == [True]
+    assert sink.stats() == {"batches": 1, "rows_in": 1, "rows_written": 0}
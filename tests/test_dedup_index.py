@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+
+from core import dedup_index
+from core.dedup_index import filter_changed, keep_changed, record_hashes
+
+KEYS = ["Category", "Description Link"]
+CONTENT = ["Price", "Ratings"]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return tmp_path / "index.sqlite"
+
+
+def frame(*rows):
+    return pd.DataFrame(rows, columns=["Category", "Description Link", "Price", "Ratings"])
+
+
+def test_new_rows_are_kept_but_not_recorded_until_saved(index_path):
+    df = frame(("laptops", "https://x/1", "₦ 100", "4 out of 5"))
+    kept, upserts = filter_changed(df, "scraper_dataset", KEYS, CONTENT, index_path)
+    assert len(kept) == 1 and len(upserts) == 1
+
+    # Nothing was recorded, so a failed save leaves the row new for the next run
+    kept, _ = filter_changed(df, "scraper_dataset", KEYS, CONTENT, index_path)
+    assert len(kept) == 1
+
+
+def test_recorded_rows_are_skipped_until_their_content_changes(index_path):
+    df = frame(("laptops", "https://x/1", "₦ 100", "4 out of 5"),
+               ("laptops", "https://x/2", "₦ 200", "No ratings"))
+    _, upserts = filter_changed(df, "scraper_dataset", KEYS, CONTENT, index_path)
+    assert record_hashes(upserts, index_path) == 2
+
+    again = frame(("laptops", "https://x/1", "₦ 100", "4 out of 5"),
+                  ("laptops", "https://x/2", "₦ 150", "No ratings"))
+    kept, upserts = filter_changed(again, "scraper_dataset", KEYS, CONTENT, index_path)
+    assert kept["Description Link"].tolist() == ["https://x/2"]
+    assert [u[1] for u in upserts] == ["laptops\x1fhttps://x/2"]
+
+
+def test_same_key_in_another_category_is_a_different_record(index_path):
+    _, upserts = filter_changed(frame(("laptops", "https://x/1", "₦ 100", "")),
+                                "scraper_dataset", KEYS, CONTENT, index_path)
+    record_hashes(upserts, index_path)
+    kept, _ = filter_changed(frame(("phones", "https://x/1", "₦ 100", "")),
+                             "scraper_dataset", KEYS, CONTENT, index_path)
+    assert len(kept) == 1
+
+
+def test_first_occurrence_of_a_key_in_a_batch_wins(index_path):
+    df = frame(("laptops", "https://x/1", "₦ 100", ""), ("laptops", "https://x/1", "₦ 120", ""))
+    kept, upserts = filter_changed(df, "scraper_dataset", KEYS, CONTENT, index_path)
+    assert kept["Price"].tolist() == ["₦ 100"]
+    assert len(upserts) == 1
+
+
+def test_rows_without_a_usable_key_are_always_kept(index_path):
+    df = frame(("laptops", "No link available", "₦ 100", ""), ("laptops", None, "₦ 100", ""))
+    for _ in range(2):
+        kept, upserts = filter_changed(df, "scraper_dataset", KEYS, CONTENT, index_path)
+        record_hashes(upserts, index_path)
+        assert len(kept) == 2 and upserts == []
+
+
+def test_numeric_formatting_does_not_count_as_a_change(index_path):
+    columns = (["sku"], ["price"])
+    _, upserts = filter_changed(pd.DataFrame({"sku": ["1"], "price": [24725]}), "api_ingestor", *columns, index_path)
+    record_hashes(upserts, index_path)
+    kept, _ = filter_changed(pd.DataFrame({"sku": ["1"], "price": [24725.0]}), "api_ingestor", *columns, index_path)
+    assert kept.empty
+
+
+def test_keep_changed_records_only_when_on_saved_is_called(tmp_path, index_path):
+    path = tmp_path / "scraper_dataset.csv"
+    df = frame(("laptops", "https://x/1", "₦ 100", ""))
+    kept, on_saved = keep_changed(df, path, index_path)
+    assert len(kept) == 1
+    on_saved()
+    kept, _ = keep_changed(df, path, index_path)
+    assert kept.empty
+
+
+def test_keep_changed_passes_unknown_datasets_through(tmp_path, index_path):
+    df = pd.DataFrame({"a": [1, 1]})
+    kept, on_saved = keep_changed(df, tmp_path / "other.csv", index_path)
+    assert kept is df and on_saved is None
+
+
+def test_each_dataset_has_its_own_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(dedup_index, "INDEX_DIR", tmp_path / "state")
+    kept, on_saved = keep_changed(frame(("laptops", "https://x/1", "₦ 100", "")), tmp_path / "scraper_dataset.csv")
+    on_saved()
+    kept, on_saved = keep_changed(pd.DataFrame({"sku": ["1"], "price": [100]}), tmp_path / "api_ingestor.csv")
+    on_saved()
+    assert sorted(p.name for p in (tmp_path / "state").glob("*.sqlite")) == \
+        ["dedup_api_ingestor.sqlite", "dedup_scraper_dataset.sqlite"]
+
+
+def test_a_missing_index_is_rebuilt_from_the_dataset(tmp_path, index_path):
+    path = tmp_path / "scraper_dataset.csv"
+    frame(("laptops", "https://x/1", "₦ 100", "")).to_csv(path, index=False)
+    kept, _ = keep_changed(frame(("laptops", "https://x/1", "₦ 100", ""), ("laptops", "https://x/2", "₦ 5", "")),
+                           path, index_path)
+    assert kept["Description Link"].tolist() == ["https://x/2"]
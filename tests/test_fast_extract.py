@@ -0,0 +1,46 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from benchmarks.jumia_fixtures import build_page, build_pages, load_rows
+from core.fast_extract import extract_products
+from core.scraper_engine import fetch_product_from_page
+from scripts.config import selector
+
+
+def bs4_path(text):
+    soup = BeautifulSoup(text, "lxml")
+    return fetch_product_from_page(soup, selector), soup.select_one(selector["page_next"]) is not None
+
+
+@pytest.fixture(scope="module")
+def pages():
+    return build_pages(3, per_page=10)
+
+
+# ===== EQUIVALENCE WITH THE BEAUTIFULSOUP PATH ===== #
+def test_lxml_output_matches_beautifulsoup(pages):
+    for text in pages:
+        assert extract_products(text, selector) == bs4_path(text)
+
+
+def test_grid_only_matches_a_full_parse(pages):
+    for text in pages:
+        assert extract_products(text, selector) == extract_products(text, selector, grid_only=False)
+
+
+def test_last_page_has_no_next(pages):
+    assert [extract_products(text, selector)[1] for text in pages] == [True, True, False]
+
+
+# ===== PAGINATION ABOVE THE GRID ===== #
+@pytest.mark.parametrize("page, has_next", [(1, True), (3, False)])
+def test_next_link_before_the_grid_is_found(page, has_next):
+    text = build_page(load_rows(), page, per_page=10, last_page=3, pagination_first=True)
+    products, found = extract_products(text, selector)
+    assert found is has_next
+    assert (products, found) == extract_products(text, selector, grid_only=False) == bs4_path(text)
+
+
+def test_unrecognised_markup_falls_back_to_a_full_parse():
+    text = "<html><body><div class='prd'>no cards</div><a class='pg' aria-label='Next Page' href='?page=2'>&gt;</a></body></html>"
+    assert extract_products(text, selector) == ([], True)
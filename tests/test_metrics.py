@@ -0,0 +1,51 @@
+import threading
+
+from core import metrics
+
+
+# ===== DELTAS ===== #
+def test_delta_reports_only_what_changed():
+    before = metrics.snapshot()
+    metrics.incr("test_rows_total", 3, dataset="a")
+    metrics.observe("test_save_seconds", 0.5)
+    change = metrics.delta(before)
+    assert change["counters"] == {'test_rows_total{dataset="a"}': 3}
+    assert change["timers"]["test_save_seconds"]["count"] == 1
+
+
+def test_delta_can_keep_one_jobs_labelled_metrics():
+    before = metrics.snapshot()
+    metrics.incr("test_runs_total", job="A")
+    metrics.incr("test_runs_total", job="B")
+    metrics.incr("test_http_total")
+    assert metrics.delta(before, job="A")["counters"] == {'test_runs_total{job="A"}': 1}
+
+
+# ===== WINDOWS ===== #
+def test_sequential_windows_are_exclusive():
+    with metrics.window() as first:
+        metrics.incr("test_window_total")
+    with metrics.window() as second:
+        pass
+    assert not first.overlapped and not second.overlapped
+    assert first.delta()["counters"] == {"test_window_total": 1}
+
+
+def test_overlapping_windows_are_both_flagged():
+    inside, release = threading.Event(), threading.Event()
+    windows = []
+
+    def job():
+        with metrics.window() as window:
+            windows.append(window)
+            inside.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=job)
+    thread.start()
+    inside.wait(5)
+    with metrics.window() as window:
+        windows.append(window)
+    release.set()
+    thread.join()
+    assert [w.overlapped for w in windows] == [True, True]
@@ -0,0 +1,38 @@
+import logging
+
+import pytest
+
+from core.retry_policy import RetryPolicy
+from level3_automated_ingestion_cycles import automated_scraper
+from level5_full_orchestration import orchestrator
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    """Keeps run_job's reports and log lines in memory instead of the real run log."""
+    written = []
+    monkeypatch.setattr(orchestrator, "append_report", written.append)
+    monkeypatch.setattr(orchestrator, "logger", logging.getLogger("tests.orchestrator"))
+    return written
+
+
+def run(job_fn):
+    return orchestrator.run_job("Test_Job", job_fn, policy=RetryPolicy(max_attempts=1))
+
+
+# ===== JOB RESULTS ===== #
+def test_a_falsy_return_fails_the_job(reports):
+    report = run(lambda: False)
+    assert not report["success"] and "reported failure" in report["error"]
+
+
+def test_a_status_string_is_recorded_as_the_result(reports):
+    report = run(lambda: "publish skipped: GT_TOKEN not set")
+    assert report["success"] and report["result"] == "publish skipped: GT_TOKEN not set"
+    assert reports == [report]
+
+
+def test_missing_token_is_reported_as_a_skipped_publish(reports, monkeypatch):
+    monkeypatch.delenv("GT_TOKEN", raising=False)
+    report = run(automated_scraper.commit_data_to_git)
+    assert report["success"] and report["result"] == automated_scraper.PUBLISH_SKIPPED
@@ -0,0 +1,130 @@
+import pytest
+
+from core import politeness
+from core.politeness import RATE_LIMIT_SETTINGS, AdaptiveTokenBucket, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(politeness.time, "monotonic", clock)
+    return clock
+
+
+def adaptive(**overrides):
+    return AdaptiveTokenBucket("example.test", {**RATE_LIMIT_SETTINGS, **overrides})
+
+
+# ===== TOKEN BUCKET ===== #
+def test_burst_then_waits_one_interval_per_token(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == pytest.approx(0.5)
+    assert bucket._reserve() == pytest.approx(1.0)
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket._reserve()
+    bucket._reserve()
+    clock.now += 60
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == pytest.approx(1.0)
+
+
+# ===== ADAPTIVE TOKEN BUCKET ===== #
+def test_healthy_responses_speed_up_to_max_rate(clock):
+    bucket = adaptive(initial_rate=1.0, increase=0.5, max_rate=2.0)
+    for _ in range(5):
+        bucket.record(200, 0.2)
+    assert bucket.rate == 2.0
+
+
+def test_not_modified_counts_as_healthy(clock):
+    bucket = adaptive(initial_rate=1.0, increase=0.5)
+    bucket.record(304, 0.2)
+    assert bucket.rate == 1.5
+
+
+@pytest.mark.parametrize("status", [301, 400, 404])
+def test_other_statuses_leave_the_rate_alone(clock, status):
+    bucket = adaptive(initial_rate=1.0)
+    bucket.record(status, 0.2)
+    assert bucket.rate == 1.0
+
+
+@pytest.mark.parametrize("status", [403, 429, 503])
+def test_throttling_statuses_cut_the_rate(clock, status):
+    bucket = adaptive(initial_rate=1.0, decrease=0.5)
+    bucket.record(status, 0.2)
+    assert bucket.rate == 0.5
+
+
+def test_errors_cut_the_rate_mildly(clock):
+    bucket = adaptive(initial_rate=1.0, slow_decrease=0.8)
+    bucket.record(500, 0.2)
+    assert bucket.rate == pytest.approx(0.8)
+    clock.now += 10
+    bucket.record(None)   # network error
+    assert bucket.rate == pytest.approx(0.64)
+
+
+def test_cooldown_backs_off_once_per_burst(clock):
+    bucket = adaptive(initial_rate=1.0, decrease=0.5, cooldown=2.0)
+    bucket.record(429)
+    bucket.record(429)
+    assert bucket.rate == 0.5
+    clock.now += 3
+    bucket.record(429)
+    assert bucket.rate == 0.25
+
+
+def test_rate_never_drops_below_min_rate(clock):
+    bucket = adaptive(initial_rate=0.1, min_rate=0.05, decrease=0.1)
+    bucket.record(429)
+    assert bucket.rate == 0.05
+
+
+def test_retry_after_on_429_holds_the_next_token(clock):
+    bucket = adaptive(initial_rate=1.0, burst=2, decrease=0.5)
+    bucket.record(429, 0.2, retry_after="30")
+    assert bucket._reserve() == pytest.approx(30.0)
+
+
+def test_retry_after_is_capped(clock):
+    bucket = adaptive(initial_rate=1.0, max_retry_after=10)
+    bucket.record(503, 0.2, retry_after="3600")
+    assert bucket._reserve() == pytest.approx(10.0)
+
+
+@pytest.mark.parametrize("status", [200, 403])
+def test_retry_after_is_ignored_without_429_or_503(clock, status):
+    bucket = adaptive(initial_rate=1.0, burst=2)
+    bucket.record(status, 0.2, retry_after="30")
+    assert bucket._reserve() == 0
+
+
+def test_rising_latency_slows_down(clock):
+    bucket = adaptive(initial_rate=1.0, increase=0.1, slow_decrease=0.8, latency_factor=2.0)
+    bucket.record(200, 0.5)
+    assert bucket.rate == pytest.approx(1.1)
+    for _ in range(3):
+        bucket.record(200, 5.0)
+    assert bucket.rate < 1.1
+
+
+def test_latency_jitter_on_fast_hosts_is_ignored(clock):
+    bucket = adaptive(initial_rate=1.0, increase=0.1, min_latency=0.1)
+    bucket.record(200, 0.005)
+    bucket.record(200, 0.05)   # 10x the baseline, but still below min_latency * latency_factor
+    assert bucket.rate == pytest.approx(1.2)
@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+from core import response_cache, scraper_engine
+from core.politeness import TokenBucket
+from core.response_cache import ResponseCache, conditional_request
+from scripts.config import selector
+
+URL = "https://shop.test/api"
+
+
+def reply(status, body=b"", etag=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers["ETag"] = etag or ""
+    return response
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Queue of canned responses for http_client.request; records the headers it was sent."""
+    replies, sent = [], []
+
+    def request(method, url, headers=None, **kwargs):
+        sent.append(headers or {})
+        return replies.pop(0)
+
+    monkeypatch.setattr(response_cache.http_client, "request", request)
+    return replies, sent
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    yield cache
+    cache.close()
+
+
+def test_not_modified_returns_the_cached_body(server, cache):
+    replies, sent = server
+    replies += [reply(200, b"v1", etag='"a"'), reply(304)]
+    assert not conditional_request(cache, "GET", URL).unchanged
+    response = conditional_request(cache, "GET", URL)
+    assert sent[-1]["If-None-Match"] == '"a"'
+    assert response.unchanged and response.status_code == 200 and response.content == b"v1"
+
+
+def test_same_body_without_validators_is_unchanged(server, cache):
+    replies, _ = server
+    replies += [reply(200, b"v1"), reply(200, b"v1"), reply(200, b"v2")]
+    conditional_request(cache, "GET", URL)
+    assert conditional_request(cache, "GET", URL).unchanged
+    assert not conditional_request(cache, "GET", URL).unchanged
+    assert cache.stats()["unchanged_body"] == 1
+
+
+def test_deferred_entry_is_stored_only_on_commit(server, cache):
+    replies, _ = server
+    replies += [reply(200, b"v1"), reply(200, b"v1"), reply(200, b"v1")]
+    first = conditional_request(cache, "POST", URL, deferred=True, json={"page": 1})
+    assert cache.lookup(first.cache_key) is None
+    cache.discard(first.cache_key)   # the save failed
+    again = conditional_request(cache, "POST", URL, deferred=True, json={"page": 1})
+    assert not again.unchanged
+    cache.commit(again.cache_key)
+    assert conditional_request(cache, "POST", URL, deferred=True, json={"page": 1}).unchanged
+
+
+# ===== LISTING PAGES ===== #
+def test_unchanged_listing_pages_reuse_the_cached_parse(listing_site, cache, monkeypatch):
+    site, url = listing_site
+    site.etags = True
+    monkeypatch.setattr(scraper_engine, "get_cache", lambda: cache)
+    parses = []
+    real_extract = scraper_engine.extract_products
+    monkeypatch.setattr(scraper_engine, "extract_products",
+                        lambda text, sel: parses.append(1) or real_extract(text, sel))
+
+    def crawl():
+        return list(scraper_engine.iter_product_pages(url, {}, selector, bucket=TokenBucket(1000, 1000)))
+
+    first = crawl()
+    assert crawl() == first
+    assert site.not_modified == 3 and len(parses) == 3   # the second pass parsed nothing
+    assert cache.stats()["not_modified"] == 3
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.scheduler import CronSpec
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("expression, moment, expected", [
+    ("*/15 * * * *", utc(2026, 1, 1, 10, 7), utc(2026, 1, 1, 10, 15)),
+    ("0 0 * * *", utc(2026, 1, 31, 23, 59, 59), utc(2026, 2, 1, 0, 0)),
+    ("0 0 */2 * *", utc(2026, 1, 1, 0, 0), utc(2026, 1, 3, 0, 0)),      # days 1, 3, 5, ...
+    ("30 6 * * 1-5", utc(2026, 1, 2, 7, 0), utc(2026, 1, 5, 6, 30)),    # Friday -> Monday
+    ("0 12 * * 7", utc(2026, 1, 1, 0, 0), utc(2026, 1, 4, 12, 0)),      # 7 is Sunday, like 0
+    ("0 0 1 1 *", utc(2026, 6, 1, 0, 0), utc(2027, 1, 1, 0, 0)),
+    ("0 0 29 2 *", utc(2026, 3, 1, 0, 0), utc(2028, 2, 29, 0, 0)),      # next leap day
+])
+def test_next_after(expression, moment, expected):
+    assert CronSpec(expression).next_after(moment) == expected
+
+
+def test_next_after_is_strictly_after_a_matching_minute():
+    spec = CronSpec("0 * * * *")
+    assert spec.next_after(utc(2026, 1, 1, 10, 0)) == utc(2026, 1, 1, 11, 0)
+    assert spec.next_after(utc(2026, 1, 1, 10, 0, 30)) == utc(2026, 1, 1, 11, 0)
+
+
+def test_restricted_day_of_month_and_weekday_match_either():
+    # The 13th or any Friday (cron OR semantics when both fields are restricted)
+    spec = CronSpec("0 0 13 * 5")
+    assert spec.next_after(utc(2026, 1, 1, 0, 0)) == utc(2026, 1, 2, 0, 0)    # Friday the 2nd
+    assert spec.next_after(utc(2026, 1, 12, 0, 0)) == utc(2026, 1, 13, 0, 0)  # Tuesday the 13th
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "0 24 * * *", "0 0 0 * *"])
+def test_invalid_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        CronSpec(expression)
+
+
+def test_an_expression_that_never_fires_is_reported():
+    with pytest.raises(ValueError):
+        CronSpec("0 0 31 2 *").next_after(utc(2026, 1, 1))
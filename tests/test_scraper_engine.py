@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from core.async_engine import fetch_all_products_concurrent
+from core.crawl_scheduler import crawl_categories
+from core.parse_pipeline import fetch_all_products_pipelined
+from core.politeness import TokenBucket
+from core.scraper_engine import PageFetchError, iter_product_pages
+from scripts.config import selector
+
+HEADERS = {"User-Agent": "tests"}
+
+
+def fast_bucket():
+    return TokenBucket(rate=1000, capacity=1000)
+
+
+# ===== SYNC ENGINE ===== #
+def test_pages_follow_the_next_link(listing_site):
+    site, url = listing_site
+    pages = list(iter_product_pages(url, HEADERS, selector, bucket=fast_bucket()))
+    assert [page for page, _ in pages] == [1, 2, 3]
+    assert pages[0][1][0]["Name"] == "Laptop 1-0"
+
+
+def test_a_failed_page_raises_after_the_pages_before_it(listing_site):
+    site, url = listing_site
+    site.fail = {2}
+    pages = iter_product_pages(url, HEADERS, selector, bucket=fast_bucket())
+    assert next(pages)[0] == 1
+    with pytest.raises(PageFetchError, match="page 2"):
+        next(pages)
+
+
+def test_a_mid_category_500_leaves_the_category_resumable(listing_site):
+    site, url = listing_site
+    site.fail = {2}
+    delivered = []
+    results = crawl_categories({"laptops": url}, iter_product_pages, HEADERS, selector, max_workers=1,
+                               rate_per_sec=1000, burst=1000,
+                               on_page=lambda record, page, products: delivered.append(page))
+    assert delivered == [1]
+    assert not results[0]["success"] and "page 2" in results[0]["error"]
+
+    site.fail = set()
+    results = crawl_categories({"laptops": url}, iter_product_pages, HEADERS, selector, max_workers=1,
+                               rate_per_sec=1000, burst=1000, start_pages={"laptops": 2},
+                               on_page=lambda record, page, products: delivered.append(page))
+    assert delivered == [1, 2, 3] and results[0]["success"]
+
+
+# ===== CONCURRENT ENGINES ===== #
+@pytest.mark.parametrize("engine", [fetch_all_products_concurrent, fetch_all_products_pipelined])
+def test_concurrent_engines_raise_on_a_failed_page(listing_site, engine):
+    site, url = listing_site
+    site.pages, site.fail = 5, {3}
+    delivered = []
+    with pytest.raises(PageFetchError, match="page 3"):
+        engine(url, HEADERS, selector, bucket=fast_bucket(), on_page=lambda page, products: delivered.append(page))
+    assert delivered == [1, 2]
+
+
+@pytest.mark.parametrize("engine", [fetch_all_products_concurrent, fetch_all_products_pipelined])
+def test_a_failure_past_the_last_page_is_ignored(listing_site, engine):
+    site, url = listing_site
+    site.pages, site.fail, site.delay = 2, {3, 4}, 0.05
+    products = engine(url, HEADERS, selector, bucket=fast_bucket())
+    assert len(products) == 2 * site.per_page
+
+
+def test_pipeline_fetches_only_a_window_past_the_last_page(listing_site):
+    site, url = listing_site
+    slow_consumer = lambda page, products: time.sleep(0.1)
+    fetch_all_products_pipelined(url, HEADERS, selector, bucket=fast_bucket(), parse_workers=2,
+                                 queue_depth=4, fetch_workers=1, on_page=slow_consumer)
+    assert max(site.requested) <= site.pages + 2   # window = parse_workers + fetch_workers
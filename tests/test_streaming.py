@@ -0,0 +1,33 @@
+import pytest
+
+from core.streaming import stream_pages
+
+
+def test_pages_are_yielded_in_engine_order():
+    def engine(base_url, on_page=None, keep_results=True):
+        for page in range(1, 4):
+            on_page(page, [f"{base_url}/{page}"])
+
+    assert list(stream_pages(engine, "u")) == [(1, ["u/1"]), (2, ["u/2"]), (3, ["u/3"])]
+
+
+def test_engine_keywords_reach_the_engine():
+    seen = {}
+
+    def engine(base_url, on_page=None, keep_results=True, queue_depth=4, parse_workers=2):
+        seen.update(queue_depth=queue_depth, parse_workers=parse_workers, keep_results=keep_results)
+        on_page(1, [])
+
+    list(stream_pages(engine, "u", queue_depth=9, parse_workers=3, stream_depth=1))
+    assert seen == {"queue_depth": 9, "parse_workers": 3, "keep_results": False}
+
+
+def test_engine_errors_are_raised_in_the_consumer():
+    def engine(base_url, on_page=None, keep_results=True):
+        on_page(1, ["a"])
+        raise RuntimeError("boom")
+
+    pages = stream_pages(engine, "u")
+    assert next(pages) == (1, ["a"])
+    with pytest.raises(RuntimeError, match="boom"):
+        next(pages)